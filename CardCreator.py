@@ -1,886 +1,91 @@
-import os
-import pandas as pd
+import importlib
+import multiprocessing
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from docx import Document
 import tkinter as tk
 from tkinter import filedialog, messagebox, simpledialog, ttk
-import json
-import sqlite3
-
-# Класс для управления базой данных SQLite
-# Этот класс отвечает за создание, подключение и операции с базой данных pupils.db,
-# где хранятся данные о воспитанниках: личные данные и оценки (df1-df11).
-class DatabaseManager:
-    def __init__(self, db_name='pupil_db.db'):
-        # Получаем путь к директории, где находится текущий скрипт
-        # Это обеспечивает, что база данных будет в той же папке, что и скрипт.
-        script_dir = os.path.dirname(os.path.realpath(__file__))
-        # Формируем полный путь к базе данных, добавляя имя файла
-        self.db_name = os.path.join(script_dir, db_name)
-        # Инициализируем базу данных (создаём таблицу, если её нет)
-        self.init_database()
-
-    def create_connection(self):
-        # Создаём соединение с базой данных по указанному пути
-        # Возвращает объект соединения или None в случае ошибки.
-        try:
-            connection = sqlite3.connect(self.db_name)
-            return connection
-        except sqlite3.Error as e:
-            # Обработка ошибки подключения
-            # Показываем сообщение об ошибке пользователю через messagebox.
-            messagebox.showerror("Ошибка базы данных", f"Ошибка подключения к базе данных: {e}")
-            return None
-
-    def init_database(self):
-        # Инициализация базы данных: создание таблицы pupils, если она не существует
-        # Таблица содержит ID, личные данные и поля для оценок df1-df11 (INTEGER, могут быть NULL).
-        connection = self.create_connection()
-        if connection:
-            try:
-                cursor = connection.cursor()
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS pupils (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        surname TEXT,
-                        name TEXT,
-                        patronymic TEXT,
-                        birth_date DATE,
-                        df1 INTEGER,
-                        df2 INTEGER,
-                        df3 INTEGER,
-                        df4 INTEGER,
-                        df5 INTEGER,
-                        df6 INTEGER,
-                        df7 INTEGER,
-                        df8 INTEGER,
-                        df9 INTEGER,
-                        df10 INTEGER,
-                        df11 INTEGER
-                    )
-                """)
-                connection.commit()
-            except sqlite3.Error as e:
-                # Обработка ошибки создания таблицы
-                messagebox.showerror("Ошибка базы данных", f"Ошибка инициализации базы данных: {e}")
-            finally:
-                # Закрываем курсор и соединение для освобождения ресурсов.
-                cursor.close()
-                connection.close()
-
-    def add_pupil(self, surname, name, patronymic, birth_date):
-        # Добавление нового воспитанника в базу данных.
-        # Вставляет только личные данные, оценки добавляются позже.
-        # Возвращает ID добавленного воспитанника или None в случае ошибки.
-        connection = self.create_connection()
-        if connection:
-            try:
-                cursor = connection.cursor()
-                cursor.execute("""
-                    INSERT INTO pupils (surname, name, patronymic, birth_date)
-                    VALUES (?, ?, ?, ?)
-                """, (surname, name, patronymic, birth_date))
-                pupil_id = cursor.lastrowid
-                connection.commit()
-                return pupil_id
-            except sqlite3.Error as e:
-                messagebox.showerror("Ошибка базы данных", f"Ошибка добавления воспитанника: {e}")
-            finally:
-                cursor.close()
-                connection.close()
-        return None
-
-    def get_pupils(self):
-        # Получение списка всех воспитанников из базы данных
-        # Возвращает список кортежей с данными (id, surname, ..., df11).
-        connection = self.create_connection()
-        if connection:
-            try:
-                cursor = connection.cursor()
-                cursor.execute("SELECT id, surname, name, patronymic, birth_date, df1, df2, df3, df4, df5, df6, df7, df8, df9, df10, df11 FROM pupils")
-                return cursor.fetchall()  # Возврат всех строк
-            except sqlite3.Error as e:
-                # Обработка ошибки чтения
-                messagebox.showerror("Ошибка базы данных", f"Ошибка получения данных воспитанников: {e}")
-            finally:
-                cursor.close()
-                connection.close()
-        return []
-
-    def update_pupil_info(self, pupil_id, surname, name, patronymic, birth_date):
-        # Обновление личных данных воспитанника
-        # Обновляет surname, name, patronymic, birth_date по ID.
-        # Возвращает True при успехе, False иначе.
-        connection = self.create_connection()
-        if connection:
-            try:
-                cursor = connection.cursor()
-                cursor.execute("""
-                    UPDATE pupils 
-                    SET surname = ?, name = ?, patronymic = ?, birth_date = ?
-                    WHERE id = ?
-                """, (surname, name, patronymic, birth_date, pupil_id))
-                connection.commit()
-                return True
-            except sqlite3.Error as e:
-                # Обработка ошибки обновления
-                messagebox.showerror("Ошибка базы данных", f"Ошибка обновления данных воспитанника: {e}")
-            finally:
-                cursor.close()
-                connection.close()
-        return False
-
-    def update_pupil_scores(self, pupil_id, scores):
-        # Обновление баллов (оценок) воспитанника
-        # Обновляет df1-df11 по ID. Если какого-то ключа нет в scores, используется None (NULL в DB).
-        # Возвращает True при успехе, False иначе.
-        connection = self.create_connection()
-        if connection:
-            try:
-                cursor = connection.cursor()
-                cursor.execute("""
-                    UPDATE pupils 
-                    SET df1 = ?, df2 = ?, df3 = ?, df4 = ?, df5 = ?, df6 = ?, df7 = ?, df8 = ?, df9 = ?, df10 = ?, df11 = ?
-                    WHERE id = ?
-                """, (
-                    scores.get('df1'), scores.get('df2'), scores.get('df3'), scores.get('df4'),
-                    scores.get('df5'), scores.get('df6'), scores.get('df7'), scores.get('df8'),
-                    scores.get('df9'), scores.get('df10'), scores.get('df11'), pupil_id
-                ))
-                connection.commit()
-                return True
-            except sqlite3.Error as e:
-                # Обработка ошибки обновления баллов
-                messagebox.showerror("Ошибка базы данных", f"Ошибка обновления баллов: {e}")
-            finally:
-                cursor.close()
-                connection.close()
-        return False
-
-    def delete_pupil(self, pupil_id):
-        # Удаление воспитанника из базы данных
-        # Удаляет запись по ID. Возвращает True при успехе, False иначе.
-        connection = self.create_connection()
-        if connection:
-            try:
-                cursor = connection.cursor()
-                cursor.execute("DELETE FROM pupils WHERE id = ?", (pupil_id,))
-                connection.commit()
-                return True
-            except sqlite3.Error as e:
-                # Обработка ошибки удаления
-                messagebox.showerror("Ошибка базы данных", f"Ошибка удаления воспитанника: {e}")
-            finally:
-                cursor.close()
-                connection.close()
-        return False
-
-# Класс для обработки Excel-файлов
-# Этот класс читает оценки из конкретных ячеек Excel-файлов для разных возрастных групп.
-class ExcelProcessor:
-    def __init__(self):
-        pass  # Инициализация без параметров
-
-    def read_scores(self, excel_file_path):
-        # Чтение оценок из Excel-файла в зависимости от имени файла
-        # Поддерживает три типа файлов: младший, средний, старший возраст.
-        # Возвращает словарь scores с df1-df11 (или меньше для старшего) и имя файла.
-        # Проверяет, что значения - целые от 1 до 4.
-        excel_file_name = os.path.basename(excel_file_path)
-        scores = {}
-
-        if excel_file_name == 'Карта развития. Младший возраст.xlsx':
-            # Извлечение значений для младшего возраста из конкретных ячеек
-            # df1-df8 из листа 'Логопедия', df9 'ОЗОМ', df10 'ФЭМП', df11 'Конструирование'.
-            scores['df1'] = pd.read_excel(excel_file_path, sheet_name='Логопедия', header=None, usecols='E', nrows=1, skiprows=5).iloc[0, 0]
-            scores['df2'] = pd.read_excel(excel_file_path, sheet_name='Логопедия', header=None, usecols='E', nrows=1, skiprows=7).iloc[0, 0]
-            scores['df3'] = pd.read_excel(excel_file_path, sheet_name='Логопедия', header=None, usecols='E', nrows=1, skiprows=9).iloc[0, 0]
-            scores['df4'] = pd.read_excel(excel_file_path, sheet_name='Логопедия', header=None, usecols='E', nrows=1, skiprows=11).iloc[0, 0]
-            scores['df5'] = pd.read_excel(excel_file_path, sheet_name='Логопедия', header=None, usecols='E', nrows=1, skiprows=13).iloc[0, 0]
-            scores['df6'] = pd.read_excel(excel_file_path, sheet_name='Логопедия', header=None, usecols='E', nrows=1, skiprows=15).iloc[0, 0]
-            scores['df7'] = pd.read_excel(excel_file_path, sheet_name='Логопедия', header=None, usecols='E', nrows=1, skiprows=17).iloc[0, 0]
-            scores['df8'] = pd.read_excel(excel_file_path, sheet_name='Логопедия', header=None, usecols='E', nrows=1, skiprows=19).iloc[0, 0]
-            scores['df9'] = pd.read_excel(excel_file_path, sheet_name='ОЗОМ', header=None, usecols='H', nrows=1, skiprows=12).iloc[0, 0]
-            scores['df10'] = pd.read_excel(excel_file_path, sheet_name='ФЭМП', header=None, usecols='H', nrows=1, skiprows=7).iloc[0, 0]
-            scores['df11'] = pd.read_excel(excel_file_path, sheet_name='Конструирование', header=None, usecols='H', nrows=1, skiprows=5).iloc[0, 0]
-        elif excel_file_name == 'Карта развития. Средний возраст.xlsx':
-            # Извлечение значений для среднего возраста
-            # Аналогичная структура, но другие столбцы и skiprows.
-            scores['df1'] = pd.read_excel(excel_file_path, sheet_name='Логопедия', header=None, usecols='H', nrows=1, skiprows=6).iloc[0, 0]
-            scores['df2'] = pd.read_excel(excel_file_path, sheet_name='Логопедия', header=None, usecols='H', nrows=1, skiprows=8).iloc[0, 0]
-            scores['df3'] = pd.read_excel(excel_file_path, sheet_name='Логопедия', header=None, usecols='H', nrows=1, skiprows=10).iloc[0, 0]
-            scores['df4'] = pd.read_excel(excel_file_path, sheet_name='Логопедия', header=None, usecols='H', nrows=1, skiprows=12).iloc[0, 0]
-            scores['df5'] = pd.read_excel(excel_file_path, sheet_name='Логопедия', header=None, usecols='H', nrows=1, skiprows=14).iloc[0, 0]
-            scores['df6'] = pd.read_excel(excel_file_path, sheet_name='Логопедия', header=None, usecols='H', nrows=1, skiprows=16).iloc[0, 0]
-            scores['df7'] = pd.read_excel(excel_file_path, sheet_name='Логопедия', header=None, usecols='H', nrows=1, skiprows=18).iloc[0, 0]
-            scores['df8'] = pd.read_excel(excel_file_path, sheet_name='Логопедия', header=None, usecols='H', nrows=1, skiprows=20).iloc[0, 0]
-            scores['df9'] = pd.read_excel(excel_file_path, sheet_name='ОЗОМ', header=None, usecols='H', nrows=1, skiprows=13).iloc[0, 0]
-            scores['df10'] = pd.read_excel(excel_file_path, sheet_name='ФЭМП', header=None, usecols='H', nrows=1, skiprows=10).iloc[0, 0]
-            scores['df11'] = pd.read_excel(excel_file_path, sheet_name='Конструирование', header=None, usecols='H', nrows=1, skiprows=6).iloc[0, 0]
-        elif excel_file_name == 'Карта развития. Старший возраст.xlsx':
-            # Извлечение значений для старшего возраста
-            # ВНИМАНИЕ: Здесь только df1-df10, df11 отсутствует (возможно, ошибка в коде или нет поля для df11).
-            # Если df11 нужен, добавьте чтение из соответствующей ячейки, иначе он останется None.
-            scores['df1'] = pd.read_excel(excel_file_path, sheet_name='Логопедия', header=None, usecols='E', nrows=1, skiprows=5).iloc[0, 0]
-            scores['df2'] = pd.read_excel(excel_file_path, sheet_name='Логопедия', header=None, usecols='E', nrows=1, skiprows=7).iloc[0, 0]
-            scores['df3'] = pd.read_excel(excel_file_path, sheet_name='Логопедия', header=None, usecols='E', nrows=1, skiprows=9).iloc[0, 0]
-            scores['df4'] = pd.read_excel(excel_file_path, sheet_name='Логопедия', header=None, usecols='E', nrows=1, skiprows=11).iloc[0, 0]
-            scores['df5'] = pd.read_excel(excel_file_path, sheet_name='Логопедия', header=None, usecols='E', nrows=1, skiprows=13).iloc[0, 0]
-            scores['df6'] = pd.read_excel(excel_file_path, sheet_name='Логопедия', header=None, usecols='E', nrows=1, skiprows=15).iloc[0, 0]
-            scores['df7'] = pd.read_excel(excel_file_path, sheet_name='Логопедия', header=None, usecols='E', nrows=1, skiprows=17).iloc[0, 0]
-            scores['df8'] = pd.read_excel(excel_file_path, sheet_name='ОЗОМ', header=None, usecols='E', nrows=1, skiprows=12).iloc[0, 0]
-            scores['df9'] = pd.read_excel(excel_file_path, sheet_name='ФЭМП', header=None, usecols='E', nrows=1, skiprows=11).iloc[0, 0]
-            scores['df10'] = pd.read_excel(excel_file_path, sheet_name='Конструирование', header=None, usecols='E', nrows=1, skiprows=6).iloc[0, 0]
-            # TODO: Если есть df11, добавьте здесь чтение, например:
-            # scores['df11'] = pd.read_excel(... )
-        else:
-            # Обработка ошибки недопустимого файла
-            messagebox.showerror("Ошибка", "Недопустимый файл Excel")
-            return None
-
-        # Проверка и преобразование значений в целые числа от 1 до 4
-        # Проверяем только существующие ключи в scores.
-        for key in scores:
-            if pd.isna(scores[key]) or scores[key] is None:
-                messagebox.showerror("Ошибка", f"Значение для {key} пустое. Пожалуйста, заполните ячейку в Excel-файле.")
-                return None
-            try:
-                scores[key] = int(float(scores[key]))
-                if scores[key] not in [1, 2, 3, 4]:
-                    messagebox.showerror("Ошибка", f"Недопустимое значение для {key}: {scores[key]}. Ожидается число от 1 до 4.")
-                    return None
-            except (ValueError, TypeError):
-                messagebox.showerror("Ошибка", f"Недопустимое значение для {key}: {scores[key]}. Ожидается число от 1 до 4.")
-                return None
-
-        return scores, excel_file_name
-
-# Класс для обработки Word-документов
-# Этот класс обновляет таблицу в Word-документе на основе оценок из Excel.
-class WordProcessor:
-    def __init__(self):
-        pass  # Инициализация без параметров
-
-    def update_document(self, word_file_path, scores, excel_file_name):
-        # Загрузка и обновление Word-документа
-        # Ищет конкретную таблицу по заголовкам и заполняет её.
-        # Сохраняет обновленный документ по выбранному пути.
-        doc = Document(word_file_path)
-        table_found = False
-
-        for table in doc.tables:
-            # Поиск таблицы по заголовкам ячеек
-            # Проверяем первую строку таблицы на совпадение текстов.
-            if len(table.rows) > 0 and len(table.columns) > 1 and table.cell(0, 0).text.strip() == 'Особые образовательные потребности ребенка по отношению к группе, в которой он находится' and table.cell(0, 1).text.strip() == 'Задачи':
-                table_found = True
-                self._fill_table(table, scores, excel_file_name)  # Заполнение таблицы
-                break
-
-        if table_found:
-            # Сохранение обновлённого документа
-            # Пользователь выбирает путь для сохранения.
-            word_save_path = filedialog.asksaveasfilename(title="Сохранить как", filetypes=[('Word файлы', '*.docx')])
-            if word_save_path:
-                doc.save(word_save_path)
-                return True
-        else:
-            # Обработка ошибки, если таблица не найдена
-            messagebox.showerror("Ошибка", "Таблица не найдена в документе")
-        return False
-
-    def _fill_table(self, table, scores, excel_file_name):
-        # Заполнение таблицы в Word на основе оценок и возраста
-        # Заполнено по аналогии с информацией из файла Рекомендации.txt
-        # Для каждого раздела добавляются строки с заголовками и содержимым в зависимости от значения scores.
-        if excel_file_name == 'Карта развития. Младший возраст.xlsx':
-            # ЛОГОПЕДИЯ
-            row_cells = table.rows[1].cells
-            row_cells[0].text = "ЛОГОПЕДИЯ"
-            # ПОНИМАНИЕ РЕЧИ (df1)
-            row_cells = table.rows[2].cells
-            row_cells[0].text = "ПОНИМАНИЕ РЕЧИ"
-            if scores['df1'] == 1:
-                row_cells = table.rows[3].cells
-                row_cells[0].text = "Ребёнок не понимает обращенную речь. Грубо нарушено узнавание смысла слова."
-                row_cells[1].text = "Учить по инструкции узнавать и показывать предметы, действи. дифференцированно воспринимать вопросы кто?, куда?, откуда?"
-            elif scores['df1'] == 2:
-                row_cells = table.rows[3].cells
-                row_cells[0].text = "У ребенка нарушено понимание обращенной речи. Нарушено узнавание смысла слова, понимание точного и конкретного значения слов оказывается почти недоступным, нарушено понимание предложения. Интонационная окраска речи почти недоступна."
-                row_cells[1].text = "учить по инструкции узнавать и показывать признаки предметов. понимать обобщающее значение слова. понимать обращение к одному и нескольким лицам."
-            elif scores['df1'] == 3:
-                row_cells = table.rows[3].cells
-                row_cells[0].text = "Понимание точного и конкретного значения слов оказывается почти недоступным. Нарушено понимание фразы."
-                row_cells[1].text = "Учить понимать грамматические категории числа существительных, глаголов. угадывать предметы по их описанию. определять элементарные причинно-следственные связи."
-            elif scores['df1'] == 4:
-                row_cells = table.rows[3].cells
-                row_cells[0].text = "Присутствуют отдельные ошибки при понимании значения слов, фраз, развернутого речевого высказывания."
-                row_cells[1].text = "Учить понимать вопросы по сюжетной картинке, сказке. Учить понимать соотношение между членами предложения."
-            else:
-                messagebox.showerror("Ошибка", "Неправильное значение для df1")
-            # Артикуляционная моторика (df2)
-            table.add_row().cells
-            row_cells = table.rows[4].cells
-            row_cells[0].text = "Артикуляционная моторика"
-            table.add_row().cells
-            if scores['df2'] == 1:
-                row_cells = table.rows[5].cells
-                row_cells[0].text = "Затруднены движения открывания, закрывания рта."
-                row_cells[1].text = "Активизация и развитие артикуляционной маторики"
-            elif scores['df2'] == 2:
-                row_cells = table.rows[5].cells
-                row_cells[0].text = "Затруднены движения губ, языка. Амплитуда движений снижена во всех направлениях."
-                row_cells[1].text = "Активизация и развитие артикуляционной моторики"
-            elif scores['df2'] == 3:
-                row_cells = table.rows[5].cells
-                row_cells[0].text = "Затруднены движения языка. Амплитуда движений снижена во всех направлениях"
-                row_cells[1].text = "Активизация и развитие артикуляционной моторики"
-            elif scores['df2'] == 4:
-                row_cells = table.rows[5].cells
-                row_cells[0].text = "Затруднен подъем языка наверх. Амплитуда движений снижена"
-                row_cells[1].text = "Активизация и развитие артикуляционной моторики"
-            else:
-                messagebox.showerror("Ошибка", "Неправильное значение для df2")
-            # Слоговая структура слова (df3)
-            table.add_row().cells
-            row_cells = table.rows[6].cells
-            row_cells[0].text = "Слоговая структура слова"
-            table.add_row().cells
-            if scores['df3'] == 1:
-                row_cells = table.rows[7].cells
-                row_cells[0].text = "Ограниченная способность воспроизведения слоговой структуры слова."
-                row_cells[1].text = "Развитие активной подражательной речевой деятельности (в любом фонетическом оформлении называть родителей (законных представителей), близких родственников, подражать крикам животных и птиц, звукам окружающего мира, музыкальным инструментам; отдавать приказы - на, иди"
-            elif scores['df3'] == 2:
-                row_cells = table.rows[7].cells
-                row_cells[0].text = "Ребёнок произносит отдельные слоги; Произносит каждый раз по-разному"
-                row_cells[1].text = "Обучение называнию 1-2-сложных слов (кот, муха)"
-            elif scores['df3'] == 3:
-                row_cells = table.rows[7].cells
-                row_cells[0].text = "Опускает согласные в стечениях, парафазии, перестановки при сохранении контура слов."
-                row_cells[1].text = "Обучение называнию 1-3-сложных слов (кот, муха, молоко)"
-            elif scores['df3'] == 4:
-                row_cells = table.rows[7].cells
-                row_cells[0].text = "Затрудняется в произнесении 1-2-сложных слов с одним закрытым слогом"
-                row_cells[1].text = "Обучение называнию двусложных слов с одним закрытым слогом"
-            else:
-                messagebox.showerror("Ошибка", "Неправильное значение для df3")
-            # Лексика (df4)
-            table.add_row().cells
-            row_cells = table.rows[8].cells
-            row_cells[0].text = "Лексика"
-            table.add_row().cells
-            if scores['df4'] == 1:
-                row_cells = table.rows[9].cells
-                row_cells[0].text = "Словарь состоит из небольшого количества нечетко произносимых звукокомплексов, звукоподражаний."
-                row_cells[1].text = "Активизация предметного и глагольного словаря"
-            elif scores['df4'] == 2:
-                row_cells = table.rows[9].cells
-                row_cells[0].text = "Актуализация слов вызывает затруднения. Не усвоены слова обобщенного, отвлеченного значения"
-                row_cells[1].text = "Формирование обобщающих понятий, словаря признаков по величине, форме, цвету, вкусу"
-            elif scores['df4'] == 3:
-                row_cells = table.rows[9].cells
-                row_cells[0].text = "Не усвоены слова обобщенного, отвлечённого значения"
-                row_cells[1].text = "Формирование словаря личных и притяжательных местоимений(я, ты, вы, он, она, мой, твой, наш, ваш). Формирование словаря наречий, означающих местонахождение(там, вот), количество(много, мало, ещё), ощущение(тепло, холодно)"
-            elif scores['df4'] == 4:
-                row_cells = table.rows[9].cells
-                row_cells[0].text = "Затруднения при актуализации незначительного количества слов."
-                row_cells[1].text = "Формирование навыка пользования числительными 1,2,3. Формирование словаря наречий время(сейчас, скоро), сравнение(больше, меньше), оценка действий(хорошо, плохо)"
-            else:
-                messagebox.showerror("Ошибка", "Неправильное значение для df4")
-            # Грамматический строй речи (df5)
-            table.add_row().cells
-            row_cells = table.rows[10].cells
-            row_cells[0].text = "Грамматический строй речи"
-            table.add_row().cells
-            if scores['df5'] == 1:
-                row_cells = table.rows[11].cells
-                row_cells[0].text = "Не использует морфологические элементы для передачи грамматических отношений."
-                row_cells[1].text = "Учить первоначальным навыкам словоизменения, затем - словообразования (число существительных, наклонение и число глаголов)"
-            elif scores['df5'] == 2:
-                row_cells = table.rows[11].cells
-                row_cells[0].text = "Значительная несформированность грамматического строя речи"
-                row_cells[1].text = "Учить первоначальным навыкам словоизменения, затем - словообразования (число существительных, наклонение и число глаголов, притяжательные местоимения мой - моя)"
-            elif scores['df5'] == 3:
-                row_cells = table.rows[11].cells
-                row_cells[0].text = "Существенная несформированность грамматического строя речи"
-                row_cells[1].text = "Учить первоначальным навыкам словоизменения, затем - словообразования (число существительных, наклонение и число глаголов, притяжательные местоимения мой - моя, существительные с уменьшительно-ласкательными суффиксами типа домик, шубка, категории падежа существительных)"
-            elif scores['df5'] == 4:
-                row_cells = table.rows[11].cells
-                row_cells[0].text = "В речи отмечаются аграмматизмы"
-                row_cells[1].text = "Употребляет словообразовательные модели: относительных прилагательных с суффиксами -ов- -ев- -н- -ан- -енн-. Формирование навыков в потреблении предложных конструкций с предлогами(около, перед, из-за, из-под) и различает предлоги в-из, на-под, к-от, на-с. Формирование навыков потребления глаголов совершенного и несовершенного вида. Формирования навыков согласования существительных с прилагательными в роде и числе в именительном и косвенных падежах."
-            else:
-                messagebox.showerror("Ошибка", "Неправильное значение для df5")
-            # Синтаксическая структура предложения (df6)
-            table.add_row().cells
-            row_cells = table.rows[12].cells
-            row_cells[0].text = "Синтаксическая структура предложения"
-            table.add_row().cells
-            if scores['df6'] == 1:
-                row_cells = table.rows[13].cells
-                row_cells[0].text = "Фразовая речь отсутствует"
-                row_cells[1].text = "Учить составлять первые предложения из аморфных слов-корней, преобразовывать глаголы повелительного наклонения в глаголы настоящего времени единственного числа, составлять предложения по модели: кто? что делает? Кто? Что делает? Что? (например: Тата (мама, папа) спит; Тата, мой ушки, ноги. Тата моет уши, ноги.)."
-            elif scores['df6'] == 2:
-                row_cells = table.rows[13].cells
-                row_cells[0].text = "Использует простую двусоставную фразу"
-                row_cells[1].text = "Учить составлять предложения по модели: Кто? Что делает? Что? (например: Тата (мама, папа) спит; Тата, мой ушки, ноги. Тата моет уши, ноги.)."
-            elif scores['df6'] == 3:
-                row_cells = table.rows[13].cells
-                row_cells[0].text = "Понимание точного и конкретного значения слов оказывается почти недоступным. Нарушено понимание фразы."
-                row_cells[1].text = "Учить понимать грамматические категории числа существительных, глаголов. угадывать предметы по их описанию. определять элементарные причинно-следственные связи."
-            elif scores['df6'] == 4:
-                row_cells = table.rows[13].cells
-                row_cells[0].text = "Отвечает простым трехсоставным предложением с прямым и косвенным дополнением."
-                row_cells[1].text = "Объединение простых предложений в короткие рассказы. Заучивание коротких двустиший и потешек."
-            else:
-                messagebox.showerror("Ошибка", "Неправильное значение для df6")
-            # Связная речь (df7)
-            table.add_row().cells
-            row_cells = table.rows[14].cells
-            row_cells[0].text = "Связная речь"
-            table.add_row().cells
-            if scores['df7'] == 1:
-                row_cells = table.rows[15].cells
-                row_cells[0].text = "Ребёнок не владеет связной речью, общается отдельными словами."
-                row_cells[1].text = "Формирование простой фразы"
-            elif scores['df7'] == 2:
-                row_cells = table.rows[15].cells
-                row_cells[0].text = "Ребёнок не отвечает на вопросы по картинкам, по демонстрации действий."
-                row_cells[1].text = "Усвоение моделей простых предложений: существительное плюс согласованный глагол в повелительном наклонении, существительное плюс согласованный глагол в изъявительном наклонении единственного числа настоящего времени"
-            elif scores['df7'] == 3:
-                row_cells = table.rows[15].cells
-                row_cells[0].text = "Понимание точного и конкретного значения слов оказывается почти недоступным. Нарушено понимание фразы."
-                row_cells[1].text = "Учить понимать грамматические категории числа существительных, глаголов. угадывать предметы по их описанию. определять элементарные причинно-следственные связи."
-            elif scores['df7'] == 4:
-                row_cells = table.rows[15].cells
-                row_cells[0].text = "Присутствуют отдельные ошибки при понимании значения слов, фраз, развернутого речевого высказывания."
-                row_cells[1].text = "Учить понимать вопросы по сюжетной картинке, сказке. Учить понимать соотношение между членами предложения."
-            else:
-                messagebox.showerror("Ошибка", "Неправильное значение для df7")
-            # ОЗОМ (df9 - по аналогии, так как df8 может быть другим разделом логопедии, но в txt df8 как OZOM, корректируем)
-            table.add_row().cells
-            row_cells = table.rows[16].cells
-            row_cells[0].text = "ОЗОМ"
-            table.add_row().cells
-            if scores['df9'] == 1:
-                row_cells = table.rows[17].cells
-                row_cells[0].text = "Ребенок не справляется с заданиями по ознакомлению с окружающим миром."
-                row_cells[1].text = "Формирование представлений об окружающем мире в соответствии с программой."
-            elif scores['df9'] == 2:
-                row_cells = table.rows[17].cells
-                row_cells[0].text = "Ребенок допускает множественные ошибки при выполнении заданий."
-                row_cells[1].text = "Уточнение представлений об окружающем мире по лексическим темам."
-            elif scores['df9'] == 3:
-                row_cells = table.rows[17].cells
-                row_cells[0].text = "Ребенок выполняет задания, но допускает единичные ошибки."
-                row_cells[1].text = "Совершенствование знаний об окружающем мире, работа с лексическими темами."
-            elif scores['df9'] == 4:
-                row_cells = table.rows[17].cells
-                row_cells[0].text = "Ребенок выполняет задания с минимальными ошибками."
-                row_cells[1].text = "Закрепление знаний об окружающем мире, развитие активной речи."
-            else:
-                messagebox.showerror("Ошибка", "Неправильное значение для df9")
-            # ФЭМП (df10)
-            table.add_row().cells
-            row_cells = table.rows[18].cells
-            row_cells[0].text = "ФЭМП"
-            table.add_row().cells
-            if scores['df10'] == 1:
-                row_cells = table.rows[19].cells
-                row_cells[0].text = "Ребенок не справляется с заданиями математического содержания."
-                row_cells[1].text = "Формирование математических представлений в соответствии с программой."
-            elif scores['df10'] == 2:
-                row_cells = table.rows[19].cells
-                row_cells[0].text = "Математические представления не сформированы в значительной степени."
-                row_cells[1].text = "Формирование представлений о счете, форме, величине и пространственных отношениях."
-            elif scores['df10'] == 3:
-                row_cells = table.rows[19].cells
-                row_cells[0].text = "Ребенок допускает множественные ошибки в математических заданиях."
-                row_cells[1].text = "Совершенствование навыков счета, работы с числами и геометрическими фигурами."
-            elif scores['df10'] == 4:
-                row_cells = table.rows[19].cells
-                row_cells[0].text = "Ребенок выполняет математические задания с минимальными ошибками."
-                row_cells[1].text = "Закрепление навыков решения простых задач и работы с числами."
-            else:
-                messagebox.showerror("Ошибка", "Неправильное значение для df10")
-            # Конструирование (df11)
-            table.add_row().cells
-            row_cells = table.rows[20].cells
-            row_cells[0].text = "Конструирование"
-            table.add_row().cells
-            if scores['df11'] == 1:
-                row_cells = table.rows[21].cells
-                row_cells[0].text = "Ребенок не выполняет постройки из конструктора."
-                row_cells[1].text = "Формирование навыков конструирования по образцу."
-            elif scores['df11'] == 2:
-                row_cells = table.rows[21].cells
-                row_cells[0].text = "Ребенок выполняет постройки только с обучающей помощью."
-                row_cells[1].text = "Развитие навыков самостоятельного конструирования по образцу."
-            elif scores['df11'] == 3:
-                row_cells = table.rows[21].cells
-                row_cells[0].text = "Ребенок выполняет постройки с направляющей помощью."
-                row_cells[1].text = "Совершенствование навыков самостоятельного конструирования и творческого подхода."
-            elif scores['df11'] == 4:
-                row_cells = table.rows[21].cells
-                row_cells[0].text = "Ребенок выполняет постройки самостоятельно с минимальной помощью."
-                row_cells[1].text = "Закрепление навыков творческого конструирования и работы с различными материалами."
-            else:
-                messagebox.showerror("Ошибка", "Неправильное значение для df11")
-        elif excel_file_name == 'Карта развития. Средний возраст.xlsx':
-            # Заполнение для среднего возраста - по аналогии с младшим, так как полная информация не предоставлена в txt, используем похожую структуру с плейсхолдерами
-            # ЛОГОПЕДИЯ
-            row_cells = table.rows[1].cells
-            row_cells[0].text = "ЛОГОПЕДИЯ"
-            # ПОНИМАНИЕ РЕЧИ (df1)
-            row_cells = table.rows[2].cells
-            row_cells[0].text = "ПОНИМАНИЕ РЕЧИ"
-            if scores['df1'] == 1:
-                row_cells = table.rows[3].cells
-                row_cells[0].text = "Ребёнок не понимает обращенную речь. Грубо нарушено узнавание смысла слова."
-                row_cells[1].text = "Учить по инструкции узнавать и показывать предметы, действи. дифференцированно воспринимать вопросы кто?, куда?, откуда?"
-            elif scores['df1'] == 2:
-                row_cells = table.rows[3].cells
-                row_cells[0].text = "У ребенка нарушено понимание обращенной речи. Нарушено узнавание смысла слова, понимание точного и конкретного значения слов оказывается почти недоступным, нарушено понимание предложения. Интонационная окраска речи почти недоступна."
-                row_cells[1].text = "учить по инструкции узнавать и показывать признаки предметов. понимать обобщающее значение слова. понимать обращение к одному и нескольким лицам."
-            elif scores['df1'] == 3:
-                row_cells = table.rows[3].cells
-                row_cells[0].text = "Понимание точного и конкретного значения слов оказывается почти недоступным. Нарушено понимание фразы."
-                row_cells[1].text = "Учить понимать грамматические категории числа существительных, глаголов. угадывать предметы по их описанию. определять элементарные причинно-следственные связи."
-            elif scores['df1'] == 4:
-                row_cells = table.rows[3].cells
-                row_cells[0].text = "Присутствуют отдельные ошибки при понимании значения слов, фраз, развернутого речевого высказывания."
-                row_cells[1].text = "Учить понимать вопросы по сюжетной картинке, сказке. Учить понимать соотношение между членами предложения."
-            else:
-                messagebox.showerror("Ошибка", "Неправильное значение для df1")
-            # Артикуляционная моторика (df2)
-            table.add_row().cells
-            row_cells = table.rows[4].cells
-            row_cells[0].text = "Артикуляционная моторика"
-            table.add_row().cells
-            if scores['df2'] == 1:
-                row_cells = table.rows[5].cells
-                row_cells[0].text = "Затруднены движения открывания, закрывания рта."
-                row_cells[1].text = "Активизация и развитие артикуляционной маторики"
-            elif scores['df2'] == 2:
-                row_cells = table.rows[5].cells
-                row_cells[0].text = "Затруднены движения губ, языка. Амплитуда движений снижена во всех направлениях."
-                row_cells[1].text = "Активизация и развитие артикуляционной моторики"
-            elif scores['df2'] == 3:
-                row_cells = table.rows[5].cells
-                row_cells[0].text = "Затруднены движения языка. Амплитуда движений снижена во всех направлениях"
-                row_cells[1].text = "Активизация и развитие артикуляционной моторики"
-            elif scores['df2'] == 4:
-                row_cells = table.rows[5].cells
-                row_cells[0].text = "Затруднен подъем языка наверх. Амплитуда движений снижена"
-                row_cells[1].text = "Активизация и развитие артикуляционной моторики"
-            else:
-                messagebox.showerror("Ошибка", "Неправильное значение для df2")
-            # Остальные df для среднего по аналогии, но поскольку полных данных нет, оставляем как placeholder или копируем из младшего
-            # Для краткости, оставляем pass для остальных, или повторить структуру
-            pass  # Добавьте аналогичные блоки для df3-df11 по необходимости, используя аналогию из младшего или старшего
-        elif excel_file_name == 'Карта развития. Старший возраст.xlsx':
-            # Заполнение для старшего возраста - по информации из конца txt файла
-            # ЛОГОПЕДИЯ
-            row_cells = table.rows[1].cells
-            row_cells[0].text = "ЛОГОПЕДИЯ"
-            # Предполагаем df1 - ПОНИМАНИЕ РЕЧИ (не предоставлено, используем placeholder по аналогии)
-            row_cells = table.rows[2].cells
-            row_cells[0].text = "ПОНИМАНИЕ РЕЧИ"
-            if scores['df1'] == 1:
-                row_cells = table.rows[3].cells
-                row_cells[0].text = "Ребёнок не понимает обращенную речь. Грубо нарушено узнавание смысла слова."
-                row_cells[1].text = "Учить по инструкции узнавать и показывать предметы, действи. дифференцированно воспринимать вопросы кто?, куда?, откуда?"
-            elif scores['df1'] == 2:
-                row_cells = table.rows[3].cells
-                row_cells[0].text = "У ребенка нарушено понимание обращенной речи. Нарушено узнавание смысла слова, понимание точного и конкретного значения слов оказывается почти недоступным, нарушено понимание предложения. Интонационная окраска речи почти недоступна."
-                row_cells[1].text = "учить по инструкции узнавать и показывать признаки предметов. понимать обобщающее значение слова. понимать обращение к одному и нескольким лицам."
-            elif scores['df1'] == 3:
-                row_cells = table.rows[3].cells
-                row_cells[0].text = "Понимание точного и конкретного значения слов оказывается почти недоступным. Нарушено понимание фразы."
-                row_cells[1].text = "Учить понимать грамматические категории числа существительных, глаголов. угадывать предметы по их описанию. определять элементарные причинно-следственные связи."
-            elif scores['df1'] == 4:
-                row_cells = table.rows[3].cells
-                row_cells[0].text = "Присутствуют отдельные ошибки при понимании значения слов, фраз, развернутого речевого высказывания."
-                row_cells[1].text = "Учить понимать вопросы по сюжетной картинке, сказке. Учить понимать соотношение между членами предложения."
-            else:
-                messagebox.showerror("Ошибка", "Неправильное значение для df1")
-            # Артикуляционная моторика (df2)
-            table.add_row().cells
-            row_cells = table.rows[4].cells
-            row_cells[0].text = "Артикуляционная моторика"
-            table.add_row().cells
-            if scores['df2'] == 1:
-                row_cells = table.rows[5].cells
-                row_cells[0].text = "Ребенок затрудняется в движении артикуляционных органов. Не может по подражанию вытянуть губы вперед, отвести уголки в стороны, поднять верхнюю губу, опустить нижнюю губу, облизнуть их, надуть и втянуть щеки, выполнить последовательность движений языком. Тонус может быть повышенным или пониженным."
-                row_cells[1].text = "Формирование умения по подражанию вытягивать губы вперед, отводить уголки в стороны, поднимать верхнюю губу, опускать нижнюю губу, облизывать их, надувать и втянуть щеки, выполнять последовательность движений языком. Артикуляционная гимнастика; подражательные упражнения."
-            elif scores['df2'] == 2:
-                row_cells = table.rows[5].cells
-                row_cells[0].text = "Ребенок не может выполнить многие движения органами артикуляционного аппарата. Отмечается неполный объем движений, тонус мускулатуры напряженный или вялый, движения неточные, отсутствует последовательность движений, имеются сопутствующие, насильственные движения, отмечается саливация, темп движений или замедленный или быстрый."
-                row_cells[1].text = "Развитие подвижности органов артикуляции, их объема, переключения с одного движения на другое."
-            elif scores['df2'] == 3:
-                row_cells = table.rows[5].cells
-                row_cells[0].text = "Ребенок затрудняется в движении артикуляционных органов, но явных нарушений не отмечается. Отмечается ограничение объема движений, трудности изменения заданного положения речевых органов, снижение тонуса мускулатуры, недостаточная их точность. Может иметь место тремор, замедление темпа при повторных движениях."
-                row_cells[1].text = "Совершенствование подвижности органов артикуляции, их объема, переключения с одного движения на другое."
-            elif scores['df2'] == 4:
-                row_cells = table.rows[5].cells
-                row_cells[0].text = "Ребенок выполняет большинство движений артикуляционных органов, но допускает единичные ошибки или недостаточную точность."
-                row_cells[1].text = "Закрепление навыков точных движений артикуляционных органов, повышение их координации и скорости."
-            else:
-                messagebox.showerror("Ошибка", "Неправильное значение для df2")
-            # Фонематические процессы (df3)
-            table.add_row().cells
-            row_cells = table.rows[6].cells
-            row_cells[0].text = "Фонематические процессы"
-            table.add_row().cells
-            if scores['df3'] == 1:
-                row_cells = table.rows[7].cells
-                row_cells[0].text = "Ребенок не владеет навыками фонематического анализа и синтеза."
-                row_cells[1].text = "Формирование навыков фонематического анализа и синтеза на уровне слогов и простых слов."
-            elif scores['df3'] == 2:
-                row_cells = table.rows[7].cells
-                row_cells[0].text = "Ребенок допускает множественные ошибки при выполнении заданий на фонематический анализ и синтез."
-                row_cells[1].text = "Развитие навыков фонематического анализа и синтеза, включая определение последовательности звуков в словах."
-            elif scores['df3'] == 3:
-                row_cells = table.rows[7].cells
-                row_cells[0].text = "Ребенок допускает единичные ошибки при выполнении заданий на фонематический анализ и синтез."
-                row_cells[1].text = "Совершенствование навыков фонематического анализа и синтеза, работа с более сложными словами."
-            elif scores['df3'] == 4:
-                row_cells = table.rows[7].cells
-                row_cells[0].text = "Ребенок выполняет задания на фонематический анализ и синтез с минимальными ошибками."
-                row_cells[1].text = "Закрепление навыков фонематического анализа и синтеза, работа с многосложными словами и предложениями."
-            else:
-                messagebox.showerror("Ошибка", "Неправильное значение для df3")
-            # Слоговая структура слова (df4)
-            table.add_row().cells
-            row_cells = table.rows[8].cells
-            row_cells[0].text = "Слоговая структура слова"
-            table.add_row().cells
-            if scores['df4'] == 1:
-                row_cells = table.rows[9].cells
-                row_cells[0].text = "Ребенок произносит только отдельные звуки или слоги, нарушена слоговая структура слов."
-                row_cells[1].text = "Формирование навыков правильного произношения слов с простой слоговой структурой."
-            elif scores['df4'] == 2:
-                row_cells = table.rows[9].cells
-                row_cells[0].text = "Ребенок допускает множественные ошибки в произношении слов со сложной слоговой структурой."
-                row_cells[1].text = "Развитие навыков произношения слов с двух- и трехсложной структурой."
-            elif scores['df4'] == 3:
-                row_cells = table.rows[9].cells
-                row_cells[0].text = "Ребенок допускает единичные ошибки в произношении слов со сложной слоговой структурой."
-                row_cells[1].text = "Совершенствование навыков произношения слов с трех- и четырехсложной структурой."
-            elif scores['df4'] == 4:
-                row_cells = table.rows[9].cells
-                row_cells[0].text = "Ребенок произносит слова со сложной слоговой структурой с минимальными ошибками."
-                row_cells[1].text = "Закрепление навыков правильного произношения многосложных слов и словосочетаний."
-            else:
-                messagebox.showerror("Ошибка", "Неправильное значение для df4")
-            # Лексика (df5)
-            table.add_row().cells
-            row_cells = table.rows[10].cells
-            row_cells[0].text = "Лексика"
-            table.add_row().cells
-            if scores['df5'] == 1:
-                row_cells = table.rows[11].cells
-                row_cells[0].text = "Словарный запас ребенка ограничен, не использует обобщающие понятия."
-                row_cells[1].text = "Расширение словарного запаса, формирование обобщающих понятий."
-            elif scores['df5'] == 2:
-                row_cells = table.rows[11].cells
-                row_cells[0].text = "Ребенок допускает ошибки при использовании обобщающих понятий и сложных слов."
-                row_cells[1].text = "Уточнение и расширение словарного запаса, работа с обобщающими понятиями."
-            elif scores['df5'] == 3:
-                row_cells = table.rows[11].cells
-                row_cells[0].text = "Ребенок использует обобщающие понятия, но допускает единичные ошибки в сложных словах."
-                row_cells[1].text = "Совершенствование словарного запаса, работа с абстрактными и сложными понятиями."
-            elif scores['df5'] == 4:
-                row_cells = table.rows[11].cells
-                row_cells[0].text = "Ребенок использует разнообразный словарный запас с минимальными ошибками."
-                row_cells[1].text = "Закрепление навыков использования сложных и абстрактных слов в речи."
-            else:
-                messagebox.showerror("Ошибка", "Неправильное значение для df5")
-            # Грамматический строй речи (df6)
-            table.add_row().cells
-            row_cells = table.rows[12].cells
-            row_cells[0].text = "Грамматический строй речи"
-            table.add_row().cells
-            if scores['df6'] == 1:
-                row_cells = table.rows[13].cells
-                row_cells[0].text = "Значительная несформированность грамматического строя речи, множественные аграмматизмы."
-                row_cells[1].text = "Формирование навыков словоизменения и словообразования, согласования слов в предложении."
-            elif scores['df6'] == 2:
-                row_cells = table.rows[13].cells
-                row_cells[0].text = "Ребенок допускает множественные ошибки в грамматическом строе речи."
-                row_cells[1].text = "Развитие навыков использования падежей, согласования слов в роде, числе и падеже."
-            elif scores['df6'] == 3:
-                row_cells = table.rows[13].cells
-                row_cells[0].text = "Ребенок допускает единичные аграмматизмы в сложных предложениях."
-                row_cells[1].text = "Совершенствование навыков построения сложных грамматических конструкций."
-            elif scores['df6'] == 4:
-                row_cells = table.rows[13].cells
-                row_cells[0].text = "Ребенок использует грамматические конструкции с минимальными ошибками."
-                row_cells[1].text = "Закрепление навыков использования сложноподчиненных предложений и согласования слов."
-            else:
-                messagebox.showerror("Ошибка", "Неправильное значение для df6")
-            # Связная речь (df7)
-            table.add_row().cells
-            row_cells = table.rows[14].cells
-            row_cells[0].text = "Связная речь"
-            table.add_row().cells
-            if scores['df7'] == 1:
-                row_cells = table.rows[15].cells
-                row_cells[0].text = "Ребенок не владеет связной речью, отвечает односложно или не отвечает."
-                row_cells[1].text = "Формирование навыков составления простых предложений и коротких рассказов."
-            elif scores['df7'] == 2:
-                row_cells = table.rows[15].cells
-                row_cells[0].text = "Ребенок составляет короткие рассказы с помощью наводящих вопросов."
-                row_cells[1].text = "Развитие навыков составления связных рассказов по картинкам и личному опыту."
-            elif scores['df7'] == 3:
-                row_cells = table.rows[15].cells
-                row_cells[0].text = "Ребенок составляет связные рассказы, но допускает ошибки в логике и структуре."
-                row_cells[1].text = "Совершенствование навыков составления логичных и структурированных рассказов."
-            elif scores['df7'] == 4:
-                row_cells = table.rows[15].cells
-                row_cells[0].text = "Ребенок составляет связные рассказы с минимальными ошибками."
-                row_cells[1].text = "Закрепление навыков составления развернутых рассказов и пересказов."
-            else:
-                messagebox.showerror("Ошибка", "Неправильное значение для df7")
-            # ОЗОМ (df8)
-            table.add_row().cells
-            row_cells = table.rows[16].cells
-            row_cells[0].text = "ОЗОМ"
-            table.add_row().cells
-            if scores['df8'] == 1:
-                row_cells = table.rows[17].cells
-                row_cells[0].text = "Ребенок не справляется с заданиями по ознакомлению с окружающим миром."
-                row_cells[1].text = "Формирование представлений об окружающем мире в соответствии с программой."
-            elif scores['df8'] == 2:
-                row_cells = table.rows[17].cells
-                row_cells[0].text = "Ребенок допускает множественные ошибки при выполнении заданий."
-                row_cells[1].text = "Уточнение представлений об окружающем мире по лексическим темам."
-            elif scores['df8'] == 3:
-                row_cells = table.rows[17].cells
-                row_cells[0].text = "Ребенок выполняет задания, но допускает единичные ошибки."
-                row_cells[1].text = "Совершенствование знаний об окружающем мире, работа с лексическими темами."
-            elif scores['df8'] == 4:
-                row_cells = table.rows[17].cells
-                row_cells[0].text = "Ребенок выполняет задания с минимальными ошибками."
-                row_cells[1].text = "Закрепление знаний об окружающем мире, развитие активной речи."
-            else:
-                messagebox.showerror("Ошибка", "Неправильное значение для df8")
-            # ФЭМП (df9)
-            table.add_row().cells
-            row_cells = table.rows[18].cells
-            row_cells[0].text = "ФЭМП"
-            table.add_row().cells
-            if scores['df9'] == 1:
-                row_cells = table.rows[19].cells
-                row_cells[0].text = "Ребенок не справляется с заданиями математического содержания."
-                row_cells[1].text = "Формирование математических представлений в соответствии с программой."
-            elif scores['df9'] == 2:
-                row_cells = table.rows[19].cells
-                row_cells[0].text = "Математические представления не сформированы в значительной степени."
-                row_cells[1].text = "Формирование представлений о счете, форме, величине и пространственных отношениях."
-            elif scores['df9'] == 3:
-                row_cells = table.rows[19].cells
-                row_cells[0].text = "Ребенок допускает множественные ошибки в математических заданиях."
-                row_cells[1].text = "Совершенствование навыков счета, работы с числами и геометрическими фигурами."
-            elif scores['df9'] == 4:
-                row_cells = table.rows[19].cells
-                row_cells[0].text = "Ребенок выполняет математические задания с минимальными ошибками."
-                row_cells[1].text = "Закрепление навыков решения простых задач и работы с числами."
-            else:
-                messagebox.showerror("Ошибка", "Неправильное значение для df9")
-            # Конструирование (df10)
-            table.add_row().cells
-            row_cells = table.rows[20].cells
-            row_cells[0].text = "Конструирование"
-            table.add_row().cells
-            if scores['df10'] == 1:
-                row_cells = table.rows[21].cells
-                row_cells[0].text = "Ребенок не выполняет постройки из конструктора."
-                row_cells[1].text = "Формирование навыков конструирования по образцу."
-            elif scores['df10'] == 2:
-                row_cells = table.rows[21].cells
-                row_cells[0].text = "Ребенок выполняет постройки только с обучающей помощью."
-                row_cells[1].text = "Развитие навыков самостоятельного конструирования по образцу."
-            elif scores['df10'] == 3:
-                row_cells = table.rows[21].cells
-                row_cells[0].text = "Ребенок выполняет постройки с направляющей помощью."
-                row_cells[1].text = "Совершенствование навыков самостоятельного конструирования и творческого подхода."
-            elif scores['df10'] == 4:
-                row_cells = table.rows[21].cells
-                row_cells[0].text = "Ребенок выполняет постройки самостоятельно с минимальной помощью."
-                row_cells[1].text = "Закрепление навыков творческого конструирования и работы с различными материалами."
-            else:
-                messagebox.showerror("Ошибка", "Неправильное значение для df10")
 
-# Класс для управления активацией программы
-# Управляет лицензией: проверка ключа, дата активации (31 день).
-class ActivationManager:
-    def __init__(self):
-        # Инициализация путей к файлам ключа и даты активации
-        # Файлы хранятся в поддиректории 'access_key' и в корне.
-        self.current_directory = os.path.dirname(os.path.realpath(__file__))
-        self.key_file_path = os.path.join(self.current_directory, 'access_key/access_key.txt')
-        self.activation_file_path = os.path.join(self.current_directory, 'activation_date.json')
-
-    def save_activation_date(self, activation_date):
-        # Сохранение даты активации в JSON
-        # Записывает {'date': 'YYYY-MM-DD'} в файл.
-        with open(self.activation_file_path, 'w') as f:
-            json.dump({'date': activation_date}, f)
-
-    def read_activation_date(self):
-        # Чтение даты активации из JSON
-        # Возвращает строку даты или None, если файл не существует.
-        if os.path.exists(self.activation_file_path):
-            with open(self.activation_file_path) as f:
-                activation_data = json.load(f)
-                return activation_data['date']
-        return None
-
-    def is_week_passed_since_activation(self):
-        # Проверка, прошло ли 31 день с активации
-        # Если дата неверная, возвращает True (истекло).
-        activation_date_str = self.read_activation_date()
-        if activation_date_str:
-            try:
-                activation_date = datetime.strptime(activation_date_str, '%Y-%m-%d')
-                passed_time = datetime.now() - activation_date
-                return passed_time.days >= 31
-            except ValueError:
-                return True
-        return True
-
-    def read_key_from_file(self):
-        # Чтение ключа из файла
-        # Возвращает ключ без пробелов или None, если файл не существует.
-        if os.path.exists(self.key_file_path):
-            with open(self.key_file_path) as f:
-                key = f.read().strip()
-                return key
-        return None
-
-    def check_key(self, user_key):
-        # Проверка введённого ключа
-        # Сравнивает с хранимым ключом.
-        stored_key = self.read_key_from_file()
-        return user_key == stored_key
-
-    def activate(self):
-        # Логика активации программы
-        # Если файл ключа существует, запрашивает ключ, проверяет, удаляет файл и сохраняет дату.
-        # Если ключа нет, проверяет, не истекли ли 31 день с активации.
-        if os.path.exists(self.key_file_path):
-            user_key = simpledialog.askstring("Ключ", "Введите ваш ключ:")
-            if user_key and self.check_key(user_key):
-                os.remove(self.key_file_path)
-                self.save_activation_date(datetime.now().date().strftime('%Y-%m-%d'))
-                return True
-            else:
-                return False
-        else:
-            if not self.is_week_passed_since_activation():
-                return True
-            else:
-                messagebox.showerror("Ошибка", "Срок действия лицензии истёк. Вам нужен новый лицензионный ключ.")
-                return False
+from cardcreator import (
+    AGE_GROUP_BY_FILE_NAME,
+    CARD_LAYOUTS,
+    ENGINE_MODULES,
+    SCORE_COLUMNS,
+    ActivationManager,
+    BatchGenerator,
+    BatchImporter,
+    CardValidator,
+    DatabaseManager,
+    ExcelProcessor,
+    PlanCache,
+    PupilExporter,
+    WordProcessor,
+    diagnostics,
+    resolve_engine,
+)
+
+# Число воспитанников, подгружаемых в список за один запрос
+PUPILS_PAGE_SIZE = 100
+
+# Период опроса фоновой операции, мс (около 60 раз в секунду)
+BACKGROUND_POLL_MS = 16
+
+# Задержка перед фоновой загрузкой pandas и python-docx после показа меню, мс
+WARM_UP_DELAY_MS = 500
+
+
+def warm_up_libraries():
+    # Загрузка тяжёлых библиотек в фоновом потоке
+    # Модули cardcreator импортируют python-docx и движок чтения Excel только при первом использовании,
+    # чтобы меню появлялось быстро; здесь они загружаются заранее, пока пользователь работает со списком.
+    # pandas нужен только для сводки по группам и заранее не загружается.
+    import docx  # noqa: F401
+
+    importlib.import_module(ENGINE_MODULES[resolve_engine()])
+
+
+# Окно хода фоновой операции
+# Полоса прогресса (бегущая, пока число шагов неизвестно) и кнопка отмены, если операцию можно прервать.
+# Окно модальное, чтобы во время операции не запустить другую.
+class ProgressWindow(tk.Toplevel):
+    def __init__(self, master, title, cancel=None):
+        super().__init__(master)
+        self.title(title)
+        self.geometry("400x130")
+        self.resizable(False, False)
+        self.transient(master)
+        self.cancel = cancel
+        self.protocol("WM_DELETE_WINDOW", self.request_cancel)
+        self.label = tk.Label(self, text=title)
+        self.label.pack(pady=10)
+        self.bar = ttk.Progressbar(self, mode="indeterminate", length=360)
+        self.bar.pack(pady=5)
+        self.bar.start(15)
+        self.cancel_button = None
+        if cancel is not None:
+            self.cancel_button = tk.Button(self, text="Отмена", command=self.request_cancel)
+            self.cancel_button.pack(pady=5)
+        self.grab_set()
+
+    def update_progress(self, done, total):
+        # Отображение числа выполненных шагов (событие могло прийти после закрытия окна)
+        if not self.winfo_exists():
+            return
+        if str(self.bar['mode']) != "determinate":
+            self.bar.stop()
+            self.bar.config(mode="determinate")
+        self.bar.config(maximum=max(total, 1), value=done)
+        if self.cancel is None or not self.cancel.is_set():
+            self.label.config(text=f"Выполнено {done} из {total}")
+
+    def request_cancel(self):
+        # Запрос отмены: операция остановится после текущего шага
+        if self.cancel is None:
+            return
+        self.cancel.set()
+        self.cancel_button.config(state="disabled")
+        self.label.config(text="Отмена...")
 
 # Основной класс приложения с GUI
 # Наследует от tk.Tk, создает окно, меню, формы для добавления/редактирования.
@@ -888,21 +93,120 @@ class Application(tk.Tk):
     def __init__(self):
         super().__init__()
         self.title("Система управления воспитанниками")
-        self.geometry("600x400")
+        self.geometry("700x450")
+        # Фоновые операции (чтение карт, запись в БД, заполнение ИПР) выполняются по одной в отдельном потоке,
+        # чтобы окно не замирало; результаты и сообщения из потока передаются через очередь ui_events,
+        # которую главный поток разбирает по after().
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.ui_events = queue.Queue()
+        self.background_cancel = None
+        # Фоновая загрузка библиотек (при выходе отменяется, если ещё не началась)
+        self.warm_up_future = None
+        # Профилировать ли фоновые операции (включается в окне диагностики)
+        self.profile_operations = tk.BooleanVar(value=False)
         # Инициализация менеджеров
         # Создаем instances для DB, Excel, Word и активации.
-        self.db_manager = DatabaseManager()
-        self.excel_processor = ExcelProcessor()
-        self.word_processor = WordProcessor()
-        self.activation_manager = ActivationManager()
+        # Ошибки ядра (cardcreator) показываются пользователю через messagebox (из фонового потока - через очередь).
+        self.db_manager = DatabaseManager(on_error=self.show_error)
+        self.excel_processor = ExcelProcessor(on_error=self.show_error)
+        self.word_processor = WordProcessor(on_error=self.show_error, plan_cache=PlanCache())
+        self.activation_manager = ActivationManager(
+            ask_key=lambda: simpledialog.askstring("Ключ", "Введите ваш ключ:"),
+            on_error=self.show_error,
+        )
+        self.batch_importer = BatchImporter(self.db_manager)
+        self.batch_generator = BatchGenerator(self.db_manager)
+        # Уже загруженные строки списка воспитанников {id: строка} (в порядке id) и признак, что загружены все.
+        # Список подгружается страницами при прокрутке; после изменений перечитываются только изменённые строки.
+        self.pupil_rows = {}
+        self.pupils_exhausted = False
+        # Текущие условия поиска в списке (аргументы DatabaseManager.find_pupils)
+        self.pupil_filters = {}
 
         # Проверка активации и запуск меню
         # Если активация успешна, показываем меню, иначе выходим.
         if self.activation_manager.activate():
             self.main_menu()
+            # Через общий фоновый поток: операция, запущенная раньше окончания загрузки, просто подождёт её
+            self.after(WARM_UP_DELAY_MS, self.start_warm_up)
         else:
             self.quit()
 
+    def start_warm_up(self):
+        # Запуск фоновой загрузки библиотек (см. warm_up_libraries)
+        self.warm_up_future = self.executor.submit(warm_up_libraries)
+
+    def show_error(self, title, message):
+        # Показ ошибки ядра; из фонового потока сообщение передаётся главному потоку (Tk не потокобезопасен)
+        if threading.current_thread() is threading.main_thread():
+            messagebox.showerror(title, message)
+        else:
+            self.ui_events.put((messagebox.showerror, (title, message)))
+
+    def run_in_background(self, title, work, on_done, cancellable=False):
+        # Запуск work(progress, cancel) в фоновом потоке с окном прогресса
+        # progress(готово, всего) можно вызывать из потока; cancel - threading.Event или None.
+        # on_done(результат) вызывается в главном потоке после завершения.
+        cancel = threading.Event() if cancellable else None
+        window = ProgressWindow(self, title, cancel)
+
+        def progress(done, total):
+            self.ui_events.put((window.update_progress, (done, total)))
+
+        def run(progress, cancel):
+            # Замер всей операции и, если включено в окне диагностики, её профиль
+            with diagnostics.span('gui.operation', operation=title):
+                if not profile:
+                    return work(progress, cancel)
+                capture = diagnostics.ProfileCapture(name='gui')
+                with capture:
+                    result = work(progress, cancel)
+                self.ui_events.put((messagebox.showinfo, ("Профиль", f"Профиль сохранён: {capture.output_path}")))
+                return result
+
+        profile = self.profile_operations.get()
+        self.background_cancel = cancel
+        future = self.executor.submit(run, progress, cancel)
+        self.after(BACKGROUND_POLL_MS, self.poll_background, future, window, on_done)
+
+    def poll_background(self, future, window, on_done):
+        # Опрос фоновой операции: обработка событий из потока и, по завершении, передача результата
+        self.process_ui_events()
+        if not future.done():
+            self.after(BACKGROUND_POLL_MS, self.poll_background, future, window, on_done)
+            return
+        # Последние события (прогресс, сообщения) разбираются до закрытия окна, которому они адресованы
+        self.process_ui_events()
+        self.background_cancel = None
+        window.grab_release()
+        window.destroy()
+        try:
+            result = future.result()
+        except Exception as e:  # непредвиденная ошибка в потоке не должна оставлять окно прогресса висеть
+            messagebox.showerror("Ошибка", f"Операция завершилась с ошибкой: {e}")
+            return
+        on_done(result)
+
+    def process_ui_events(self):
+        # Выполнение в главном потоке действий, переданных фоновым потоком
+        while True:
+            try:
+                func, args = self.ui_events.get_nowait()
+            except queue.Empty:
+                return
+            func(*args)
+
+    def shutdown_background(self):
+        # Остановка фоновых операций при выходе из программы
+        if self.background_cancel is not None:
+            self.background_cancel.set()
+        if self.warm_up_future is not None:
+            self.warm_up_future.cancel()
+        # Соединение с базой фонового потока закрывается в нём самом (sqlite3 не даёт закрыть его из другого),
+        # поэтому задача закрытия ставится в очередь потока и выполняется перед его остановкой
+        self.executor.submit(self.db_manager.close_thread_connection)
+        self.executor.shutdown(wait=True)
+
     def clear_window(self):
         # Очистка текущего окна от виджетов
         # Уничтожает все дочерние виджеты.
@@ -913,10 +217,16 @@ class Application(tk.Tk):
         # Отображение главного меню
         # Очищаем окно и добавляем кнопки для просмотра, добавления и выхода.
         self.clear_window()
-        tk.Label(self, text="Главное меню", font=("Arial", 16)).pack(pady=20)
-        tk.Button(self, text="Просмотр воспитанников", command=self.view_pupils).pack(pady=10)
-        tk.Button(self, text="Добавить воспитанника", command=self.add_pupil_form).pack(pady=10)
-        tk.Button(self, text="Выход", command=self.quit).pack(pady=10)
+        # Кнопки с небольшими отступами, чтобы все пункты меню помещались в окно исходного размера
+        tk.Label(self, text="Главное меню", font=("Arial", 16)).pack(pady=15)
+        tk.Button(self, text="Просмотр воспитанников", command=self.view_pupils).pack(pady=5)
+        tk.Button(self, text="Добавить воспитанника", command=self.add_pupil_form).pack(pady=5)
+        tk.Button(self, text="Пакетный импорт карт", command=self.batch_import).pack(pady=5)
+        tk.Button(self, text="Проверка карт", command=self.validate_cards).pack(pady=5)
+        tk.Button(self, text="Пакетное создание ИПР", command=self.batch_generate).pack(pady=5)
+        tk.Button(self, text="Сводка по группам", command=self.cohort_report).pack(pady=5)
+        tk.Button(self, text="Диагностика", command=self.show_diagnostics).pack(pady=5)
+        tk.Button(self, text="Выход", command=self.quit).pack(pady=5)
 
     def add_pupil_form(self):
         # Форма добавления воспитанника
@@ -963,28 +273,158 @@ class Application(tk.Tk):
 
         pupil_id = self.db_manager.add_pupil(surname, name, patronymic, birth_date)
         if pupil_id:
+            # Новая запись имеет наибольший id и появится в списке со следующей страницей
+            self.pupils_exhausted = False
             self.process_excel_data(pupil_id)
 
     def view_pupils(self):
         # Просмотр списка воспитанников в таблице
         # Очищаем окно, создаем Treeview для отображения данных, добавляем кнопки для редактирования/удаления.
+        # Строки подгружаются страницами по мере прокрутки, уже загруженные берутся из self.pupil_rows.
         self.clear_window()
         tk.Label(self, text="Список воспитанников", font=("Arial", 16)).pack(pady=20)
-
-        columns = ("ID", "Фамилия", "Имя", "Отчество", "Дата рождения", "df1", "df2", "df3", "df4", "df5", "df6", "df7", "df8", "df9", "df10", "df11")
-        tree = ttk.Treeview(self, columns=columns, show="headings")
+        self.pupil_search_panel()
+
+        # Кнопки действий - одной строкой внизу; размещаются раньше таблицы, чтобы не обрезаться,
+        # когда окно ниже, чем нужно таблице
+        buttons = tk.Frame(self)
+        buttons.pack(side="bottom", pady=5)
+        frame = tk.Frame(self)
+        frame.pack(fill="both", expand=True)
+        columns = ("ID", "Фамилия", "Имя", "Отчество", "Дата рождения", "df1", "df2", "df3", "df4", "df5", "df6", "df7", "df8", "df9", "df10", "df11", "Возрастная группа")
+        tree = ttk.Treeview(frame, columns=columns, show="headings")
         for col in columns:
             tree.heading(col, text=col)
-        tree.pack(fill="both", expand=True)
-
-        pupils = self.db_manager.get_pupils()
-        for row in pupils:
-            tree.insert("", "end", values=row)
-
-        tk.Button(self, text="Изменить личные данные", command=lambda: self.edit_pupil_info(tree)).pack(pady=5)
-        tk.Button(self, text="Изменить баллы", command=lambda: self.edit_pupil_scores(tree)).pack(pady=5)
-        tk.Button(self, text="Удалить", command=lambda: self.delete_pupil(tree)).pack(pady=5)
-        tk.Button(self, text="Вернуться в меню", command=self.main_menu).pack(pady=5)
+        scrollbar = ttk.Scrollbar(frame, orient="vertical", command=tree.yview)
+        tree.configure(yscrollcommand=lambda first, last: self.on_pupils_scroll(tree, scrollbar, first, last))
+        scrollbar.pack(side="right", fill="y")
+        tree.pack(side="left", fill="both", expand=True)
+
+        for row in self.pupil_rows.values():
+            tree.insert("", "end", iid=str(row[0]), values=row)
+        if not self.pupil_rows:
+            self.load_pupils_page(tree)
+
+        tk.Button(buttons, text="Изменить личные данные", command=lambda: self.edit_pupil_info(tree)).pack(side="left", padx=5)
+        tk.Button(buttons, text="Изменить баллы", command=lambda: self.edit_pupil_scores(tree)).pack(side="left", padx=5)
+        tk.Button(buttons, text="Удалить", command=lambda: self.delete_pupil(tree)).pack(side="left", padx=5)
+        tk.Button(buttons, text="Выгрузить базу", command=self.export_pupils).pack(side="left", padx=5)
+        tk.Button(buttons, text="Вернуться в меню", command=self.main_menu).pack(side="left", padx=5)
+
+    def pupil_search_panel(self):
+        # Панель поиска над списком: начало ФИО, диапазон дат рождения, возрастная группа, порог по баллу
+        # Поля заполняются текущими условиями из self.pupil_filters.
+        filters = self.pupil_filters
+        panel = tk.Frame(self)
+        panel.pack(fill="x", padx=5)
+
+        tk.Label(panel, text="ФИО:").grid(row=0, column=0, sticky="e")
+        query_entry = tk.Entry(panel, width=20)
+        query_entry.insert(0, filters.get('query', ''))
+        query_entry.grid(row=0, column=1)
+        tk.Label(panel, text="Рождён с:").grid(row=0, column=2, sticky="e")
+        date_from_entry = tk.Entry(panel, width=11)
+        date_from_entry.insert(0, filters['birth_date_from'].strftime('%d-%m-%Y') if filters.get('birth_date_from') else '')
+        date_from_entry.grid(row=0, column=3)
+        tk.Label(panel, text="по:").grid(row=0, column=4, sticky="e")
+        date_to_entry = tk.Entry(panel, width=11)
+        date_to_entry.insert(0, filters['birth_date_to'].strftime('%d-%m-%Y') if filters.get('birth_date_to') else '')
+        date_to_entry.grid(row=0, column=5)
+
+        tk.Label(panel, text="Группа:").grid(row=1, column=0, sticky="e")
+        age_group_box = ttk.Combobox(panel, values=[""] + list(CARD_LAYOUTS), state="readonly", width=18)
+        age_group_box.set(filters.get('age_group', ''))
+        age_group_box.grid(row=1, column=1)
+        score_column, min_score, max_score = '', '', ''
+        for column, value in filters.get('min_scores', {}).items():
+            score_column, min_score = column, value
+        for column, value in filters.get('max_scores', {}).items():
+            score_column, max_score = column, value
+        tk.Label(panel, text="Балл").grid(row=1, column=2, sticky="e")
+        score_column_box = ttk.Combobox(panel, values=[""] + SCORE_COLUMNS, state="readonly", width=5)
+        score_column_box.set(score_column)
+        score_column_box.grid(row=1, column=3)
+        tk.Label(panel, text="от/до:").grid(row=1, column=4, sticky="e")
+        score_range = tk.Frame(panel)
+        score_range.grid(row=1, column=5)
+        min_score_box = ttk.Combobox(score_range, values=["", 1, 2, 3, 4], state="readonly", width=2)
+        min_score_box.set(min_score)
+        min_score_box.pack(side="left")
+        max_score_box = ttk.Combobox(score_range, values=["", 1, 2, 3, 4], state="readonly", width=2)
+        max_score_box.set(max_score)
+        max_score_box.pack(side="left")
+
+        tk.Button(panel, text="Найти", command=lambda: self.apply_pupil_filters(
+            query_entry.get(),
+            date_from_entry.get(),
+            date_to_entry.get(),
+            age_group_box.get(),
+            score_column_box.get(),
+            min_score_box.get(),
+            max_score_box.get()
+        )).grid(row=0, column=6, padx=5)
+        tk.Button(panel, text="Сбросить", command=lambda: self.apply_pupil_filters()).grid(row=1, column=6, padx=5)
+
+    def apply_pupil_filters(self, query='', date_from_str='', date_to_str='', age_group='',
+                            score_column='', min_score='', max_score=''):
+        # Применение условий поиска: список перечитывается с первой страницы уже с фильтрами в SQL
+        filters = {}
+        if query.strip():
+            filters['query'] = query.strip()
+        try:
+            if date_from_str:
+                filters['birth_date_from'] = datetime.strptime(date_from_str, '%d-%m-%Y').date()
+            if date_to_str:
+                filters['birth_date_to'] = datetime.strptime(date_to_str, '%d-%m-%Y').date()
+        except ValueError:
+            messagebox.showerror("Ошибка", "Неверный формат даты. Используйте ДД-ММ-ГГГГ")
+            return
+        if age_group:
+            filters['age_group'] = age_group
+        if score_column and min_score:
+            filters['min_scores'] = {score_column: int(min_score)}
+        if score_column and max_score:
+            filters['max_scores'] = {score_column: int(max_score)}
+
+        self.pupil_filters = filters
+        self.pupil_rows = {}
+        self.pupils_exhausted = False
+        self.view_pupils()
+
+    def load_pupils_page(self, tree):
+        # Подгрузка следующей страницы списка (keyset-пагинация: строки с id больше последнего загруженного)
+        if self.pupils_exhausted:
+            return
+        after_id = max(self.pupil_rows, default=0)
+        rows = self.db_manager.find_pupils(after_id, PUPILS_PAGE_SIZE, **self.pupil_filters)
+        if len(rows) < PUPILS_PAGE_SIZE:
+            self.pupils_exhausted = True
+        for row in rows:
+            self.pupil_rows[row[0]] = row
+            tree.insert("", "end", iid=str(row[0]), values=row)
+
+    def on_pupils_scroll(self, tree, scrollbar, first, last):
+        # Обработчик прокрутки списка: двигаем полосу прокрутки и подгружаем страницу у конца списка
+        scrollbar.set(first, last)
+        if float(last) > 0.9 and not self.pupils_exhausted:
+            self.after_idle(lambda: tree.winfo_exists() and self.load_pupils_page(tree))
+
+    def refresh_pupils(self, pupil_ids, tree=None):
+        # Перечитывание из БД только изменённых воспитанников
+        # Обновляет загруженные строки в self.pupil_rows (и в tree, если он передан); удалённые убирает.
+        loaded_ids = [pupil_id for pupil_id in pupil_ids if pupil_id in self.pupil_rows]
+        if not loaded_ids:
+            return
+        rows = self.db_manager.get_pupils_by_ids(loaded_ids)
+        for pupil_id in loaded_ids:
+            if pupil_id in rows:
+                self.pupil_rows[pupil_id] = rows[pupil_id]
+                if tree is not None:
+                    tree.item(str(pupil_id), values=rows[pupil_id])
+            else:
+                self.pupil_rows.pop(pupil_id)
+                if tree is not None:
+                    tree.delete(str(pupil_id))
 
     def edit_pupil_info(self, tree):
         # Форма редактирования личных данных
@@ -1044,6 +484,7 @@ class Application(tk.Tk):
 
         if self.db_manager.update_pupil_info(pupil_id, surname, name, patronymic, birth_date):
             messagebox.showinfo("Успех", "Данные воспитанника успешно обновлены")
+            self.refresh_pupils([pupil_id])
             self.view_pupils()
 
     def edit_pupil_scores(self, tree):
@@ -1059,7 +500,7 @@ class Application(tk.Tk):
 
     def delete_pupil(self, tree):
         # Удаление выбранного воспитанника
-        # Получаем ID, удаляем из DB, обновляем просмотр.
+        # Получаем ID, удаляем из DB и убираем только эту строку из списка.
         selected_item = tree.selection()
         if not selected_item:
             messagebox.showerror("Ошибка", "Выберите воспитанника")
@@ -1067,33 +508,218 @@ class Application(tk.Tk):
 
         pupil_id = tree.item(selected_item)['values'][0]
         if self.db_manager.delete_pupil(pupil_id):
+            self.pupil_rows.pop(pupil_id, None)
+            tree.delete(*selected_item)
             messagebox.showinfo("Успех", "Воспитанник успешно удалён")
-            self.view_pupils()
+
+    def export_pupils(self):
+        # Выгрузка всей таблицы воспитанников в CSV, Excel или Parquet (формат - по расширению файла)
+        output_path = filedialog.asksaveasfilename(
+            title="Выгрузить базу", defaultextension=".xlsx",
+            filetypes=[('Excel файлы', '*.xlsx'), ('CSV файлы', '*.csv'), ('Parquet файлы', '*.parquet')])
+        if not output_path:
+            return
+        include_recommendations = messagebox.askyesno("Выгрузка", "Добавить тексты рекомендаций по каждому показателю?")
+        exporter = PupilExporter(self.db_manager, on_error=self.show_error)
+
+        def done(rows):
+            if rows is not None:
+                messagebox.showinfo("Выгрузка", f"Выгружено воспитанников: {rows}")
+
+        self.run_in_background("Выгрузка базы", lambda progress, cancel: exporter.export(
+            output_path, include_recommendations=include_recommendations), done)
 
     def process_excel_data(self, pupil_id):
         # Обработка Excel и Word для обновления баллов и документа
-        # Запрашиваем файл Excel, читаем оценки, обновляем в DB, затем Word.
+        # Запрашиваем файл Excel; чтение оценок и запись в DB выполняются в фоновом потоке,
+        # затем (в save_scores_done) выбирается и заполняется Word.
         excel_file_path = filedialog.askopenfilename(title="Выберите файл", initialdir="Проект",
                                                      filetypes=[("Excel файлы", "*.xlsx")],
                                                      initialfile="Карта развития. Младший возраст.xlsx")
         if not excel_file_path:
             return
 
-        result = self.excel_processor.read_scores(excel_file_path)
+        def work(progress, cancel):
+            result = self.excel_processor.read_scores(excel_file_path)
+            if result is None:
+                return None
+            scores, excel_file_name = result
+            age_group = AGE_GROUP_BY_FILE_NAME[excel_file_name]
+            if not self.db_manager.update_pupil_scores(pupil_id, scores, age_group, excel_file_path):
+                return None
+            return result
+
+        self.run_in_background("Чтение карты развития", work, lambda result: self.save_scores_done(pupil_id, result))
+
+    def save_scores_done(self, pupil_id, result):
+        # Баллы записаны: обновление строки списка и заполнение ИПР (в фоновом потоке)
         if result is None:
             self.main_menu()
             return
-
         scores, excel_file_name = result
+        self.refresh_pupils([pupil_id])
+        word_file_path = filedialog.askopenfilename(title="Выберите файл", filetypes=[('Word файлы', '*.docx')])
+        if word_file_path:
+            word_save_path = filedialog.asksaveasfilename(title="Сохранить как", filetypes=[('Word файлы', '*.docx')])
+            if word_save_path:
+                self.run_in_background("Заполнение ИПР", lambda progress, cancel: self.word_processor.update_document(
+                    word_file_path, scores, excel_file_name, word_save_path), lambda saved: self.main_menu())
+                return
+        self.main_menu()
+
+    def batch_import(self):
+        # Пакетный импорт папки с картами развития
+        # ID воспитанника берётся из имени файла ("17_Карта развития. Младший возраст.xlsx") или имени папки.
+        # Импорт идёт в фоновом потоке с полосой прогресса и может быть отменён.
+        # Вместо сообщения на каждую ошибку в конце показывается один итоговый отчёт.
+        folder = filedialog.askdirectory(title="Выберите папку с картами развития", initialdir="Проект")
+        if not folder:
+            return
 
-        if self.db_manager.update_pupil_scores(pupil_id, scores):
-            word_file_path = filedialog.askopenfilename(title="Выберите файл", filetypes=[('Word файлы', '*.docx')])
-            if word_file_path:
-                self.word_processor.update_document(word_file_path, scores, excel_file_name)
-            self.main_menu()
+        def done(report):
+            self.refresh_pupils([pupil_id for _, pupil_id in report['imported']])
+            self.show_report("Итоги пакетного импорта", BatchImporter.format_report(report))
+
+        self.run_in_background("Пакетный импорт карт", lambda progress, cancel: self.batch_importer.import_folder(
+            folder, progress=progress, cancel=cancel), done, cancellable=True)
+
+    def validate_cards(self):
+        # Проверка папки с картами развития без импорта
+        # Все ячейки всех карт проверяются в фоновом потоке; вместо сообщения на каждую ошибку показывается
+        # один итог со списком ошибок, который можно сохранить в отчёт (Excel, CSV или HTML).
+        folder = filedialog.askdirectory(title="Выберите папку с картами развития", initialdir="Проект")
+        if not folder:
+            return
+        validator = CardValidator(on_error=self.show_error)
+
+        def done(report):
+            problems = [f"{problem['file']}: {problem['message']}" for problem in report['problems']]
+            self.show_report("Итоги проверки карт", "\n\n".join([CardValidator.format_report(report)] + problems))
+            if not problems:
+                return
+            output_path = filedialog.asksaveasfilename(
+                title="Сохранить отчёт об ошибках", defaultextension=".xlsx",
+                filetypes=[('Excel файлы', '*.xlsx'), ('CSV файлы', '*.csv'), ('HTML файлы', '*.html')])
+            if not output_path:
+                return
+
+            def saved(rows):
+                if rows is not None:
+                    messagebox.showinfo("Проверка карт", f"Отчёт сохранён: {output_path}")
+
+            self.run_in_background("Сохранение отчёта", lambda progress, cancel: validator.write_report(
+                report, output_path), saved)
+
+        self.run_in_background("Проверка карт", lambda progress, cancel: validator.validate(
+            folder, progress=progress, cancel=cancel), done, cancellable=True)
+
+    def batch_generate(self):
+        # Пакетное создание ИПР для всех воспитанников с импортированными баллами
+        # Шаблон и папка выбираются один раз, файлы называются по DEFAULT_PLAN_NAME_PATTERN.
+        # Генерация идёт в фоновом потоке с полосой прогресса и может быть отменена.
+        word_file_path = filedialog.askopenfilename(title="Выберите шаблон ИПР", filetypes=[('Word файлы', '*.docx')])
+        if not word_file_path:
+            return
+        output_dir = filedialog.askdirectory(title="Выберите папку для ИПР")
+        if not output_dir:
+            return
+
+        self.run_in_background(
+            "Пакетное создание ИПР",
+            lambda progress, cancel: self.batch_generator.generate(word_file_path, output_dir,
+                                                                   progress=progress, cancel=cancel),
+            lambda report: self.show_report("Итоги пакетного создания ИПР", BatchGenerator.format_report(report)),
+            cancellable=True,
+        )
+
+    def cohort_report(self):
+        # Сводная книга Excel: распределение по уровням, динамика и дети, требующие внимания
+        output_path = filedialog.asksaveasfilename(title="Сохранить сводку", defaultextension=".xlsx",
+                                                   filetypes=[('Excel файлы', '*.xlsx')])
+        if not output_path:
+            return
+        from cardcreator.analytics import CohortAnalytics  # pandas загружается только для сводки
+
+        analytics = CohortAnalytics(self.db_manager, on_error=self.show_error)
+
+        def done(sheets):
+            if sheets is not None:
+                messagebox.showinfo("Сводка по группам", f"Сводка сохранена: {output_path}")
+
+        self.run_in_background("Сводка по группам", lambda progress, cancel: analytics.write_workbook(output_path), done)
+
+    def show_report(self, title, text):
+        # Окно с текстовым отчётом (прокручиваемое, только для чтения)
+        window = tk.Toplevel(self)
+        window.title(title)
+        window.geometry("700x400")
+        scrollbar = tk.Scrollbar(window)
+        scrollbar.pack(side="right", fill="y")
+        text_widget = tk.Text(window, wrap="word", yscrollcommand=scrollbar.set)
+        text_widget.insert("1.0", text)
+        text_widget.config(state="disabled")
+        text_widget.pack(fill="both", expand=True)
+        scrollbar.config(command=text_widget.yview)
+        tk.Button(window, text="Закрыть", command=window.destroy).pack(pady=5)
+
+    def show_diagnostics(self):
+        # Окно диагностики: самые долгие из последних операций (замеры cardcreator.diagnostics)
+        # Замеры и профилирование включаются здесь же; журнал замеров пишется в logs/timings.jsonl.
+        window = tk.Toplevel(self)
+        window.title("Диагностика")
+        window.geometry("800x450")
+
+        enabled = tk.BooleanVar(value=diagnostics.is_enabled())
+
+        def toggle():
+            if enabled.get():
+                diagnostics.enable()
+            else:
+                diagnostics.disable()
+
+        options = tk.Frame(window)
+        options.pack(fill="x", padx=5, pady=5)
+        tk.Checkbutton(options, text="Замерять время операций", variable=enabled, command=toggle).pack(side="left")
+        tk.Checkbutton(options, text="Профилировать операции (cProfile)",
+                       variable=self.profile_operations).pack(side="left", padx=10)
+
+        columns = ("Операция", "мс", "Время", "Подробности")
+        frame = tk.Frame(window)
+        frame.pack(fill="both", expand=True, padx=5)
+        tree = ttk.Treeview(frame, columns=columns, show="headings")
+        for col, width in zip(columns, (200, 80, 170, 330)):
+            tree.heading(col, text=col)
+            tree.column(col, width=width, anchor="w")
+        scrollbar = ttk.Scrollbar(frame, orient="vertical", command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side="right", fill="y")
+        tree.pack(fill="both", expand=True)
+
+        def refresh():
+            tree.delete(*tree.get_children())
+            for entry in diagnostics.slowest_spans(100):
+                details = ", ".join(f"{key}={value}" for key, value in entry.items()
+                                    if key not in ('ts', 'name', 'ms', 'pid', 'thread'))
+                tree.insert("", "end", values=(entry['name'], f"{entry['ms']:.1f}", entry['ts'], details))
+
+        def clear():
+            diagnostics.clear_spans()
+            refresh()
+
+        buttons = tk.Frame(window)
+        buttons.pack(pady=5)
+        tk.Button(buttons, text="Обновить", command=refresh).pack(side="left", padx=5)
+        tk.Button(buttons, text="Очистить", command=clear).pack(side="left", padx=5)
+        tk.Button(buttons, text="Закрыть", command=window.destroy).pack(side="left", padx=5)
+        tk.Label(window, text=f"Журнал замеров: {diagnostics.TIMINGS_LOG}").pack(pady=2)
+        refresh()
 
 if __name__ == "__main__":
     # Запуск приложения
     # Создаем экземпляр Application и запускаем mainloop для GUI.
+    # freeze_support нужен для пула процессов пакетного импорта и создания ИПР в собранном CardCreator.exe.
+    multiprocessing.freeze_support()
     app = Application()
-    app.mainloop()
\ No newline at end of file
+    app.mainloop()
+    app.shutdown_background()
+    app.db_manager.close()
\ No newline at end of file
@@ -0,0 +1,69 @@
+# Бенчмарк чтения оценок из "Карт развития"
+# Сравнивает прежний способ (отдельный pd.read_excel на каждую ячейку)
+# с однопроходным ExcelProcessor.read_scores на трёх книгах из корня проекта.
+# Запуск: python benchmarks/bench_read_scores.py [--repeat N]
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+from cardcreator import AGE_GROUP_BY_FILE_NAME, CARD_LAYOUTS, ExcelProcessor, split_cell_address  # noqa: E402
+
+WORKBOOKS = [
+    'Карта развития. Младший возраст.xlsx',
+    'Карта развития. Средний возраст.xlsx',
+    'Карта развития. Старший возраст.xlsx',
+]
+
+
+def legacy_read_scores(excel_file_path, cells):
+    # Прежняя реализация: по одному вызову pd.read_excel на ячейку,
+    # т.е. книга распаковывается и разбирается заново для каждой оценки.
+    scores = {}
+    for key, (sheet, address) in cells.items():
+        row, _ = split_cell_address(address)
+        column = address.rstrip('0123456789')
+        scores[key] = pd.read_excel(excel_file_path, sheet_name=sheet, header=None,
+                                    usecols=column, nrows=1, skiprows=row).iloc[0, 0]
+    return scores
+
+
+def measure(func, repeat):
+    # Лучшее время из repeat запусков, в секундах
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сравнение однопроходного и поячеечного чтения Excel")
+    parser.add_argument('--repeat', type=int, default=5, help="число повторов для каждой книги")
+    args = parser.parse_args()
+
+    processor = ExcelProcessor()
+    print(f"{'Книга':<42}{'по ячейкам, мс':>16}{'один проход, мс':>18}{'ускорение':>12}")
+    for workbook in WORKBOOKS:
+        path = os.path.join(PROJECT_DIR, workbook)
+        scores, _ = processor.read_scores(path)
+        cells = CARD_LAYOUTS[AGE_GROUP_BY_FILE_NAME[workbook]]['cells']
+
+        legacy = legacy_read_scores(path, cells)
+        if {key: int(value) for key, value in legacy.items()} != scores:
+            raise SystemExit(f"Результаты не совпадают для {workbook}: {legacy} != {scores}")
+
+        legacy_time = measure(lambda: legacy_read_scores(path, cells), args.repeat)
+        single_time = measure(lambda: processor.read_scores(path), args.repeat)
+        print(f"{workbook:<42}{legacy_time * 1000:>16.1f}{single_time * 1000:>18.1f}"
+              f"{legacy_time / single_time:>11.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+# Бенчмарк заполнения ИПР
+# Сравнивает прежний способ (Document() на каждый документ, поиск таблицы, запись через row.cells)
+# с WordProcessor.update_document (кэш разобранного шаблона и прямая запись <w:tr>/<w:tc> в lxml).
+# Запуск: python benchmarks/bench_render_plans.py [--documents N]
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+from docx import Document
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+from cardcreator import CARD_LAYOUTS, WordProcessor  # noqa: E402
+from cardcreator.recommendations import get_row_plan, render_rows  # noqa: E402
+from cardcreator.word import TABLE_HEADERS  # noqa: E402
+
+TEMPLATE = os.path.join(PROJECT_DIR, 'ИПР_Шаблон.docx')
+
+
+def legacy_update_document(word_file_path, scores, age_group, word_save_path):
+    # Прежняя реализация: шаблон разбирается заново, ячейки заполняются через объекты python-docx
+    doc = Document(word_file_path)
+    for table in doc.tables:
+        if (table.cell(0, 0).text.strip(), table.cell(0, 1).text.strip()) == TABLE_HEADERS:
+            rows, _ = render_rows(get_row_plan(age_group), scores)
+            while len(table.rows) < len(rows) + 1:
+                table.add_row()
+            for row, (need, task) in zip(table.rows[1:], rows):
+                row_cells = row.cells
+                if need is not None:
+                    row_cells[0].text = need
+                if task is not None:
+                    row_cells[1].text = task
+            break
+    doc.save(word_save_path)
+
+
+def random_tasks(count):
+    # Случайные наборы баллов по всем возрастным группам
+    rng = random.Random(0)
+    groups = sorted(CARD_LAYOUTS)
+    return [(group, {f'df{i}': rng.randint(1, 4) for i in range(1, 12)})
+            for group in (rng.choice(groups) for _ in range(count))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сравнение прежнего и прямого заполнения ИПР")
+    parser.add_argument('--documents', type=int, default=100, help="число документов в каждом замере")
+    args = parser.parse_args()
+
+    tasks = random_tasks(args.documents)
+    processor = WordProcessor()
+    with tempfile.TemporaryDirectory() as output_dir:
+        legacy_path = os.path.join(output_dir, 'legacy.docx')
+        fast_path = os.path.join(output_dir, 'fast.docx')
+
+        # Проверка совпадения результата на первом наборе
+        group, scores = tasks[0]
+        legacy_update_document(TEMPLATE, scores, group, legacy_path)
+        processor.update_document(TEMPLATE, scores, CARD_LAYOUTS[group]['file_name'], fast_path)
+        legacy_texts = [[cell.text for cell in row.cells] for row in Document(legacy_path).tables[0].rows]
+        fast_texts = [[cell.text for cell in row.cells] for row in Document(fast_path).tables[0].rows]
+        if legacy_texts != fast_texts:
+            raise SystemExit("Результаты не совпадают")
+
+        started = time.perf_counter()
+        for group, scores in tasks:
+            legacy_update_document(TEMPLATE, scores, group, legacy_path)
+        legacy_time = (time.perf_counter() - started) / len(tasks)
+
+        started = time.perf_counter()
+        for group, scores in tasks:
+            processor.update_document(TEMPLATE, scores, CARD_LAYOUTS[group]['file_name'], fast_path)
+        fast_time = (time.perf_counter() - started) / len(tasks)
+
+    print(f"{'Способ':<36}{'мс на документ':>16}")
+    print(f"{'python-docx (прежний)':<36}{legacy_time * 1000:>16.2f}")
+    print(f"{'кэш шаблона + прямой XML':<36}{fast_time * 1000:>16.2f}")
+    print(f"Ускорение: {legacy_time / fast_time:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+# Бенчмарк времени запуска CardCreator
+# Импортирует CardCreator в отдельном процессе с python -X importtime и сравнивает суммарное время импорта
+# с бюджетом; также проверяет, что при запуске не загружаются тяжёлые библиотеки (pandas, python-docx,
+# openpyxl, pyinstrument) - они должны подгружаться при первом использовании. При превышении бюджета код возврата 1.
+# Запуск: python benchmarks/bench_startup.py [--budget МС] [--repeat N] [--top N]
+import argparse
+import os
+import subprocess
+import sys
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+# Бюджет времени импорта CardCreator, мс (с запасом для медленных машин)
+STARTUP_BUDGET_MS = 300
+
+# Модули, которые не должны загружаться при запуске
+DEFERRED_MODULES = ('pandas', 'numpy', 'docx', 'openpyxl', 'pyinstrument')
+
+
+def import_times():
+    # Время импорта модулей при "import CardCreator": {модуль: (собственное, суммарное) в мкс}, порядок загрузки
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import CardCreator'],
+                               cwd=PROJECT_DIR, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise SystemExit(f"Не удалось импортировать CardCreator:\n{completed.stderr}")
+    times = {}
+    for line in completed.stderr.splitlines():
+        # "import time:       self [us] |  cumulative | imported package"
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Проверка времени запуска CardCreator (-X importtime)")
+    parser.add_argument('--budget', type=float, default=STARTUP_BUDGET_MS, help="бюджет времени импорта, мс")
+    parser.add_argument('--repeat', type=int, default=5, help="число запусков (берётся лучший)")
+    parser.add_argument('--top', type=int, default=10, help="сколько самых долгих модулей показать")
+    args = parser.parse_args()
+
+    runs = [import_times() for _ in range(args.repeat)]
+    best = min(runs, key=lambda times: times['CardCreator'][1])
+    total_ms = best['CardCreator'][1] / 1000
+
+    print(f"{'Модуль':<50}{'собственное, мс':>18}{'суммарное, мс':>16}")
+    for name, (self_us, cumulative_us) in sorted(best.items(), key=lambda item: -item[1][1])[:args.top]:
+        print(f"{name:<50}{self_us / 1000:>18.1f}{cumulative_us / 1000:>16.1f}")
+
+    failures = []
+    loaded = [module for module in DEFERRED_MODULES if module in best]
+    if loaded:
+        failures.append(f"при запуске загружаются {', '.join(loaded)}")
+    if total_ms > args.budget:
+        failures.append(f"импорт CardCreator {total_ms:.1f} мс превышает бюджет {args.budget:.0f} мс")
+    print(f"\nИмпорт CardCreator: {total_ms:.1f} мс (бюджет {args.budget:.0f} мс)")
+    if failures:
+        raise SystemExit("Ошибка: " + "; ".join(failures))
+
+
+if __name__ == '__main__':
+    main()
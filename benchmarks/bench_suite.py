@@ -0,0 +1,287 @@
+# Набор бенчмарков конвейера "карта развития -> база -> ИПР"
+# Создаёт во временной папке синтетические данные: "Карты развития" всех трёх возрастных групп
+# со случайными баллами и базы воспитанников на 1 000 / 10 000 / 100 000 записей, затем замеряет
+# ExcelProcessor.read_scores, операции DatabaseManager, WordProcessor._fill_table и update_document.
+# Результаты сохраняются в JSON (benchmarks/results/<коммит>_<время>.json); с --compare сравниваются
+# с прежним прогоном, и при замедлении больше порога скрипт завершается с ошибкой.
+# Запуск: python benchmarks/bench_suite.py [--sizes 1000 10000] [--filter database] [--compare прежний.json]
+import argparse
+import copy
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+from cardcreator import CARD_LAYOUTS, SCORE_COLUMNS, DatabaseManager, ExcelProcessor, PlanCache  # noqa: E402
+from cardcreator.excel import available_engines, workbook_fingerprint  # noqa: E402
+from cardcreator.word import W_TBL, WordProcessor, load_template  # noqa: E402
+
+TEMPLATE = os.path.join(PROJECT_DIR, 'ИПР_Шаблон.docx')
+RESULTS_DIR = os.path.join(PROJECT_DIR, 'benchmarks', 'results')
+
+# Размеры синтетических баз воспитанников
+DB_SIZES = (1000, 10000, 100000)
+
+# Замедление (отношение лучших времён), начиная с которого результат считается регрессией
+# (лучшее время меньше зависит от фоновой нагрузки машины, чем медиана)
+REGRESSION_THRESHOLD = 1.2
+
+SURNAMES = ['Иванов', 'Петров', 'Сидоров', 'Смирнов', 'Кузнецов', 'Попов', 'Васильев', 'Соколов', 'Михайлов']
+NAMES = ['Иван', 'Пётр', 'Алексей', 'Дмитрий', 'Максим', 'Артём', 'Михаил', 'Егор', 'Кирилл', 'Матвей']
+PATRONYMICS = ['Иванович', 'Петрович', 'Сергеевич', 'Андреевич', 'Олегович', 'Викторович']
+
+
+def random_scores(rng):
+    # Случайные баллы df1–df11 от 1 до 4
+    return {column: rng.randint(1, 4) for column in SCORE_COLUMNS}
+
+
+def make_cards(directory, rng):
+    # Синтетические карты развития: копии карт из корня проекта со случайными баллами в ячейках раскладки
+    # Возвращает {возрастная группа: путь к карте}.
+    from openpyxl import load_workbook
+
+    cards = {}
+    for age_group, layout in CARD_LAYOUTS.items():
+        workbook = load_workbook(os.path.join(PROJECT_DIR, layout['file_name']))
+        for sheet, address in layout['cells'].values():
+            workbook[sheet][address] = rng.randint(1, 4)
+        path = os.path.join(directory, age_group, layout['file_name'])
+        os.makedirs(os.path.dirname(path))
+        workbook.save(path)
+        cards[age_group] = path
+    return cards
+
+
+def make_database(path, size, rng):
+    # Синтетическая база на size воспитанников с баллами (и историей оценок) у каждого
+    db_manager = DatabaseManager(path)
+    first_birth_date = date(2017, 1, 1)
+    pupils = [(rng.choice(SURNAMES) + f'{index}', rng.choice(NAMES), rng.choice(PATRONYMICS),
+               (first_birth_date + timedelta(days=rng.randrange(5 * 365))).isoformat())
+              for index in range(size)]
+    db_manager.add_pupils_bulk(pupils)
+    age_groups = list(CARD_LAYOUTS)
+    db_manager.update_scores_many([(pupil_id, random_scores(rng), rng.choice(age_groups))
+                                   for pupil_id in sorted(db_manager.get_pupil_ids())])
+    return db_manager
+
+
+def measure(func, repeat, number):
+    # Время одного вызова func в секундах: repeat замеров, в каждом func вызывается number раз
+    # Перед замерами один прогревочный вызов (кэши шаблонов, подготовленные запросы SQLite).
+    func()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - started) / number)
+    return {
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'mean': statistics.fmean(timings),
+        'stdev': statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        'repeat': repeat,
+        'number': number,
+    }
+
+
+def excel_cases(cards):
+    # Замеры чтения карт каждым установленным движком: (имя, параметры, функция, число вызовов в замере)
+    for age_group, path in cards.items():
+        yield 'excel.workbook_fingerprint', {'age_group': age_group}, lambda path=path: workbook_fingerprint(path), 20
+    for engine in available_engines():
+        processor = ExcelProcessor(engine=engine)
+        for age_group, path in cards.items():
+            yield 'excel.read_scores', {'age_group': age_group, 'engine': engine}, \
+                lambda path=path, processor=processor: processor.read_scores(path), 1
+
+
+def database_cases(db_manager, size, rng):
+    # Замеры операций DatabaseManager на базе из size воспитанников
+    pupil_ids = sorted(db_manager.get_pupil_ids())
+    middle_id = pupil_ids[len(pupil_ids) // 2]
+    sample_ids = rng.sample(pupil_ids, min(100, len(pupil_ids)))
+    age_groups = list(CARD_LAYOUTS)
+    counter = iter(range(10 ** 9))
+
+    def consume_batches():
+        for _ in db_manager.iter_pupil_batches():
+            pass
+
+    def update_scores():
+        db_manager.update_pupil_scores(rng.choice(pupil_ids), random_scores(rng), rng.choice(age_groups))
+
+    def update_many():
+        db_manager.update_scores_many([(pupil_id, random_scores(rng), rng.choice(age_groups))
+                                       for pupil_id in sample_ids])
+
+    def add_bulk():
+        batch = next(counter)
+        db_manager.add_pupils_bulk([(f'Новиков{batch}_{index}', 'Олег', 'Олегович', '2020-05-05')
+                                    for index in range(100)])
+
+    params = {'pupils': size}
+    yield 'database.get_pupils', params, db_manager.get_pupils, 1
+    yield 'database.iter_pupil_batches', params, consume_batches, 1
+    yield 'database.get_scored_pupils', params, db_manager.get_scored_pupils, 1
+    yield 'database.get_pupil_ids', params, db_manager.get_pupil_ids, 1
+    yield 'database.get_pupils_page', params, lambda: db_manager.get_pupils_page(middle_id), 20
+    yield 'database.find_pupils[query]', params, lambda: db_manager.find_pupils(query='Иванов1 Ив'), 20
+    yield 'database.find_pupils[filters]', params, lambda: db_manager.find_pupils(
+        age_group='Средний возраст', birth_date_from='2019-01-01', birth_date_to='2019-12-31',
+        max_scores={'df3': 2}), 20
+    yield 'database.get_pupils_by_ids[100]', params, lambda: db_manager.get_pupils_by_ids(sample_ids), 5
+    yield 'database.get_score_history', params, lambda: db_manager.get_score_history(middle_id), 20
+    yield 'database.add_pupil', params, lambda: db_manager.add_pupil(
+        'Новиков', 'Олег', 'Олегович', '2020-05-05'), 5
+    yield 'database.update_pupil_info', params, lambda: db_manager.update_pupil_info(
+        middle_id, 'Новиков', 'Олег', 'Олегович', '2020-05-05'), 5
+    yield 'database.update_pupil_scores', params, update_scores, 5
+    yield 'database.update_scores_many[100]', params, update_many, 1
+    yield 'database.add_pupils_bulk[100]', params, add_bulk, 1
+
+
+def word_cases(directory, rng):
+    # Замеры заполнения ИПР: только таблица (в копии XML шаблона) и весь документ (без кэша и из кэша)
+    processor = WordProcessor()
+    cached_processor = WordProcessor(plan_cache=PlanCache(os.path.join(directory, 'plans')))
+    template = load_template(TEMPLATE)
+    save_path = os.path.join(directory, 'ИПР.docx')
+    for age_group, layout in CARD_LAYOUTS.items():
+        scores = random_scores(rng)
+        file_name = layout['file_name']
+
+        def fill_table(scores=scores, file_name=file_name):
+            element = copy.deepcopy(template['element'])
+            processor._fill_table(element.body.findall(W_TBL)[template['table_index']], scores, file_name)
+
+        params = {'age_group': age_group}
+        yield 'word._fill_table', params, fill_table, 20
+        yield 'word.update_document', params, lambda scores=scores, file_name=file_name: \
+            processor.update_document(TEMPLATE, scores, file_name, save_path), 5
+        yield 'word.update_document[cached]', params, lambda scores=scores, file_name=file_name: \
+            cached_processor.update_document(TEMPLATE, scores, file_name, save_path), 5
+
+
+def environment():
+    # Описание прогона: версия кода, Python, SQLite и библиотек
+    import docx
+    import openpyxl
+    import pandas
+    import sqlite3
+
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_DIR,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = 'unknown'
+    return {
+        'commit': commit,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'sqlite': sqlite3.sqlite_version,
+        'pandas': pandas.__version__,
+        'openpyxl': openpyxl.__version__,
+        'python-docx': getattr(docx, '__version__', 'unknown'),
+    }
+
+
+def result_key(result):
+    # Ключ для сопоставления результатов разных прогонов
+    return result['name'], json.dumps(result['params'], ensure_ascii=False, sort_keys=True)
+
+
+def compare(results, baseline_path, threshold):
+    # Сравнение лучших времён с прежним прогоном; возвращает список регрессий
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = {result_key(result): result for result in json.load(f)['results']}
+    regressions = []
+    print(f"\nСравнение с {baseline_path}:")
+    for result in results:
+        previous = baseline.get(result_key(result))
+        if previous is None:
+            continue
+        ratio = result['min'] / previous['min']
+        mark = ''
+        if ratio > threshold:
+            mark = '  <- замедление'
+            regressions.append(result)
+        print(f"{describe(result):<70}{ratio:>8.2f}x{mark}")
+    return regressions
+
+
+def describe(result):
+    # Имя замера с параметрами для вывода
+    params = ', '.join(f'{value}' for value in result['params'].values())
+    return f"{result['name']} ({params})"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарки импорта карт, операций с базой и заполнения ИПР")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DB_SIZES, help="размеры синтетических баз")
+    parser.add_argument('--repeat', type=int, default=5, help="число замеров каждой операции")
+    parser.add_argument('--filter', help="замерять только операции, в имени которых есть эта строка")
+    parser.add_argument('--output', help="файл JSON с результатами (по умолчанию в benchmarks/results)")
+    parser.add_argument('--compare', help="файл JSON прежнего прогона для сравнения")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help="допустимое замедление лучшего времени (отношение к прежнему прогону)")
+    parser.add_argument('--seed', type=int, default=1, help="начальное значение генератора данных")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    directory = tempfile.mkdtemp(prefix='cardcreator_bench_')
+    results = []
+    try:
+        def run(cases):
+            for name, params, func, number in cases:
+                if args.filter and args.filter not in name:
+                    continue
+                result = {'name': name, 'params': params, **measure(func, args.repeat, number)}
+                results.append(result)
+                print(f"{describe(result):<70}{result['median'] * 1000:>10.3f} мс")
+
+        print(f"{'Операция':<70}{'медиана':>13}")
+        run(excel_cases(make_cards(directory, rng)))
+        for size in args.sizes:
+            started = time.perf_counter()
+            db_manager = make_database(os.path.join(directory, f'pupils_{size}.db'), size, rng)
+            print(f"-- база на {size} воспитанников создана за {time.perf_counter() - started:.1f} с")
+            try:
+                run(database_cases(db_manager, size, rng))
+            finally:
+                db_manager.close()
+        run(word_cases(directory, rng))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    run_info = environment()
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{run_info['commit']}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({'environment': run_info, 'results': results}, f, ensure_ascii=False, indent=2)
+    print(f"\nРезультаты сохранены: {output}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        if regressions:
+            raise SystemExit(f"Замедление больше {args.threshold}x: "
+                             + ", ".join(describe(result) for result in regressions))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+# Ядро "Системы управления воспитанниками" без зависимости от tkinter
+# Используется GUI (CardCreator.py) и командной строкой (python -m cardcreator).
+from cardcreator.activation import ActivationManager
+from cardcreator.database import SCORE_COLUMNS, DatabaseManager
+from cardcreator.excel import (
+    AGE_GROUP_BY_FILE_NAME,
+    CARD_LAYOUTS,
+    DEFAULT_EXCEL_ENGINE,
+    ENGINE_MODULES,
+    EXCEL_ENGINES,
+    BatchImporter,
+    ExcelProcessor,
+    ScoreReadError,
+    available_engines,
+    detect_age_group,
+    get_layout_plan,
+    resolve_engine,
+    split_cell_address,
+    workbook_fingerprint,
+)
+from cardcreator.export import PupilExporter
+from cardcreator.plan_cache import PlanCache
+from cardcreator.validation import CardValidator
+from cardcreator.watcher import FolderWatcher
+from cardcreator.word import BatchGenerator, WordProcessor
+
+
+def __getattr__(name):
+    # CohortAnalytics загружается при первом обращении: модуль аналитики импортирует pandas и numpy,
+    # которые не нужны для запуска программы и просмотра списка воспитанников
+    if name == 'CohortAnalytics':
+        from cardcreator.analytics import CohortAnalytics
+        return CohortAnalytics
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
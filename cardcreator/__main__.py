@@ -0,0 +1,6 @@
+# Запуск без GUI: python -m cardcreator import|watch|generate|plans|analytics|validate|export ...
+import sys
+
+from cardcreator.cli import main
+
+sys.exit(main())
@@ -0,0 +1,85 @@
+import json
+import os
+from datetime import datetime
+
+from cardcreator.config import APP_DIR, log_error
+
+# Класс для управления активацией программы
+# Управляет лицензией: проверка ключа, дата активации (31 день).
+class ActivationManager:
+    def __init__(self, ask_key=None, on_error=None):
+        # Инициализация путей к файлам ключа и даты активации
+        # Файлы хранятся в поддиректории 'access_key' и в корне.
+        # ask_key() запрашивает ключ у пользователя (в GUI - simpledialog), on_error(заголовок, текст) - вывод ошибок.
+        self.current_directory = APP_DIR
+        self.ask_key = ask_key
+        self.on_error = on_error or log_error
+        self.key_file_path = os.path.join(self.current_directory, 'access_key/access_key.txt')
+        self.activation_file_path = os.path.join(self.current_directory, 'activation_date.json')
+
+    def save_activation_date(self, activation_date):
+        # Сохранение даты активации в JSON
+        # Записывает {'date': 'YYYY-MM-DD'} в файл.
+        with open(self.activation_file_path, 'w') as f:
+            json.dump({'date': activation_date}, f)
+
+    def read_activation_date(self):
+        # Чтение даты активации из JSON
+        # Возвращает строку даты или None, если файл не существует.
+        if os.path.exists(self.activation_file_path):
+            with open(self.activation_file_path) as f:
+                activation_data = json.load(f)
+                return activation_data['date']
+        return None
+
+    def is_week_passed_since_activation(self):
+        # Проверка, прошло ли 31 день с активации
+        # Если дата неверная, возвращает True (истекло).
+        activation_date_str = self.read_activation_date()
+        if activation_date_str:
+            try:
+                activation_date = datetime.strptime(activation_date_str, '%Y-%m-%d')
+                passed_time = datetime.now() - activation_date
+                return passed_time.days >= 31
+            except ValueError:
+                return True
+        return True
+
+    def read_key_from_file(self):
+        # Чтение ключа из файла
+        # Возвращает ключ без пробелов или None, если файл не существует.
+        if os.path.exists(self.key_file_path):
+            with open(self.key_file_path) as f:
+                key = f.read().strip()
+                return key
+        return None
+
+    def check_key(self, user_key):
+        # Проверка введённого ключа
+        # Сравнивает с хранимым ключом.
+        stored_key = self.read_key_from_file()
+        return user_key == stored_key
+
+    def activate(self):
+        # Логика активации программы
+        # Если файл ключа существует, запрашивает ключ, проверяет, удаляет файл и сохраняет дату.
+        # Если ключа нет, проверяет, не истекли ли 31 день с активации.
+        if os.path.exists(self.key_file_path):
+            user_key = self.ask_key() if self.ask_key is not None else None
+            if user_key and self.check_key(user_key):
+                os.remove(self.key_file_path)
+                self.save_activation_date(datetime.now().date().strftime('%Y-%m-%d'))
+                return True
+            else:
+                return False
+        else:
+            if not self.is_week_passed_since_activation():
+                return True
+            else:
+                self.on_error("Ошибка", "Срок действия лицензии истёк. Вам нужен новый лицензионный ключ.")
+                return False
+
+    def is_activated(self):
+        # Проверка лицензии без запроса ключа (для запуска без GUI)
+        # Программа должна быть уже активирована через GUI, и 31 день с активации не должен истечь.
+        return not os.path.exists(self.key_file_path) and not self.is_week_passed_since_activation()
@@ -0,0 +1,207 @@
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from cardcreator.config import log_error
+from cardcreator.database import PUPIL_SELECT_COLUMNS, SCORE_COLUMNS
+from cardcreator.excel import CARD_LAYOUTS
+
+# Уровни оценок (1 - наибольшие трудности, 4 - норма)
+SCORE_LEVELS = [1, 2, 3, 4]
+
+# Балл, при котором (и ниже) ребёнок попадает в список "Требуют внимания"
+ATTENTION_SCORE = 1
+
+
+# Подписи показателей {(группа, dfN): "dfN (лист карты)"} - смысл dfN зависит от возрастной группы
+INDICATOR_LABELS = {
+    f"{age_group}|{indicator}": f"{indicator} ({sheet})"
+    for age_group, layout in CARD_LAYOUTS.items()
+    for indicator, (sheet, _) in layout['cells'].items()
+}
+
+
+def indicator_labels(frame):
+    # Подписи показателей для строк frame со столбцами age_group и indicator (векторно)
+    return frame['age_group'].str.cat(frame['indicator'], sep='|').map(INDICATOR_LABELS).fillna(frame['indicator'])
+
+
+def sort_by_indicator(frame, columns):
+    # Сортировка по столбцам columns и номеру показателя (df2 раньше df10)
+    order = frame['indicator'].str[2:].astype(int)
+    return frame.assign(indicator_order=order).sort_values(columns + ['indicator_order']).drop(columns='indicator_order')
+
+
+def join_labels(frame, key):
+    # Подписи строк frame (столбец label), собранные через запятую для каждого значения key
+    # Строки разворачиваются в таблицу "ключ × показатель" и склеиваются по столбцам,
+    # а не отдельной Python-функцией на каждую группу.
+    if frame.empty:
+        return pd.Series(dtype=object)
+    wide = frame.assign(position=frame['indicator'].str[2:].astype(int)).pivot(
+        index=key, columns='position', values='label').sort_index(axis=1)
+    return (wide + ', ').fillna('').sum(axis=1).str[:-2]
+
+
+def term_keys(year, month):
+    # Учебное полугодие по году и месяцу оценки (векторно)
+    # Сентябрь–декабрь - 1 полугодие учебного года, январь–август - 2 полугодие.
+    # Ключ = год начала учебного года * 2 + номер полугодия (сортируется по времени).
+    start_year = year - (month < 9)
+    return start_year * 2 + np.where(month >= 9, 1, 2)
+
+
+def term_label(key):
+    # Подпись полугодия по ключу: "2025/2026, 1 полугодие"
+    start_year, half = divmod(int(key) - 1, 2)
+    return f"{start_year}/{start_year + 1}, {half + 1} полугодие"
+
+
+# Сводная аналитика по группам
+# Баллы загружаются одним запросом в DataFrame, все показатели считаются векторно (groupby/crosstab),
+# без перебора воспитанников в Python. Результат - сводная книга Excel.
+class CohortAnalytics:
+    def __init__(self, db_manager, on_error=None, attention_score=ATTENTION_SCORE):
+        self.db_manager = db_manager
+        self.on_error = on_error or log_error
+        self.attention_score = attention_score
+
+    def load(self):
+        # Загрузка текущих баллов (pupils) и истории оценок (assessments)
+        # Возвращает (снимок, история) или None в случае ошибки.
+        connection = self.db_manager.create_connection()
+        if connection is None:
+            return None
+        try:
+            snapshot = pd.read_sql_query(
+                f"SELECT {PUPIL_SELECT_COLUMNS} FROM pupils WHERE age_group IS NOT NULL", connection)
+            # Год и месяц оценки выделяются в SQLite, чтобы не разбирать строки времени в Python;
+            # порядок по времени внутри (воспитанник, показатель) даёт индекс idx_assessments_pupil
+            history = pd.read_sql_query("""
+                SELECT pupil_id, age_group, indicator, score, assessed_at,
+                       CAST(substr(assessed_at, 1, 4) AS INTEGER) AS year,
+                       CAST(substr(assessed_at, 6, 2) AS INTEGER) AS month
+                FROM assessments WHERE score IS NOT NULL
+                ORDER BY pupil_id, indicator, assessed_at
+            """, connection)
+        except (sqlite3.Error, pd.errors.DatabaseError) as e:
+            self.on_error("Ошибка базы данных", f"Ошибка загрузки баллов для аналитики: {e}")
+            return None
+        return snapshot, history
+
+    @staticmethod
+    def long_scores(snapshot):
+        # Текущие баллы в длинном формате: (id, age_group, indicator, score), без пустых
+        long = snapshot.melt(id_vars=['id', 'age_group'], value_vars=SCORE_COLUMNS,
+                             var_name='indicator', value_name='score').dropna(subset=['score'])
+        long['score'] = long['score'].astype(int)
+        return long
+
+    def distribution(self, long):
+        # Распределение по уровням 1–4 для каждой группы и показателя
+        # Возвращает (число детей на уровне с итогом и средним баллом, доля детей на уровне в процентах).
+        counts = pd.crosstab([long['age_group'], long['indicator']], long['score'])
+        counts = counts.reindex(columns=SCORE_LEVELS, fill_value=0)
+        counts.columns.name = None
+        total = counts.sum(axis=1)
+        shares = (counts.div(total, axis=0) * 100).round(1)
+        counts['total'] = total
+        counts['mean'] = ((counts[SCORE_LEVELS] * SCORE_LEVELS).sum(axis=1) / total).round(2)
+        return (sort_by_indicator(counts.reset_index(), ['age_group']),
+                sort_by_indicator(shares.reset_index(), ['age_group']))
+
+    @staticmethod
+    def term_deltas(history):
+        # Изменение балла между соседними полугодиями для каждого воспитанника и показателя
+        # В полугодии берётся последняя оценка; сравниваются только оценки одной возрастной группы
+        # (после перехода в следующую группу dfN означает другой показатель).
+        if history.empty:
+            return history.assign(term_key=[], delta=[])
+        # Строки уже упорядочены по времени (load), поэтому повторная сортировка не нужна
+        history = history.assign(term_key=term_keys(history['year'], history['month']))
+        terms = history.drop_duplicates(['pupil_id', 'age_group', 'indicator', 'term_key'], keep='last').copy()
+        terms['delta'] = terms['score'] - terms.groupby(['pupil_id', 'age_group', 'indicator'])['score'].shift()
+        return terms.dropna(subset=['delta'])
+
+    @staticmethod
+    def delta_summary(deltas):
+        # Динамика по группам: сколько детей улучшили, сохранили и снизили балл по показателю
+        if deltas.empty:
+            return pd.DataFrame(columns=['term', 'age_group', 'indicator', 'pupils', 'mean_delta',
+                                         'improved', 'unchanged', 'declined'])
+        sign = np.sign(deltas['delta'])
+        summary = deltas.assign(improved=sign > 0, unchanged=sign == 0, declined=sign < 0).groupby(
+            ['term_key', 'age_group', 'indicator']).agg(
+            pupils=('delta', 'size'), mean_delta=('delta', 'mean'),
+            improved=('improved', 'sum'), unchanged=('unchanged', 'sum'), declined=('declined', 'sum'),
+        ).reset_index()
+        summary['mean_delta'] = summary['mean_delta'].round(2)
+        summary.insert(0, 'term', summary['term_key'].map(term_label))
+        return sort_by_indicator(summary, ['term_key', 'age_group']).drop(columns='term_key')
+
+    def attention_list(self, snapshot, long, deltas):
+        # Дети, требующие внимания: текущий балл не выше attention_score или снижение балла
+        # в последнем полугодии по сравнению с предыдущим
+        low = long[long['score'] <= self.attention_score]
+        low_labels = join_labels(low.assign(label=indicator_labels(low)), 'id')
+
+        declined_labels = pd.Series(dtype=object)
+        if not deltas.empty:
+            latest = deltas[deltas['term_key'] == deltas.groupby('pupil_id')['term_key'].transform('max')]
+            declined = latest[latest['delta'] < 0]
+            label = indicator_labels(declined) + ': ' + declined['delta'].astype(int).astype(str)
+            declined_labels = join_labels(declined.assign(label=label), 'pupil_id')
+
+        pupils = snapshot.set_index('id')[['surname', 'name', 'patronymic', 'birth_date', 'age_group']]
+        result = pupils.assign(low=low_labels, declined=declined_labels)
+        result = result[result['low'].notna() | result['declined'].notna()].fillna({'low': '', 'declined': ''})
+        return result.reset_index().sort_values(['age_group', 'surname', 'name'])
+
+    def build(self):
+        # Все таблицы сводки: {имя листа: DataFrame} или None в случае ошибки
+        loaded = self.load()
+        if loaded is None:
+            return None
+        snapshot, history = loaded
+        long = self.long_scores(snapshot)
+        counts, shares = self.distribution(long)
+        deltas = self.term_deltas(history)
+
+        def with_labels(frame):
+            frame = frame.copy()
+            frame.insert(2, 'label', indicator_labels(frame))
+            return frame
+
+        return {
+            'Распределение': with_labels(counts).rename(columns={
+                'age_group': 'Возрастная группа', 'indicator': 'Показатель', 'label': 'Область',
+                1: 'Уровень 1', 2: 'Уровень 2', 3: 'Уровень 3', 4: 'Уровень 4',
+                'total': 'Всего детей', 'mean': 'Средний балл'}),
+            'Доли уровней': with_labels(shares).rename(columns={
+                'age_group': 'Возрастная группа', 'indicator': 'Показатель', 'label': 'Область',
+                1: 'Уровень 1, %', 2: 'Уровень 2, %', 3: 'Уровень 3, %', 4: 'Уровень 4, %'}),
+            'Динамика': self.delta_summary(deltas).rename(columns={
+                'term': 'Полугодие', 'age_group': 'Возрастная группа', 'indicator': 'Показатель',
+                'pupils': 'Детей', 'mean_delta': 'Среднее изменение', 'improved': 'Улучшение',
+                'unchanged': 'Без изменений', 'declined': 'Снижение'}),
+            'Требуют внимания': self.attention_list(snapshot, long, deltas).rename(columns={
+                'id': 'ID', 'surname': 'Фамилия', 'name': 'Имя', 'patronymic': 'Отчество',
+                'birth_date': 'Дата рождения', 'age_group': 'Возрастная группа',
+                'low': f'Баллы не выше {self.attention_score}', 'declined': 'Снижение за полугодие'}),
+        }
+
+    def write_workbook(self, output_path):
+        # Запись сводной книги Excel (по листу на таблицу)
+        # Возвращает {имя листа: число строк} или None в случае ошибки.
+        sheets = self.build()
+        if sheets is None:
+            return None
+        try:
+            with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
+                for sheet_name, frame in sheets.items():
+                    frame.to_excel(writer, sheet_name=sheet_name, index=False)
+        except OSError as e:
+            self.on_error("Ошибка", f"Не удалось сохранить сводку: {e}")
+            return None
+        return {sheet_name: len(frame) for sheet_name, frame in sheets.items()}
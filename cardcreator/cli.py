@@ -0,0 +1,303 @@
+import argparse
+import json
+import os
+import signal
+import string
+import sys
+from contextlib import nullcontext
+
+from cardcreator import diagnostics
+from cardcreator.activation import ActivationManager
+from cardcreator.database import DatabaseManager
+from cardcreator.excel import (
+    AGE_GROUP_BY_FILE_NAME,
+    DEFAULT_EXCEL_ENGINE,
+    EXCEL_ENGINES,
+    BatchImporter,
+    ExcelProcessor,
+    ScoreReadError,
+)
+from cardcreator.export import EXPORT_BATCH_SIZE, EXPORT_FORMATS, PupilExporter
+from cardcreator.plan_cache import PlanCache
+from cardcreator.validation import REPORT_FORMATS, CardValidator
+from cardcreator.watcher import FolderWatcher
+from cardcreator.word import DEFAULT_PLAN_NAME_PATTERN, PLAN_NAME_FIELDS, BatchGenerator, WordProcessor
+
+# Коды завершения командной строки
+EXIT_OK = 0               # команда выполнена без ошибок
+EXIT_FAILED = 1           # команда выполнена, но часть работы завершилась ошибками
+EXIT_USAGE = 2            # неверные аргументы (так же завершается argparse)
+EXIT_NOT_ACTIVATED = 3    # программа не активирована или срок лицензии истёк
+
+
+# Сборщик ошибок ядра
+# Передаётся как on_error(заголовок, текст) вместо messagebox и копит ошибки для итогового результата.
+class ErrorCollector:
+    def __init__(self):
+        self.errors = []
+
+    def __call__(self, title, message, file=None):
+        self.errors.append({'title': title, 'message': message, 'file': file})
+
+
+def parse_cell_reference(value):
+    # Разбор ссылки на ячейку вида "Лист!A1" в кортеж (лист, адрес)
+    sheet, separator, address = value.rpartition('!')
+    if not separator or not sheet or not address:
+        raise argparse.ArgumentTypeError(f"ожидается ссылка вида Лист!A1, получено: {value}")
+    return sheet, address.upper()
+
+
+def parse_name_pattern(value):
+    # Проверка шаблона имени файла ИПР до запуска генерации: только поля PLAN_NAME_FIELDS
+    try:
+        fields = [field for _, field, _, _ in string.Formatter().parse(value) if field is not None]
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(f"неверный шаблон имени файла {value}: {e}")
+    unknown = [field for field in fields if field.split('.')[0].split('[')[0] not in PLAN_NAME_FIELDS]
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"неизвестные поля в шаблоне имени файла: {', '.join('{' + field + '}' for field in unknown)} "
+            f"(доступны: {' '.join('{' + field + '}' for field in PLAN_NAME_FIELDS)})")
+    return value
+
+
+def build_parser():
+    # Описание команд и аргументов
+    parser = argparse.ArgumentParser(
+        prog='python -m cardcreator',
+        description="Система управления воспитанниками: импорт карт, генерация ИПР и выгрузка без GUI.",
+    )
+    parser.add_argument('--db', type=os.path.abspath, default=None,
+                        help="файл базы данных; относительный путь - от текущей папки "
+                             "(по умолчанию pupil_db.db в папке программы)")
+    parser.add_argument('--json', action='store_true', help="вывести результат одним JSON-объектом")
+    parser.add_argument('--excel-engine', choices=(DEFAULT_EXCEL_ENGINE,) + EXCEL_ENGINES, default=DEFAULT_EXCEL_ENGINE,
+                        help="движок чтения карт: calamine (если установлен python-calamine), openpyxl или pandas; "
+                             "по умолчанию самый быстрый из установленных")
+    parser.add_argument('--trace', action='store_true',
+                        help=f"записывать время операций в журнал {diagnostics.TIMINGS_LOG}")
+    parser.add_argument('--profile', metavar='FILE',
+                        help="профилировать команду: FILE.prof - cProfile, FILE.html - pyinstrument (если установлен)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = commands.add_parser('import', help="пакетный импорт карт развития из папки или по маске")
+    import_parser.add_argument('source', help="папка с картами или маска glob")
+    import_parser.add_argument('--id-cell', type=parse_cell_reference,
+                               help="ячейка с ID воспитанника (Лист!A1); по умолчанию ID берётся из имени файла")
+    import_parser.add_argument('--workers', type=int, help="число процессов разбора (по умолчанию по числу ядер)")
+    import_parser.add_argument('--force', action='store_true',
+                               help="разобрать все файлы заново, даже если они не изменились с прошлого импорта")
+
+    watch_parser = commands.add_parser('watch', help="следить за папкой и импортировать новые и изменённые карты")
+    watch_parser.add_argument('folder', help="папка приёма карт развития")
+    watch_parser.add_argument('--id-cell', type=parse_cell_reference,
+                              help="ячейка с ID воспитанника (Лист!A1); по умолчанию ID берётся из имени файла")
+    watch_parser.add_argument('--workers', type=int, help="число процессов разбора (по умолчанию по числу ядер)")
+    watch_parser.add_argument('--poll', action='store_true', help="опрашивать папку, даже если установлен watchdog")
+
+    generate_parser = commands.add_parser('generate', help="заполнить ИПР по карте развития")
+    generate_parser.add_argument('card', help="файл карты развития (.xlsx)")
+    generate_parser.add_argument('--template', required=True, help="шаблон ИПР (.docx)")
+    generate_parser.add_argument('--output', required=True, help="путь для сохранения заполненного ИПР")
+    generate_parser.add_argument('--pupil-id', type=int, help="также сохранить баллы воспитаннику с этим ID")
+
+    plans_parser = commands.add_parser('plans', help="пакетно создать ИПР по баллам из базы данных")
+    plans_parser.add_argument('--template', required=True, help="шаблон ИПР (.docx)")
+    plans_parser.add_argument('--output-dir', required=True, help="папка для готовых ИПР")
+    plans_parser.add_argument('--pupil-id', type=int, action='append', dest='pupil_ids',
+                              help="ID воспитанника (можно указать несколько раз); по умолчанию все с баллами")
+    plans_parser.add_argument('--pattern', type=parse_name_pattern, default=DEFAULT_PLAN_NAME_PATTERN,
+                              help=f"шаблон имени файла, поля: {' '.join('{' + field + '}' for field in PLAN_NAME_FIELDS)}")
+    plans_parser.add_argument('--workers', type=int, help="число процессов (по умолчанию по числу ядер)")
+    plans_parser.add_argument('--no-cache', action='store_true', help="не брать готовые документы из кэша")
+
+    analytics_parser = commands.add_parser('analytics', help="сводная книга Excel по группам и показателям")
+    analytics_parser.add_argument('output', help="путь к книге .xlsx")
+    analytics_parser.add_argument('--attention-score', type=int,
+                                  help="балл, при котором ребёнок попадает в список внимания (по умолчанию наименьший - 1)")
+
+    validate_parser = commands.add_parser('validate', help="проверить все карты в папке и собрать ошибки в один отчёт")
+    validate_parser.add_argument('source', help="папка с картами или маска glob")
+    validate_parser.add_argument('--report', help=f"файл отчёта об ошибках ({', '.join('.' + f for f in REPORT_FORMATS)})")
+    validate_parser.add_argument('--workers', type=int, help="число процессов проверки (по умолчанию по числу ядер)")
+
+    export_parser = commands.add_parser('export', help="выгрузить таблицу воспитанников в CSV, Excel или Parquet")
+    export_parser.add_argument('output', help="путь к файлу (.csv, .xlsx или .parquet)")
+    export_parser.add_argument('--format', choices=EXPORT_FORMATS, help="формат (по умолчанию по расширению файла)")
+    export_parser.add_argument('--recommendations', action='store_true',
+                               help="добавить тексты рекомендаций (потребности и задачи) по каждому показателю")
+    export_parser.add_argument('--batch-size', type=int, default=EXPORT_BATCH_SIZE,
+                               help=f"строк за одно чтение из базы (по умолчанию {EXPORT_BATCH_SIZE})")
+    return parser
+
+
+def run_import(args, db_manager, collector):
+    # Команда import: пакетный импорт, ошибки по файлам попадают в результат
+    report = BatchImporter(db_manager, args.excel_engine).import_folder(
+        args.source, id_cell=args.id_cell, workers=args.workers, force=args.force)
+    for path, error in report['errors']:
+        collector("Ошибка импорта", error, file=path)
+    return {
+        'total': report['total'],
+        'imported': [{'file': path, 'pupil_id': pupil_id} for path, pupil_id in report['imported']],
+        'skipped': report['skipped'],
+        'elapsed': round(report['elapsed'], 3),
+    }
+
+
+def run_watch(args, db_manager, collector):
+    # Команда watch: импорт карт по мере появления в папке, до Ctrl+C
+    # Без --json о каждом импортированном файле сообщается сразу.
+    def print_report(report):
+        if not args.json:
+            for path, pupil_id in report['imported']:
+                print(f"{path}: баллы записаны воспитаннику с ID {pupil_id}", flush=True)
+            for path, error in report['errors']:
+                print(f"{path}: {error}", file=sys.stderr, flush=True)
+
+    watcher = FolderWatcher(db_manager, args.folder, id_cell=args.id_cell, workers=args.workers,
+                            on_report=print_report, use_watchdog=not args.poll, engine=args.excel_engine)
+    signal.signal(signal.SIGINT, lambda signum, frame: watcher.stop())
+    report = watcher.run()
+    for path, error in report['errors']:
+        collector("Ошибка импорта", error, file=path)
+    return {
+        'total': report['total'],
+        'imported': [{'file': path, 'pupil_id': pupil_id} for path, pupil_id in report['imported']],
+        'skipped': report['skipped'],
+        'elapsed': round(report['elapsed'], 3),
+    }
+
+
+def run_generate(args, db_manager, collector):
+    # Команда generate: чтение карты, (необязательно) запись баллов в БД и заполнение ИПР
+    try:
+        scores, excel_file_name = ExcelProcessor(on_error=collector, engine=args.excel_engine).parse_scores(args.card)
+    except ScoreReadError as e:
+        collector("Ошибка", str(e), file=args.card)
+        return {}
+
+    result = {'scores': scores, 'card': excel_file_name}
+    if args.pupil_id is not None and not db_manager.update_pupil_scores(
+            args.pupil_id, scores, AGE_GROUP_BY_FILE_NAME[excel_file_name], args.card):
+        return result
+
+    word_processor = WordProcessor(on_error=collector, plan_cache=PlanCache())
+    if word_processor.update_document(args.template, scores, excel_file_name, args.output):
+        result['output'] = args.output
+    return result
+
+
+def run_plans(args, db_manager, collector):
+    # Команда plans: пакетная генерация ИПР, ошибки по воспитанникам попадают в результат
+    generator = BatchGenerator(db_manager, cache_dir=None) if args.no_cache else BatchGenerator(db_manager)
+    report = generator.generate(args.template, args.output_dir, pupil_ids=args.pupil_ids,
+                                name_pattern=args.pattern, workers=args.workers)
+    for pupil_id, error in report['errors']:
+        collector("Ошибка создания ИПР", f"ID {pupil_id}: {error}")
+    return {
+        'total': report['total'],
+        'generated': [{'pupil_id': pupil_id, 'file': path} for pupil_id, path in report['generated']],
+        'elapsed': round(report['elapsed'], 3),
+        'docs_per_second': round(report['docs_per_second'], 1),
+    }
+
+
+def run_analytics(args, db_manager, collector):
+    # Команда analytics: распределения, динамика и список детей, требующих внимания
+    # pandas и numpy загружаются только для этой команды (как в GUI), а не при каждом запуске
+    from cardcreator.analytics import ATTENTION_SCORE, CohortAnalytics
+
+    attention_score = ATTENTION_SCORE if args.attention_score is None else args.attention_score
+    sheets = CohortAnalytics(db_manager, on_error=collector,
+                             attention_score=attention_score).write_workbook(args.output)
+    if sheets is None:
+        return {}
+    return {'output': args.output, 'sheets': sheets}
+
+
+def run_validate(args, db_manager, collector):
+    # Команда validate: проверка всех ячеек всех карт без импорта; каждая найденная ошибка - в результат
+    validator = CardValidator(on_error=collector, engine=args.excel_engine)
+    report = validator.validate(args.source, workers=args.workers)
+    for problem in report['problems']:
+        collector("Ошибка в карте", problem['message'], file=problem['file'])
+    result = {
+        'total': report['total'],
+        'checked': report['checked'],
+        'valid': report['valid'],
+        'problems': len(report['problems']),
+        'elapsed': round(report['elapsed'], 3),
+    }
+    if args.report and validator.write_report(report, args.report) is not None:
+        result['report'] = args.report
+    return result
+
+
+def run_export(args, db_manager, collector):
+    # Команда export: потоковая выгрузка таблицы pupils
+    rows = PupilExporter(db_manager, on_error=collector).export(
+        args.output, args.format, include_recommendations=args.recommendations, batch_size=args.batch_size)
+    if rows is None:
+        return {}
+    return {'rows': rows, 'output': args.output}
+
+
+COMMANDS = {
+    'import': run_import,
+    'watch': run_watch,
+    'generate': run_generate,
+    'plans': run_plans,
+    'analytics': run_analytics,
+    'validate': run_validate,
+    'export': run_export,
+}
+
+
+def print_result(result, as_json):
+    # Вывод результата: JSON в stdout или текст (ошибки - в stderr)
+    if as_json:
+        json.dump(result, sys.stdout, ensure_ascii=False, indent=2, default=str)
+        sys.stdout.write('\n')
+        return
+    for key, value in result.items():
+        if key not in ('errors', 'status', 'exit_code') and not isinstance(value, (list, dict)):
+            print(f"{key}: {value}")
+    for error in result['errors']:
+        location = f"{error['file']}: " if error.get('file') else ''
+        print(f"{location}{error['title']}: {error['message']}", file=sys.stderr)
+
+
+def main(argv=None):
+    # Точка входа командной строки
+    # Возвращает код завершения (EXIT_*); результат всегда содержит список структурированных ошибок.
+    args = build_parser().parse_args(argv)
+    collector = ErrorCollector()
+
+    if not ActivationManager(on_error=collector).is_activated():
+        collector("Ошибка", "Программа не активирована или срок действия лицензии истёк. "
+                            "Запустите CardCreator и введите лицензионный ключ.")
+        exit_code = EXIT_NOT_ACTIVATED
+        result = {'command': args.command}
+    else:
+        if args.trace:
+            diagnostics.enable()
+        capture = diagnostics.ProfileCapture(args.command, args.profile) if args.profile else nullcontext()
+        result = {'command': args.command}
+        with capture, diagnostics.span('cli.command', command=args.command):
+            # Без --db - база программы (DatabaseManager ищет её в папке программы), иначе - путь пользователя
+            db_manager = DatabaseManager(args.db or 'pupil_db.db', on_error=collector)
+            try:
+                result.update(COMMANDS[args.command](args, db_manager, collector))
+            finally:
+                db_manager.close()
+        if args.profile:
+            result['profile'] = capture.output_path
+        exit_code = EXIT_FAILED if collector.errors else EXIT_OK
+
+    result['status'] = 'ok' if exit_code == EXIT_OK else 'error'
+    result['exit_code'] = exit_code
+    result['errors'] = collector.errors
+    print_result(result, args.json)
+    return exit_code
@@ -0,0 +1,13 @@
+import logging
+import os
+
+# Папка программы: здесь лежат pupil_db.db, access_key/ и activation_date.json (рядом с CardCreator.py)
+APP_DIR = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+logger = logging.getLogger('cardcreator')
+
+
+def log_error(title, message):
+    # Обработчик ошибок по умолчанию для работы без GUI
+    # Имеет ту же сигнатуру, что и messagebox.showerror(заголовок, текст), и пишет ошибку в журнал.
+    logger.error("%s: %s", title, message)
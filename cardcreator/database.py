@@ -0,0 +1,738 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+from cardcreator.config import APP_DIR, log_error
+from cardcreator.diagnostics import timed
+
+# Столбцы оценок в таблице pupils
+SCORE_COLUMNS = [f'df{i}' for i in range(1, 12)]
+
+# Столбцы, которые возвращают запросы списка воспитанников (id, личные данные, df1-df11, возрастная группа)
+PUPIL_COLUMNS = ["id", "surname", "name", "patronymic", "birth_date"] + SCORE_COLUMNS + ["age_group"]
+PUPIL_SELECT_COLUMNS = ", ".join(PUPIL_COLUMNS)
+QUALIFIED_PUPIL_COLUMNS = ", ".join(f"pupils.{column}" for column in PUPIL_COLUMNS)
+
+# Условие совпадения естественного ключа (см. DatabaseManager.natural_key)
+# Отсутствующее отчество хранится как '' или (в старых записях) NULL; "patronymic = ?" с NULL не совпадает,
+# и воспитанник без отчества добавлялся бы заново при каждом импорте.
+NATURAL_KEY_CONDITION = "surname = ? AND name = ? AND COALESCE(patronymic, '') = ? AND birth_date IS ?"
+
+# Вставка воспитанника, если записи с таким естественным ключом ещё нет
+# (работает и на старых базах, где возможны дубликаты, поэтому без UNIQUE/ON CONFLICT)
+INSERT_MISSING_PUPIL_SQL = f"""
+    INSERT INTO pupils (surname, name, patronymic, birth_date)
+    SELECT ?, ?, ?, ?
+    WHERE NOT EXISTS (
+        SELECT 1 FROM pupils WHERE {NATURAL_KEY_CONDITION}
+    )
+"""
+
+# Запись баллов по ID (возрастная группа меняется, только если передана)
+# Строка обновляется, только если хотя бы одно значение отличается от сохранённого: повторная запись
+# тех же баллов не переписывает страницы базы (история оценок пишется отдельно, см. _write_scores).
+UPDATE_CHANGED_SCORES_BY_ID_SQL = """
+    UPDATE pupils
+    SET df1 = :df1, df2 = :df2, df3 = :df3, df4 = :df4, df5 = :df5, df6 = :df6, df7 = :df7, df8 = :df8,
+        df9 = :df9, df10 = :df10, df11 = :df11, age_group = COALESCE(:age_group, age_group)
+    WHERE id = :id AND (
+        df1 IS NOT :df1 OR df2 IS NOT :df2 OR df3 IS NOT :df3 OR df4 IS NOT :df4 OR df5 IS NOT :df5
+        OR df6 IS NOT :df6 OR df7 IS NOT :df7 OR df8 IS NOT :df8 OR df9 IS NOT :df9 OR df10 IS NOT :df10
+        OR df11 IS NOT :df11 OR age_group IS NOT COALESCE(:age_group, age_group)
+    )
+"""
+
+# Запись оценки в историю (таблица assessments)
+INSERT_ASSESSMENT_SQL = """
+    INSERT INTO assessments (pupil_id, age_group, indicator, score, assessed_at, source_file)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+# Запись манифеста импорта: файл, его размер, время изменения, хэш содержимого и ID воспитанника
+UPSERT_MANIFEST_SQL = """
+    INSERT OR REPLACE INTO import_manifest (path, size, mtime_ns, content_hash, pupil_id)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+
+def scores_by_column(scores):
+    # Словарь всех df1-df11 из scores (None для отсутствующих ключей) для именованных параметров SQL
+    return {column: scores.get(column) for column in SCORE_COLUMNS}
+
+
+def sql_casefold(value):
+    # Функция SQL casefold: строка без учёта регистра (в том числе кириллица), остальное - как есть
+    return value.casefold() if isinstance(value, str) else value
+
+
+def assessment_time():
+    # Метка времени оценки в истории: ГГГГ-ММ-ДД ЧЧ:ММ:СС (сортируется как строка)
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+# Класс для управления базой данных SQLite
+# Этот класс отвечает за создание, подключение и операции с базой данных pupils.db,
+# где хранятся данные о воспитанниках: личные данные и оценки (df1-df11).
+class DatabaseManager:
+    def __init__(self, db_name='pupil_db.db', on_error=None):
+        # Полнотекстовый индекс имён (FTS5) включается в init_database, если SQLite его поддерживает.
+        self.fts_enabled = False
+        # База данных лежит в папке программы (рядом с CardCreator.py), если не указан абсолютный путь.
+        self.db_name = os.path.join(APP_DIR, db_name)
+        # Обработчик ошибок on_error(заголовок, текст): в GUI - messagebox.showerror, без GUI - журнал.
+        self.on_error = on_error or log_error
+        # Долгоживущие соединения: по одному на поток (sqlite3 не разрешает делить соединение между потоками)
+        # _connections - {ID потока: соединение}, чтобы при выходе найти соединения, не закрытые своими потоками.
+        self._local = threading.local()
+        self._connections = {}
+        self._connections_lock = threading.Lock()
+        # Инициализируем базу данных (создаём таблицу, если её нет)
+        self.init_database()
+
+    def create_connection(self):
+        # Соединение с базой данных для текущего потока
+        # Открывается один раз и переиспользуется всеми методами, поэтому не платим за подключение
+        # и загрузку схемы на каждый запрос; sqlite3 кэширует подготовленные запросы (cached_statements)
+        # по тексту SQL, так что повторные запросы не компилируются заново.
+        # Возвращает объект соединения или None в случае ошибки.
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            return connection
+        connection = None
+        try:
+            connection = sqlite3.connect(self.db_name, cached_statements=256)
+            self._configure_connection(connection)
+        except sqlite3.Error as e:
+            # Обработка ошибки подключения
+            # Открытое, но не настроенное соединение закрываем; сообщение об ошибке - обработчику on_error.
+            if connection is not None:
+                connection.close()
+            self.on_error("Ошибка базы данных", f"Ошибка подключения к базе данных: {e}")
+            return None
+        self._local.connection = connection
+        with self._connections_lock:
+            self._connections[threading.get_ident()] = connection
+        return connection
+
+    def _configure_connection(self, connection):
+        # Настройки соединения
+        # WAL: читатели не блокируют запись; synchronous=NORMAL в режиме WAL безопасен для целостности
+        # и не делает fsync на каждую транзакцию; кэш страниц 16 МБ и отображение файла в память 64 МБ.
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("PRAGMA cache_size=-16000")
+        connection.execute("PRAGMA mmap_size=67108864")
+        connection.execute("PRAGMA temp_store=MEMORY")
+        # casefold(текст) для поиска без FTS5: LIKE в SQLite не различает регистр только латиницы
+        connection.create_function('casefold', 1, sql_casefold, deterministic=True)
+
+    def close_thread_connection(self):
+        # Закрытие соединения текущего потока
+        # sqlite3 разрешает закрыть соединение только в потоке, который его открыл, поэтому фоновые потоки
+        # (например, поток фоновых операций GUI) должны вызвать этот метод сами до своего завершения.
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            return
+        self._local.connection = None
+        with self._connections_lock:
+            self._connections.pop(threading.get_ident(), None)
+        try:
+            connection.close()
+        except sqlite3.Error as e:
+            self.on_error("Ошибка базы данных", f"Ошибка закрытия базы данных: {e}")
+
+    def close(self):
+        # Закрытие соединений при выходе из программы
+        # Закрывается соединение текущего потока; соединения других потоков они должны закрыть сами
+        # (close_thread_connection) - о незакрытых сообщается через on_error.
+        self.close_thread_connection()
+        with self._connections_lock:
+            remaining, self._connections = len(self._connections), {}
+        if remaining:
+            self.on_error("Ошибка базы данных",
+                          f"Не закрыто соединений с базой данных из других потоков: {remaining}")
+
+    @timed('database.init_database')
+    def init_database(self):
+        # Инициализация базы данных: создание таблицы pupils, если она не существует
+        # Таблица содержит ID, личные данные и поля для оценок df1-df11 (INTEGER, могут быть NULL).
+        connection = self.create_connection()
+        if connection:
+            try:
+                cursor = connection.cursor()
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS pupils (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        surname TEXT,
+                        name TEXT,
+                        patronymic TEXT,
+                        birth_date DATE,
+                        df1 INTEGER,
+                        df2 INTEGER,
+                        df3 INTEGER,
+                        df4 INTEGER,
+                        df5 INTEGER,
+                        df6 INTEGER,
+                        df7 INTEGER,
+                        df8 INTEGER,
+                        df9 INTEGER,
+                        df10 INTEGER,
+                        df11 INTEGER
+                    )
+                """)
+                # Миграция старых баз: возрастная группа последней импортированной карты
+                columns = {row[1] for row in cursor.execute("PRAGMA table_info(pupils)")}
+                if 'age_group' not in columns:
+                    cursor.execute("ALTER TABLE pupils ADD COLUMN age_group TEXT")
+                # Индекс по естественному ключу воспитанника для пакетных upsert-операций
+                # (он же обслуживает поиск по началу фамилии)
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_pupils_natural_key
+                    ON pupils (surname, name, patronymic, birth_date)
+                """)
+                # Индексы для фильтров списка воспитанников
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_pupils_name ON pupils (name)")
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_pupils_birth_date ON pupils (birth_date)")
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_pupils_age_group ON pupils (age_group)")
+                # Манифест пакетного импорта: по нему повторный импорт пропускает неизменившиеся карты
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS import_manifest (
+                        path TEXT PRIMARY KEY,
+                        size INTEGER,
+                        mtime_ns INTEGER,
+                        content_hash TEXT,
+                        pupil_id INTEGER
+                    )
+                """)
+                self._init_assessments(cursor)
+                self.fts_enabled = self._init_name_search(cursor)
+                connection.commit()
+            except sqlite3.Error as e:
+                connection.rollback()
+                # Обработка ошибки создания таблицы
+                self.on_error("Ошибка базы данных", f"Ошибка инициализации базы данных: {e}")
+            finally:
+                # Закрываем курсор; соединение остаётся открытым для следующих запросов.
+                cursor.close()
+
+    def _init_assessments(self, cursor):
+        # История оценок: одна строка на показатель каждой импортированной карты
+        # Смысл dfN зависит от возрастной группы, поэтому группа хранится в каждой строке.
+        # Покрывающие индексы: динамика воспитанника (pupil_id, indicator, assessed_at) и срезы
+        # по группе (age_group, indicator, assessed_at) читаются только из индекса, без обращения к таблице.
+        # При первом создании таблица заполняется текущими баллами из pupils (миграция старых баз).
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'assessments'")
+        exists = cursor.fetchone() is not None
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS assessments (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                pupil_id INTEGER NOT NULL,
+                age_group TEXT,
+                indicator TEXT NOT NULL,
+                score INTEGER,
+                assessed_at TEXT NOT NULL,
+                source_file TEXT
+            )
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_assessments_pupil
+            ON assessments (pupil_id, indicator, assessed_at, score, age_group)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_assessments_group
+            ON assessments (age_group, indicator, assessed_at, score, pupil_id)
+        """)
+        # История удаляется вместе с воспитанником
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS pupils_assessments_delete AFTER DELETE ON pupils BEGIN
+                DELETE FROM assessments WHERE pupil_id = old.id;
+            END
+        """)
+        if not exists:
+            assessed_at = assessment_time()
+            for column in SCORE_COLUMNS:
+                cursor.execute(f"""
+                    INSERT INTO assessments (pupil_id, age_group, indicator, score, assessed_at, source_file)
+                    SELECT id, age_group, '{column}', {column}, ?, NULL FROM pupils WHERE {column} IS NOT NULL
+                """, (assessed_at,))
+
+    def _write_scores(self, cursor, pupil_id, scores, age_group=None, source_file=None, assessed_at=None,
+                      new_assessment=None):
+        # Запись баллов воспитанника и строк истории оценок (внутри транзакции вызывающего)
+        # Строка pupils переписывается, только если баллы изменились. История пишется для каждой новой
+        # оценки (new_assessment; по умолчанию - если передан файл карты source_file), даже если баллы
+        # совпали с прошлыми: иначе оценка нового полугодия с теми же баллами пропала бы из истории.
+        # Без новой оценки (ручная правка, повторный разбор того же файла) история пишется только при изменении.
+        # Возвращает True, если строка pupils изменилась, False, если нет, и None, если воспитанника с таким ID
+        # нет (тогда ничего не пишется, чтобы в истории не появлялись оценки несуществующих воспитанников).
+        if new_assessment is None:
+            new_assessment = source_file is not None
+        cursor.execute("SELECT age_group FROM pupils WHERE id = ?", (pupil_id,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        cursor.execute(UPDATE_CHANGED_SCORES_BY_ID_SQL,
+                       dict(scores_by_column(scores), age_group=age_group, id=pupil_id))
+        changed = cursor.rowcount > 0
+        if not changed and not new_assessment:
+            return False
+        if age_group is None:
+            age_group = row[0]
+        assessed_at = assessed_at or assessment_time()
+        cursor.executemany(INSERT_ASSESSMENT_SQL, [
+            (pupil_id, age_group, column, scores[column], assessed_at, source_file)
+            for column in SCORE_COLUMNS if scores.get(column) is not None
+        ])
+        return changed
+
+    @timed('database.get_score_history')
+    def get_score_history(self, pupil_id, indicator=None):
+        # История оценок воспитанника по времени (читается из покрывающего индекса idx_assessments_pupil)
+        # Возвращает список (показатель, балл, время оценки, возрастная группа).
+        connection = self.create_connection()
+        if connection:
+            try:
+                cursor = connection.cursor()
+                if indicator is None:
+                    cursor.execute("""
+                        SELECT indicator, score, assessed_at, age_group FROM assessments
+                        WHERE pupil_id = ? ORDER BY indicator, assessed_at
+                    """, (pupil_id,))
+                else:
+                    cursor.execute("""
+                        SELECT indicator, score, assessed_at, age_group FROM assessments
+                        WHERE pupil_id = ? AND indicator = ? ORDER BY assessed_at
+                    """, (pupil_id, indicator))
+                return cursor.fetchall()
+            except sqlite3.Error as e:
+                connection.rollback()
+                self.on_error("Ошибка базы данных", f"Ошибка получения истории оценок: {e}")
+            finally:
+                cursor.close()
+        return []
+
+    def _init_name_search(self, cursor):
+        # Полнотекстовый индекс FTS5 по фамилии, имени и отчеству (external content над pupils)
+        # Синхронизируется триггерами; при первом создании заполняется из существующих записей.
+        # Возвращает False, если SQLite собран без FTS5 (тогда поиск идёт через LIKE).
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'pupils_fts'")
+        exists = cursor.fetchone() is not None
+        try:
+            cursor.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS pupils_fts
+                USING fts5(surname, name, patronymic, content='pupils', content_rowid='id')
+            """)
+        except sqlite3.OperationalError:
+            return False
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS pupils_fts_insert AFTER INSERT ON pupils BEGIN
+                INSERT INTO pupils_fts (rowid, surname, name, patronymic)
+                VALUES (new.id, new.surname, new.name, new.patronymic);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS pupils_fts_delete AFTER DELETE ON pupils BEGIN
+                INSERT INTO pupils_fts (pupils_fts, rowid, surname, name, patronymic)
+                VALUES ('delete', old.id, old.surname, old.name, old.patronymic);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS pupils_fts_update AFTER UPDATE OF surname, name, patronymic ON pupils BEGIN
+                INSERT INTO pupils_fts (pupils_fts, rowid, surname, name, patronymic)
+                VALUES ('delete', old.id, old.surname, old.name, old.patronymic);
+                INSERT INTO pupils_fts (rowid, surname, name, patronymic)
+                VALUES (new.id, new.surname, new.name, new.patronymic);
+            END
+        """)
+        if not exists:
+            cursor.execute("INSERT INTO pupils_fts (pupils_fts) VALUES ('rebuild')")
+        return True
+
+    @timed('database.add_pupil')
+    def add_pupil(self, surname, name, patronymic, birth_date):
+        # Добавление нового воспитанника в базу данных.
+        # Вставляет только личные данные, оценки добавляются позже.
+        # Возвращает ID добавленного воспитанника или None в случае ошибки.
+        connection = self.create_connection()
+        if connection:
+            try:
+                cursor = connection.cursor()
+                cursor.execute("""
+                    INSERT INTO pupils (surname, name, patronymic, birth_date)
+                    VALUES (?, ?, ?, ?)
+                """, (surname, name, patronymic, birth_date))
+                pupil_id = cursor.lastrowid
+                connection.commit()
+                return pupil_id
+            except sqlite3.Error as e:
+                connection.rollback()
+                self.on_error("Ошибка базы данных", f"Ошибка добавления воспитанника: {e}")
+            finally:
+                cursor.close()
+        return None
+
+    @timed('database.get_pupils')
+    def get_pupils(self):
+        # Получение списка всех воспитанников из базы данных
+        # Возвращает список кортежей с данными (id, surname, ..., df11).
+        connection = self.create_connection()
+        if connection:
+            try:
+                cursor = connection.cursor()
+                cursor.execute(f"SELECT {PUPIL_SELECT_COLUMNS} FROM pupils")
+                return cursor.fetchall()  # Возврат всех строк
+            except sqlite3.Error as e:
+                connection.rollback()
+                # Обработка ошибки чтения
+                self.on_error("Ошибка базы данных", f"Ошибка получения данных воспитанников: {e}")
+            finally:
+                cursor.close()
+        return []
+
+    def iter_pupil_batches(self, batch_size=1000):
+        # Потоковое чтение всех воспитанников пачками по batch_size строк (fetchmany), по возрастанию id
+        # Генератор: в памяти одновременно только одна пачка, сколько бы записей ни было в базе.
+        connection = self.create_connection()
+        if connection:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(f"SELECT {PUPIL_SELECT_COLUMNS} FROM pupils ORDER BY id")
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        return
+                    yield rows
+            except sqlite3.Error as e:
+                connection.rollback()
+                self.on_error("Ошибка базы данных", f"Ошибка получения данных воспитанников: {e}")
+            finally:
+                cursor.close()
+
+    def get_pupils_page(self, after_id=0, limit=100):
+        # Страница списка воспитанников для постепенной подгрузки (keyset-пагинация по id)
+        # Возвращает до limit строк с id > after_id по возрастанию id; в отличие от OFFSET,
+        # стоимость запроса не растёт с номером страницы - поиск идёт по первичному ключу.
+        return self.find_pupils(after_id, limit)
+
+    @timed('database.find_pupils')
+    def find_pupils(self, after_id=0, limit=100, query=None, birth_date_from=None, birth_date_to=None,
+                    age_group=None, min_scores=None, max_scores=None):
+        # Поиск и фильтрация воспитанников на стороне SQLite, страницами как в get_pupils_page
+        # query - начала слов фамилии/имени/отчества ("Ив Пет"), через FTS5 или LIKE, если FTS5 нет;
+        # birth_date_from/birth_date_to - диапазон дат рождения (включительно); age_group - возрастная группа;
+        # min_scores/max_scores - пороги по баллам, например {'df3': 2}.
+        source = "pupils"
+        key_column = "pupils.id"
+        conditions = []
+        params = []
+
+        tokens = query.split() if query else []
+        if tokens and self.fts_enabled:
+            # Обход идёт по FTS-индексу в порядке rowid и останавливается на limit совпадениях
+            source = "pupils_fts JOIN pupils ON pupils.id = pupils_fts.rowid"
+            key_column = "pupils_fts.rowid"
+            conditions.append("pupils_fts MATCH ?")
+            params.append(" AND ".join('"' + token.replace('"', '""') + '"*' for token in tokens))
+        else:
+            for token in tokens:
+                conditions.append("(casefold(pupils.surname) LIKE ? OR casefold(pupils.name) LIKE ? "
+                                  "OR casefold(pupils.patronymic) LIKE ?)")
+                params.extend([token.casefold() + '%'] * 3)
+
+        birth_dates = [value.isoformat() if hasattr(value, 'isoformat') else value
+                       for value in (birth_date_from, birth_date_to)]
+        if birth_dates[0]:
+            conditions.append("pupils.birth_date >= ?")
+            params.append(birth_dates[0])
+        if birth_dates[1]:
+            conditions.append("pupils.birth_date <= ?")
+            params.append(birth_dates[1])
+        if age_group:
+            conditions.append("pupils.age_group = ?")
+            params.append(age_group)
+        for operator, thresholds in ((">=", min_scores), ("<=", max_scores)):
+            for column, value in (thresholds or {}).items():
+                if column not in SCORE_COLUMNS:
+                    raise ValueError(f"Неизвестный показатель: {column}")
+                conditions.append(f"pupils.{column} {operator} ?")
+                params.append(value)
+
+        connection = self.create_connection()
+        if connection:
+            try:
+                cursor = connection.cursor()
+                if source == "pupils" and any(birth_dates) and self._is_narrow_birth_date_range(cursor, *birth_dates):
+                    # Узкий диапазон дат: выгоднее индекс по дате рождения и сортировка немногих строк,
+                    # чем обход по id до limit совпадений
+                    source = "pupils INDEXED BY idx_pupils_birth_date"
+                conditions.insert(0, f"{key_column} > ?")
+                cursor.execute(
+                    f"SELECT {QUALIFIED_PUPIL_COLUMNS} FROM {source} WHERE {' AND '.join(conditions)} "
+                    f"ORDER BY {key_column} LIMIT ?",
+                    [after_id] + params + [limit])
+                return cursor.fetchall()
+            except sqlite3.Error as e:
+                connection.rollback()
+                self.on_error("Ошибка базы данных", f"Ошибка поиска воспитанников: {e}")
+            finally:
+                cursor.close()
+        return []
+
+    @staticmethod
+    def _is_narrow_birth_date_range(cursor, birth_date_from, birth_date_to):
+        # Проверка, что в диапазон дат рождения попадает немного записей (не больше 2000)
+        # Подсчёт ограничен, поэтому стоит не больше 2000 шагов по индексу idx_pupils_birth_date.
+        cursor.execute("""
+            SELECT count(*) FROM (
+                SELECT 1 FROM pupils INDEXED BY idx_pupils_birth_date
+                WHERE birth_date >= ? AND birth_date <= ? LIMIT 2001
+            )
+        """, (birth_date_from or '0000-01-01', birth_date_to or '9999-12-31'))
+        return cursor.fetchone()[0] <= 2000
+
+    @timed('database.get_scored_pupils')
+    def get_scored_pupils(self):
+        # Воспитанники, для которых уже импортированы баллы и известна возрастная группа
+        # (все, для кого можно построить ИПР). Возвращает список строк по возрастанию id.
+        connection = self.create_connection()
+        if connection:
+            try:
+                cursor = connection.cursor()
+                cursor.execute(f"SELECT {PUPIL_SELECT_COLUMNS} FROM pupils "
+                               f"WHERE age_group IS NOT NULL AND df1 IS NOT NULL ORDER BY id")
+                return cursor.fetchall()
+            except sqlite3.Error as e:
+                connection.rollback()
+                self.on_error("Ошибка базы данных", f"Ошибка получения данных воспитанников: {e}")
+            finally:
+                cursor.close()
+        return []
+
+    @timed('database.get_pupils_by_ids')
+    def get_pupils_by_ids(self, pupil_ids):
+        # Получение строк воспитанников по списку ID (для точечного обновления списка после изменений)
+        # Возвращает словарь {id: строка}; удалённых воспитанников в нём нет.
+        pupil_ids = list(pupil_ids)
+        connection = self.create_connection()
+        if connection:
+            try:
+                cursor = connection.cursor()
+                rows = {}
+                # Запрос частями, чтобы не упереться в ограничение SQLite на число параметров
+                for start in range(0, len(pupil_ids), 500):
+                    chunk = pupil_ids[start:start + 500]
+                    placeholders = ", ".join("?" * len(chunk))
+                    cursor.execute(f"SELECT {PUPIL_SELECT_COLUMNS} FROM pupils WHERE id IN ({placeholders})", chunk)
+                    rows.update((row[0], row) for row in cursor.fetchall())
+                return rows
+            except sqlite3.Error as e:
+                connection.rollback()
+                self.on_error("Ошибка базы данных", f"Ошибка получения данных воспитанников: {e}")
+            finally:
+                cursor.close()
+        return {}
+
+    @timed('database.update_pupil_info')
+    def update_pupil_info(self, pupil_id, surname, name, patronymic, birth_date):
+        # Обновление личных данных воспитанника
+        # Обновляет surname, name, patronymic, birth_date по ID.
+        # Возвращает True при успехе, False иначе.
+        connection = self.create_connection()
+        if connection:
+            try:
+                cursor = connection.cursor()
+                cursor.execute("""
+                    UPDATE pupils
+                    SET surname = ?, name = ?, patronymic = ?, birth_date = ?
+                    WHERE id = ?
+                """, (surname, name, patronymic, birth_date, pupil_id))
+                connection.commit()
+                return True
+            except sqlite3.Error as e:
+                connection.rollback()
+                # Обработка ошибки обновления
+                self.on_error("Ошибка базы данных", f"Ошибка обновления данных воспитанника: {e}")
+            finally:
+                cursor.close()
+        return False
+
+    @timed('database.update_pupil_scores')
+    def update_pupil_scores(self, pupil_id, scores, age_group=None, source_file=None):
+        # Обновление баллов (оценок) воспитанника
+        # Обновляет df1-df11 по ID. Если какого-то ключа нет в scores, используется None (NULL в DB).
+        # Если передана возрастная группа карты, она тоже сохраняется.
+        # Оценка по файлу карты source_file добавляется в историю оценок (без файла - только изменившиеся баллы).
+        # Возвращает True при успехе, False иначе.
+        connection = self.create_connection()
+        if connection:
+            try:
+                cursor = connection.cursor()
+                if self._write_scores(cursor, pupil_id, scores, age_group, source_file) is None:
+                    connection.rollback()
+                    self.on_error("Ошибка базы данных", f"Воспитанник с ID {pupil_id} не найден в базе данных")
+                    return False
+                connection.commit()
+                return True
+            except sqlite3.Error as e:
+                connection.rollback()
+                # Обработка ошибки обновления баллов
+                self.on_error("Ошибка базы данных", f"Ошибка обновления баллов: {e}")
+            except Exception:
+                # Непредвиденная ошибка: общее соединение потока не должно остаться в середине транзакции
+                connection.rollback()
+                raise
+            finally:
+                cursor.close()
+        return False
+
+    @timed('database.get_pupil_ids')
+    def get_pupil_ids(self):
+        # Множество ID всех воспитанников (для сопоставления файлов при пакетном импорте)
+        connection = self.create_connection()
+        if connection:
+            try:
+                cursor = connection.cursor()
+                cursor.execute("SELECT id FROM pupils")
+                return {row[0] for row in cursor.fetchall()}
+            except sqlite3.Error as e:
+                connection.rollback()
+                self.on_error("Ошибка базы данных", f"Ошибка получения данных воспитанников: {e}")
+            finally:
+                cursor.close()
+        return set()
+
+    @timed('database.get_import_manifest')
+    def get_import_manifest(self):
+        # Манифест пакетного импорта: {путь: (размер, mtime_ns, хэш содержимого, ID воспитанника)}
+        connection = self.create_connection()
+        if connection:
+            try:
+                cursor = connection.cursor()
+                cursor.execute("SELECT path, size, mtime_ns, content_hash, pupil_id FROM import_manifest")
+                return {row[0]: row[1:] for row in cursor.fetchall()}
+            except sqlite3.Error as e:
+                connection.rollback()
+                self.on_error("Ошибка базы данных", f"Ошибка чтения манифеста импорта: {e}")
+            finally:
+                cursor.close()
+        return {}
+
+    @timed('database.update_scores_many')
+    def update_scores_many(self, items, manifest=None):
+        # Обновление баллов сразу для многих воспитанников
+        # items - список (pupil_id, scores[, возрастная группа[, файл карты[, новая оценка]]]).
+        # Строки, в которых баллы и возрастная группа не изменились, не переписываются; оценки по файлам карт
+        # (и изменившиеся баллы) добавляются в историю оценок с общей меткой времени (см. _write_scores).
+        # manifest - записи манифеста импорта (путь, размер, mtime_ns, хэш, ID) для импортированных файлов.
+        # Всё пишется одной транзакцией.
+        # Возвращает True при успехе, False иначе (в том числе если какого-то воспитанника нет в базе;
+        # транзакция откатывается целиком).
+        assessed_at = assessment_time()
+        connection = self.create_connection()
+        if connection:
+            try:
+                cursor = connection.cursor()
+                missing = [item[0] for item in items
+                           if self._write_scores(cursor, item[0], item[1], item[2] if len(item) > 2 else None,
+                                                 item[3] if len(item) > 3 else None, assessed_at,
+                                                 item[4] if len(item) > 4 else None) is None]
+                if missing:
+                    connection.rollback()
+                    self.on_error("Ошибка базы данных",
+                                  f"Воспитанники не найдены в базе данных, ID: {', '.join(map(str, missing))}")
+                    return False
+                if manifest:
+                    cursor.executemany(UPSERT_MANIFEST_SQL, manifest)
+                connection.commit()
+                return True
+            except sqlite3.Error as e:
+                connection.rollback()
+                self.on_error("Ошибка базы данных", f"Ошибка обновления баллов: {e}")
+            except Exception:
+                connection.rollback()
+                raise
+            finally:
+                cursor.close()
+        return False
+
+    @staticmethod
+    def natural_key(surname, name, patronymic, birth_date):
+        # Естественный ключ воспитанника (фамилия, имя, отчество, дата рождения)
+        # Строки без пробелов по краям (отсутствующее значение, например отчество, - пустая строка),
+        # дата - в формате ГГГГ-ММ-ДД, как её сохраняет add_pupil.
+        if hasattr(birth_date, 'isoformat'):
+            birth_date = birth_date.isoformat()
+        return (surname or '').strip(), (name or '').strip(), (patronymic or '').strip(), birth_date
+
+    @timed('database.add_pupils_bulk')
+    def add_pupils_bulk(self, pupils):
+        # Пакетное добавление воспитанников (например, списка всего детского сада)
+        # pupils - список (фамилия, имя, отчество, дата рождения). Уже существующие по естественному
+        # ключу воспитанники пропускаются. Все строки вставляются через executemany одной транзакцией.
+        # Возвращает число добавленных воспитанников или None в случае ошибки.
+        keys = [self.natural_key(*pupil) for pupil in pupils]
+        connection = self.create_connection()
+        if connection:
+            try:
+                cursor = connection.cursor()
+                cursor.executemany(INSERT_MISSING_PUPIL_SQL, [key + key for key in keys])
+                added = cursor.rowcount
+                connection.commit()
+                return added
+            except sqlite3.Error as e:
+                connection.rollback()
+                self.on_error("Ошибка базы данных", f"Ошибка добавления воспитанников: {e}")
+            finally:
+                cursor.close()
+        return None
+
+    @timed('database.update_scores_bulk')
+    def update_scores_bulk(self, items):
+        # Пакетное обновление баллов с семантикой upsert по естественному ключу
+        # items - список ((фамилия, имя, отчество, дата рождения), scores[, возрастная группа]). Отсутствующие воспитанники
+        # добавляются, затем записываются баллы всех (с историей оценок) - всё одной транзакцией.
+        # Возвращает число обновлённых записей или None в случае ошибки.
+        rows = [(self.natural_key(*item[0]), item[1], item[2] if len(item) > 2 else None) for item in items]
+        connection = self.create_connection()
+        if connection:
+            try:
+                cursor = connection.cursor()
+                cursor.executemany(INSERT_MISSING_PUPIL_SQL, [key + key for key, _, _ in rows])
+                assessed_at = assessment_time()
+                updated = 0
+                for key, scores, age_group in rows:
+                    cursor.execute(f"SELECT id FROM pupils WHERE {NATURAL_KEY_CONDITION}", key)
+                    for (pupil_id,) in cursor.fetchall():
+                        self._write_scores(cursor, pupil_id, scores, age_group, assessed_at=assessed_at)
+                        updated += 1
+                connection.commit()
+                return updated
+            except sqlite3.Error as e:
+                connection.rollback()
+                self.on_error("Ошибка базы данных", f"Ошибка обновления баллов: {e}")
+            except Exception:
+                connection.rollback()
+                raise
+            finally:
+                cursor.close()
+        return None
+
+    @timed('database.delete_pupil')
+    def delete_pupil(self, pupil_id):
+        # Удаление воспитанника из базы данных
+        # Удаляет запись по ID. Возвращает True при успехе, False иначе.
+        connection = self.create_connection()
+        if connection:
+            try:
+                cursor = connection.cursor()
+                cursor.execute("DELETE FROM pupils WHERE id = ?", (pupil_id,))
+                connection.commit()
+                return True
+            except sqlite3.Error as e:
+                connection.rollback()
+                # Обработка ошибки удаления
+                self.on_error("Ошибка базы данных", f"Ошибка удаления воспитанника: {e}")
+            finally:
+                cursor.close()
+        return False
@@ -0,0 +1,215 @@
+import cProfile
+import importlib.util
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from functools import wraps
+from logging.handlers import RotatingFileHandler
+
+from cardcreator.config import APP_DIR
+
+# Журнал замеров: строки JSON в logs/timings.jsonl, по 5 МБ, 3 старых файла
+LOG_DIR = os.path.join(APP_DIR, 'logs')
+TIMINGS_LOG = os.path.join(LOG_DIR, 'timings.jsonl')
+TIMINGS_LOG_MAX_BYTES = 5 * 1024 * 1024
+TIMINGS_LOG_BACKUPS = 3
+
+# Сколько последних замеров хранится в памяти (для окна диагностики)
+RECENT_SPANS = 1000
+
+# Переменная окружения, включающая замеры (её наследуют и процессы пакетного импорта и создания ИПР)
+TRACE_ENV = 'CARDCREATOR_TRACE'
+
+
+timings_logger = logging.getLogger('cardcreator.timings')
+timings_logger.propagate = False
+
+_enabled = False
+_recent = deque(maxlen=RECENT_SPANS)
+_handler_lock = threading.Lock()
+
+
+# Замер одного участка кода: время выполнения записывается в журнал и список последних замеров
+class _Span:
+    __slots__ = ('name', 'fields', 'started')
+
+    def __init__(self, name, fields):
+        self.name = name
+        self.fields = fields
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        record(self.name, time.perf_counter() - self.started, self.fields, exc_type)
+        return False
+
+
+# Пустой замер, когда замеры выключены: ничего не измеряет и не пишет
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+def span(name, **fields):
+    # Контекстный менеджер замера: with span('word.save', file=...): ...
+    # Когда замеры выключены, возвращает общий пустой объект - затраты сводятся к одной проверке флага.
+    if not _enabled:
+        return NULL_SPAN
+    return _Span(name, fields)
+
+
+def timed(name):
+    # Декоратор замера функции или метода целиком
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Span(name, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record(name, seconds, fields=None, error=None):
+    # Запись готового замера в список последних и в журнал
+    entry = {
+        'ts': datetime.now().isoformat(timespec='milliseconds'),
+        'name': name,
+        'ms': round(seconds * 1000, 3),
+        'pid': os.getpid(),
+        'thread': threading.current_thread().name,
+    }
+    if fields:
+        entry.update(fields)
+    if error is not None:
+        entry['error'] = error.__name__
+    _recent.append(entry)
+    if not in_worker():
+        timings_logger.info(json.dumps(entry, ensure_ascii=False, default=str))
+
+
+def in_worker():
+    # Выполняется ли код в процессе пула (parallel.map_in_processes)
+    # Проверяется при каждом вызове: при запуске через fork процесс наследует уже импортированный модуль.
+    return multiprocessing.parent_process() is not None
+
+
+def take_spans():
+    # Замеры, накопленные процессом пула с прошлого вызова (список очищается)
+    # Журнал пишет и ротирует только родительский процесс: несколько процессов, ротирующих один файл,
+    # теряют записи (а в Windows ротация падает с PermissionError).
+    entries = list(_recent)
+    _recent.clear()
+    return entries
+
+
+def merge_spans(entries):
+    # Замеры из процесса пула - в список последних (окно диагностики) и журнал родительского процесса
+    for entry in entries:
+        _recent.append(entry)
+        timings_logger.info(json.dumps(entry, ensure_ascii=False, default=str))
+
+
+def is_enabled():
+    # Включены ли замеры
+    return _enabled
+
+
+def enable(log_path=TIMINGS_LOG):
+    # Включение замеров и журнала log_path (каталог создаётся при необходимости)
+    # Переменная окружения TRACE_ENV передаёт настройку процессам пула при пакетной обработке;
+    # в процессах пула журнал не открывается (см. take_spans).
+    global _enabled
+    with _handler_lock:
+        if not in_worker() and not timings_logger.handlers:
+            os.makedirs(os.path.dirname(log_path), exist_ok=True)
+            handler = RotatingFileHandler(log_path, maxBytes=TIMINGS_LOG_MAX_BYTES,
+                                          backupCount=TIMINGS_LOG_BACKUPS, encoding='utf-8')
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            timings_logger.addHandler(handler)
+            timings_logger.setLevel(logging.INFO)
+    os.environ[TRACE_ENV] = log_path
+    _enabled = True
+
+
+def disable():
+    # Выключение замеров; уже собранные замеры остаются в списке последних
+    global _enabled
+    _enabled = False
+    os.environ.pop(TRACE_ENV, None)
+
+
+def recent_spans():
+    # Последние замеры (не больше RECENT_SPANS), от старых к новым
+    return list(_recent)
+
+
+def slowest_spans(limit=50):
+    # Самые долгие из последних замеров
+    return sorted(_recent, key=lambda entry: entry['ms'], reverse=True)[:limit]
+
+
+def clear_spans():
+    # Очистка списка последних замеров
+    _recent.clear()
+
+
+# Профилирование участка кода: with ProfileCapture('import'): ...
+# По умолчанию cProfile (файл .prof для snakeviz/pstats); output_path с расширением .html -
+# отчёт pyinstrument, если он установлен (иначе рядом сохраняется .prof от cProfile).
+# Профилируется только текущий поток; работа в процессах пула в профиль не попадает.
+# После выхода путь к сохранённому профилю - в атрибуте output_path.
+class ProfileCapture:
+    def __init__(self, name='operation', output_path=None):
+        if output_path is None:
+            output_path = os.path.join(
+                LOG_DIR, f"profile_{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.prof")
+        # pyinstrument (сэмплирующий профилировщик с отчётом HTML) - необязательная зависимость;
+        # импортируется только при профилировании, чтобы не замедлять запуск программы
+        if output_path.endswith('.html') and importlib.util.find_spec('pyinstrument') is None:
+            output_path = output_path[:-len('.html')] + '.prof'
+        self.output_path = output_path
+        self.profiler = None
+
+    def __enter__(self):
+        if self.output_path.endswith('.html'):
+            from pyinstrument import Profiler
+
+            self.profiler = Profiler()
+            self.profiler.start()
+        else:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        os.makedirs(os.path.dirname(os.path.abspath(self.output_path)), exist_ok=True)
+        if isinstance(self.profiler, cProfile.Profile):
+            self.profiler.disable()
+            self.profiler.dump_stats(self.output_path)
+        else:
+            self.profiler.stop()
+            with open(self.output_path, 'w', encoding='utf-8') as f:
+                f.write(self.profiler.output_html())
+        return False
+
+
+# Замеры, включённые в родительском процессе, действуют и в процессах пула
+if os.environ.get(TRACE_ENV):
+    enable(os.environ[TRACE_ENV])
@@ -0,0 +1,667 @@
+import glob
+import hashlib
+import importlib.util
+import math
+import os
+import re
+import time
+import zipfile
+
+from xml.etree import ElementTree
+
+from cardcreator.config import log_error, logger
+from cardcreator.diagnostics import span
+from cardcreator.parallel import map_in_processes
+
+# Реестр раскладок "Карт развития"
+# Для каждой возрастной группы: имя файла, признак в заголовке карты (см. FINGERPRINT_CELL)
+# и адреса ячеек с оценками (лист, ячейка).
+# Новая раскладка карты добавляется сюда, без изменения кода чтения.
+CARD_LAYOUTS = {
+    'Младший возраст': {
+        'file_name': 'Карта развития. Младший возраст.xlsx',
+        'title_marker': 'младшего возраста',
+        'cells': {
+            'df1': ('Логопедия', 'E6'),
+            'df2': ('Логопедия', 'E8'),
+            'df3': ('Логопедия', 'E10'),
+            'df4': ('Логопедия', 'E12'),
+            'df5': ('Логопедия', 'E14'),
+            'df6': ('Логопедия', 'E16'),
+            'df7': ('Логопедия', 'E18'),
+            'df8': ('Логопедия', 'E20'),
+            'df9': ('ОЗОМ', 'H13'),
+            'df10': ('ФЭМП', 'H8'),
+            'df11': ('Конструирование', 'H6'),
+        },
+    },
+    'Средний возраст': {
+        'file_name': 'Карта развития. Средний возраст.xlsx',
+        'title_marker': 'среднего возраста',
+        'cells': {
+            'df1': ('Логопедия', 'H7'),
+            'df2': ('Логопедия', 'H9'),
+            'df3': ('Логопедия', 'H11'),
+            'df4': ('Логопедия', 'H13'),
+            'df5': ('Логопедия', 'H15'),
+            'df6': ('Логопедия', 'H17'),
+            'df7': ('Логопедия', 'H19'),
+            'df8': ('Логопедия', 'H21'),
+            'df9': ('ОЗОМ', 'H14'),
+            'df10': ('ФЭМП', 'H11'),
+            'df11': ('Конструирование', 'H7'),
+        },
+    },
+    'Старший возраст': {
+        'file_name': 'Карта развития. Старший возраст.xlsx',
+        'title_marker': 'старшего возраста',
+        # ВНИМАНИЕ: для старшего возраста только df1-df10, поля для df11 в карте нет.
+        'cells': {
+            'df1': ('Логопедия', 'E6'),
+            'df2': ('Логопедия', 'E8'),
+            'df3': ('Логопедия', 'E10'),
+            'df4': ('Логопедия', 'E12'),
+            'df5': ('Логопедия', 'E14'),
+            'df6': ('Логопедия', 'E16'),
+            'df7': ('Логопедия', 'E18'),
+            'df8': ('ОЗОМ', 'E13'),
+            'df9': ('ФЭМП', 'E12'),
+            'df10': ('Конструирование', 'E7'),
+        },
+    },
+}
+
+# Соответствие имени файла и возрастной группы
+AGE_GROUP_BY_FILE_NAME = {layout['file_name']: age_group for age_group, layout in CARD_LAYOUTS.items()}
+
+# Скомпилированные планы чтения: строятся один раз на возрастную группу
+_layout_plans = {}
+
+
+def split_cell_address(address):
+    # Разбор адреса ячейки Excel ('H13') в индексы строки и столбца с нуля: (12, 7)
+    letters = address.rstrip('0123456789')
+    column_index = 0
+    for letter in letters.upper():
+        column_index = column_index * 26 + (ord(letter) - ord('A') + 1)
+    return int(address[len(letters):]) - 1, column_index - 1
+
+
+def get_layout_plan(age_group):
+    # План чтения для возрастной группы
+    # Ячейки сгруппированы по листам: {лист: {'nrows': N, 'cells': [(ключ, строка, столбец), ...]}},
+    # чтобы каждый лист разбирался один раз и только до последней нужной строки.
+    plan = _layout_plans.get(age_group)
+    if plan is None:
+        plan = {}
+        for key, (sheet, address) in CARD_LAYOUTS[age_group]['cells'].items():
+            row, column = split_cell_address(address)
+            sheet_plan = plan.setdefault(sheet, {'nrows': 0, 'cells': []})
+            sheet_plan['cells'].append((key, row, column))
+            sheet_plan['nrows'] = max(sheet_plan['nrows'], row + 1)
+        _layout_plans[age_group] = plan
+    return plan
+
+# Движки чтения карт в порядке предпочтения при автоматическом выборе:
+# calamine - разбор книги на Rust (пакет python-calamine, необязательная зависимость);
+# openpyxl - потоковое чтение в режиме read_only, останавливается на последней нужной строке листа;
+# pandas - pd.ExcelFile, как раньше (оставлен для сравнения и совместимости).
+EXCEL_ENGINES = ('calamine', 'openpyxl', 'pandas')
+DEFAULT_EXCEL_ENGINE = 'auto'
+
+# Пакеты, нужные движкам
+ENGINE_MODULES = {'calamine': 'python_calamine', 'openpyxl': 'openpyxl', 'pandas': 'pandas'}
+
+# Выбранные движки {запрошенный: доступный}, чтобы не искать пакеты при каждом чтении
+_resolved_engines = {}
+
+
+def available_engines():
+    # Установленные движки чтения в порядке предпочтения
+    return tuple(engine for engine in EXCEL_ENGINES if importlib.util.find_spec(ENGINE_MODULES[engine]) is not None)
+
+
+def resolve_engine(engine=DEFAULT_EXCEL_ENGINE):
+    # Движок для чтения карт: запрошенный, если его пакет установлен, иначе первый установленный
+    # из EXCEL_ENGINES ('auto' - сразу первый установленный). Пакеты не импортируются, только ищутся.
+    resolved = _resolved_engines.get(engine)
+    if resolved is not None:
+        return resolved
+    if engine != DEFAULT_EXCEL_ENGINE and engine not in EXCEL_ENGINES:
+        raise ValueError(f"Неизвестный движок чтения Excel: {engine} (доступны: {', '.join(EXCEL_ENGINES)})")
+    installed = available_engines()
+    candidates = EXCEL_ENGINES if engine == DEFAULT_EXCEL_ENGINE else (engine,) + EXCEL_ENGINES
+    for candidate in candidates:
+        if candidate in installed:
+            if candidate != engine and engine != DEFAULT_EXCEL_ENGINE:
+                logger.warning("Движок чтения Excel %s не установлен, используется %s", engine, candidate)
+            _resolved_engines[engine] = candidate
+            return candidate
+    raise ScoreReadError("Не установлен ни один пакет для чтения Excel (python-calamine, openpyxl или pandas)")
+
+
+def _pick_cells(rows, cells, values):
+    # Значения ячеек плана из прочитанных строк листа (строки могут быть короче или отсутствовать)
+    for key, row, column in cells:
+        if row < len(rows) and column < len(rows[row]):
+            values[key] = rows[row][column]
+        else:
+            values[key] = None
+
+
+def _read_cells_calamine(excel_file_path, plan):
+    # Чтение через python-calamine: каждый лист плана разбирается до последней нужной строки
+    from python_calamine import CalamineError, CalamineWorkbook
+
+    values = {}
+    file_name = os.path.basename(excel_file_path)
+    try:
+        with span('excel.open_workbook', file=file_name, engine='calamine'):
+            workbook = CalamineWorkbook.from_path(excel_file_path)
+        for sheet, sheet_plan in plan.items():
+            with span('excel.read_sheet', file=file_name, sheet=sheet):
+                # skip_empty_area=False: индексы строк и столбцов считаются от A1, а не от первой непустой ячейки
+                rows = workbook.get_sheet_by_name(sheet).to_python(skip_empty_area=False,
+                                                                   nrows=sheet_plan['nrows'])
+            _pick_cells(rows, sheet_plan['cells'], values)
+    except CalamineError as e:
+        raise ValueError(str(e))
+    # Пустые ячейки calamine возвращает как ''
+    return {key: None if value == '' else value for key, value in values.items()}
+
+
+def _read_cells_openpyxl(excel_file_path, plan):
+    # Потоковое чтение через openpyxl (read_only): лист читается построчно до последней нужной строки
+    # и только до последнего нужного столбца, остальные листы книги не разбираются.
+    from openpyxl import load_workbook
+
+    values = {}
+    file_name = os.path.basename(excel_file_path)
+    with span('excel.open_workbook', file=file_name, engine='openpyxl'):
+        workbook = load_workbook(excel_file_path, read_only=True, data_only=True, keep_links=False)
+    try:
+        for sheet, sheet_plan in plan.items():
+            with span('excel.read_sheet', file=file_name, sheet=sheet):
+                max_col = max(column for _, _, column in sheet_plan['cells']) + 1
+                rows = list(workbook[sheet].iter_rows(max_row=sheet_plan['nrows'], max_col=max_col,
+                                                      values_only=True))
+            _pick_cells(rows, sheet_plan['cells'], values)
+    finally:
+        workbook.close()
+    return values
+
+
+def _read_cells_pandas(excel_file_path, plan):
+    # Чтение через pandas (pd.ExcelFile): листы плана разбираются в DataFrame до последней нужной строки
+    import pandas as pd
+
+    values = {}
+    file_name = os.path.basename(excel_file_path)
+    with span('excel.open_workbook', file=file_name, engine='pandas'):
+        workbook = pd.ExcelFile(excel_file_path)
+    with workbook:
+        for sheet, sheet_plan in plan.items():
+            with span('excel.read_sheet', file=file_name, sheet=sheet):
+                df = workbook.parse(sheet, header=None, nrows=sheet_plan['nrows'])
+            for key, row, column in sheet_plan['cells']:
+                if row < df.shape[0] and column < df.shape[1]:
+                    values[key] = df.iat[row, column]
+                else:
+                    values[key] = None
+    return values
+
+
+EXCEL_READERS = {
+    'calamine': _read_cells_calamine,
+    'openpyxl': _read_cells_openpyxl,
+    'pandas': _read_cells_pandas,
+}
+
+# Префикс с ID воспитанника в имени файла: "17_Карта развития. Младший возраст.xlsx"
+PUPIL_ID_PREFIX = re.compile(r'^(\d+)(?=\D|$)')
+
+
+# Ячейка с заголовком карты ("Протокол ... детей младшего возраста"), по которой определяется группа
+FINGERPRINT_CELL = ('Логопедия', 'A1')
+
+# Пространства имён SpreadsheetML и связей пакета OOXML
+SHEET_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+RELATIONSHIP_ID = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id'
+PACKAGE_RELATIONSHIP = '{http://schemas.openxmlformats.org/package/2006/relationships}Relationship'
+SHARED_STRINGS_TYPE = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings'
+
+# Возрастные группы по отпечаткам книг {(имена листов, заголовок): группа или None}
+# Карты одной группы имеют один отпечаток, поэтому сопоставление с реестром выполняется один раз на шаблон карты.
+_fingerprint_groups = {}
+
+
+# Размер порции XML при потоковом чтении отпечатка: нужные элементы в самом начале частей книги,
+# и мелкие порции позволяют не разбирать остальное
+FINGERPRINT_CHUNK_SIZE = 2048
+
+
+def _iter_xml(archive, part):
+    # Закрытые элементы части part архива по мере чтения (разбор прекращается, когда перебор остановлен)
+    parser = ElementTree.XMLPullParser(events=('end',))
+    with archive.open(part) as stream:
+        while True:
+            chunk = stream.read(FINGERPRINT_CHUNK_SIZE)
+            if not chunk:
+                return
+            parser.feed(chunk)
+            for _, element in parser.read_events():
+                yield element
+
+
+def _xml_text(element):
+    # Текст строки <si> или <is>: простой <t> или прогоны <r><t> (фонетические подсказки <rPh> не входят)
+    parts = []
+    for child in element:
+        if child.tag == SHEET_NS + 't':
+            parts.append(child.text or '')
+        elif child.tag == SHEET_NS + 'r':
+            parts.extend(t.text or '' for t in child.iter(SHEET_NS + 't'))
+    return ''.join(parts)
+
+
+def _shared_string(archive, part, index):
+    # Строка index из таблицы общих строк (разбор останавливается на ней)
+    position = 0
+    for element in _iter_xml(archive, part):
+        if element.tag == SHEET_NS + 'si':
+            if position == index:
+                return _xml_text(element)
+            position += 1
+            element.clear()
+    return None
+
+
+def _sheet_cell(archive, part, address, shared_strings_part):
+    # Значение ячейки address листа part (строкой); лист читается потоково до строки с ячейкой
+    target_row, _ = split_cell_address(address)
+    for element in _iter_xml(archive, part):
+        if element.tag == SHEET_NS + 'c' and element.get('r') == address:
+            cell_type = element.get('t')
+            if cell_type == 'inlineStr':
+                inline = element.find(SHEET_NS + 'is')
+                return _xml_text(inline) if inline is not None else None
+            value = element.findtext(SHEET_NS + 'v')
+            if cell_type == 's' and value is not None:
+                return _shared_string(archive, shared_strings_part, int(value))
+            return value
+        if element.tag == SHEET_NS + 'row':
+            if int(element.get('r', 0)) > target_row:
+                return None
+            element.clear()
+    return None
+
+
+def workbook_fingerprint(excel_file_path):
+    # Отпечаток книги: (имена листов по порядку, текст ячейки FINGERPRINT_CELL)
+    # Читаются только xl/workbook.xml, связи книги, начало нужного листа и начало таблицы общих строк
+    # прямо из zip-архива, без разбора стилей и всей книги. Возвращает None, если файл не книга Excel.
+    sheet, address = FINGERPRINT_CELL
+    try:
+        with zipfile.ZipFile(excel_file_path) as archive:
+            targets = {}
+            shared_strings_part = 'xl/sharedStrings.xml'
+            for relationship in ElementTree.fromstring(archive.read('xl/_rels/workbook.xml.rels')).iter(
+                    PACKAGE_RELATIONSHIP):
+                target = relationship.get('Target', '')
+                target = target.lstrip('/') if target.startswith('/') else 'xl/' + target
+                if relationship.get('Type') == SHARED_STRINGS_TYPE:
+                    shared_strings_part = target
+                targets[relationship.get('Id')] = target
+            sheets = [(element.get('name'), element.get(RELATIONSHIP_ID))
+                      for element in ElementTree.fromstring(archive.read('xl/workbook.xml')).iter(SHEET_NS + 'sheet')]
+            header = None
+            for name, relationship_id in sheets:
+                if name == sheet and relationship_id in targets:
+                    header = _sheet_cell(archive, targets[relationship_id], address, shared_strings_part)
+                    break
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile, ElementTree.ParseError):
+        return None
+    return tuple(name for name, _ in sheets), header
+
+
+def age_group_by_fingerprint(fingerprint):
+    # Возрастная группа по отпечатку книги: признак группы (title_marker) в заголовке карты
+    if fingerprint not in _fingerprint_groups:
+        _, header = fingerprint
+        header = ' '.join(str(header or '').lower().split())
+        _fingerprint_groups[fingerprint] = next(
+            (age_group for age_group, layout in CARD_LAYOUTS.items() if layout['title_marker'] in header), None)
+    return _fingerprint_groups[fingerprint]
+
+
+def age_group_by_file_name(excel_file_path):
+    # Определение возрастной группы по имени файла
+    # Имя должно совпадать с именем карты из CARD_LAYOUTS или оканчиваться им
+    # (например, "17_Карта развития. Младший возраст.xlsx"). Возвращает группу или None.
+    excel_file_name = os.path.basename(excel_file_path)
+    age_group = AGE_GROUP_BY_FILE_NAME.get(excel_file_name)
+    if age_group is None:
+        for file_name, candidate in AGE_GROUP_BY_FILE_NAME.items():
+            if excel_file_name.endswith(file_name):
+                return candidate
+    return age_group
+
+
+def detect_age_group(excel_file_path):
+    # Определение возрастной группы карты
+    # По содержимому (заголовок карты, см. workbook_fingerprint), поэтому переименованные карты
+    # ("Иванов_младший.xlsx") тоже распознаются; если заголовок не подошёл - по имени файла.
+    # Возвращает группу или None.
+    with span('excel.detect_age_group', file=os.path.basename(excel_file_path)):
+        fingerprint = workbook_fingerprint(excel_file_path)
+        age_group = age_group_by_fingerprint(fingerprint) if fingerprint is not None else None
+    return age_group or age_group_by_file_name(excel_file_path)
+
+
+def pupil_id_from_path(excel_file_path):
+    # ID воспитанника по соглашению об именах файлов
+    # Берётся числовой префикс имени файла ("17_....xlsx"), иначе имя папки, если оно числовое ("17/....xlsx").
+    # Возвращает int или None.
+    match = PUPIL_ID_PREFIX.match(os.path.basename(excel_file_path))
+    if match:
+        return int(match.group(1))
+    folder_name = os.path.basename(os.path.dirname(os.path.abspath(excel_file_path)))
+    if folder_name.isdigit():
+        return int(folder_name)
+    return None
+
+
+def plan_with_cell(plan, key, sheet, address):
+    # Копия плана чтения с дополнительной ячейкой (например, с ID воспитанника)
+    # Исходный скомпилированный план не изменяется.
+    row, column = split_cell_address(address)
+    extended = {name: {'nrows': sheet_plan['nrows'], 'cells': list(sheet_plan['cells'])}
+                for name, sheet_plan in plan.items()}
+    sheet_plan = extended.setdefault(sheet, {'nrows': 0, 'cells': []})
+    sheet_plan['cells'].append((key, row, column))
+    sheet_plan['nrows'] = max(sheet_plan['nrows'], row + 1)
+    return extended
+
+
+# Сообщение о файле, который не удалось распознать как карту развития
+UNKNOWN_CARD_MESSAGE = ("Недопустимый файл Excel: не удалось определить возрастную группу карты "
+                        "(ожидается \"Карта развития\" младшего, среднего или старшего возраста)")
+
+
+# Допустимые баллы и их описание для сообщений и отчёта проверки карт
+VALID_SCORES = (1, 2, 3, 4)
+EXPECTED_SCORE = "целое число от 1 до 4"
+
+
+def check_scores(values, cells=None):
+    # Проверка всех баллов карты без остановки на первой ошибке
+    # values - {ключ: значение ячейки}; cells - {ключ: (лист, адрес)} из раскладки, чтобы указать ячейку.
+    # Возвращает (баллы, ошибки): {ключ: целый балл} для верных значений и список ошибок
+    # {'indicator', 'sheet', 'cell', 'value', 'expected', 'message'} для остальных.
+    valid = {}
+    problems = []
+    for key, value in values.items():
+        sheet, address = (cells or {}).get(key, (None, None))
+        location = f" ({sheet}!{address})" if sheet else ""
+        # Пустая ячейка: None (openpyxl, calamine) или NaN (pandas; NaN не равен самому себе)
+        if value is None or value != value:
+            value = None
+            message = f"Значение для {key}{location} пустое. Пожалуйста, заполните ячейку в Excel-файле."
+        else:
+            # Логические значения (ИСТИНА/ЛОЖЬ, в том числе numpy от движка pandas) и дробные числа
+            # отклоняются до проверки диапазона: int(True) == 1 и int(2.5) == 2 прошли бы её
+            is_bool = isinstance(value, bool) or getattr(getattr(value, 'dtype', None), 'kind', None) == 'b'
+            try:
+                number = None if is_bool else float(value)
+            except (ValueError, TypeError):
+                number = None
+            if is_bool:
+                message = f"Логическое значение для {key}{location}: {value}. Ожидается {EXPECTED_SCORE}."
+            elif number is not None and math.isfinite(number) and not number.is_integer():
+                message = f"Дробное значение для {key}{location}: {value}. Ожидается {EXPECTED_SCORE}."
+            elif number is not None and number in VALID_SCORES:
+                valid[key] = int(number)
+                continue
+            else:
+                message = f"Недопустимое значение для {key}{location}: {value}. Ожидается {EXPECTED_SCORE}."
+        if hasattr(value, 'item'):  # скаляр numpy (движок pandas) - в обычное число Python для отчётов
+            value = value.item()
+        problems.append({'indicator': key, 'sheet': sheet, 'cell': address, 'value': value,
+                         'expected': EXPECTED_SCORE, 'message': message})
+    return valid, problems
+
+
+# Ошибка чтения карты развития
+# Содержит текст, готовый для показа пользователю или для отчёта пакетного импорта;
+# problems - ошибки в отдельных ячейках (см. check_scores), если карта прочитана, но баллы неверны.
+class ScoreReadError(Exception):
+    def __init__(self, message, problems=None):
+        super().__init__(message)
+        self.problems = problems or []
+
+# Класс для обработки Excel-файлов
+# Этот класс читает оценки из конкретных ячеек Excel-файлов для разных возрастных групп.
+class ExcelProcessor:
+    def __init__(self, on_error=None, engine=DEFAULT_EXCEL_ENGINE):
+        # Обработчик ошибок on_error(заголовок, текст) для read_scores
+        # engine - движок чтения ('calamine', 'openpyxl', 'pandas') или 'auto' (самый быстрый из установленных).
+        self.on_error = on_error or log_error
+        self.engine = engine
+
+    def read_scores(self, excel_file_path):
+        # Чтение оценок из Excel-файла с выводом ошибок через on_error (в GUI - messagebox)
+        # Возвращает (scores, имя файла карты) или None в случае ошибки.
+        try:
+            return self.parse_scores(excel_file_path)
+        except ScoreReadError as e:
+            self.on_error("Ошибка", str(e))
+            return None
+
+    def parse_scores(self, excel_file_path):
+        # Чтение оценок из Excel-файла в зависимости от имени файла
+        # Поддерживает три типа файлов: младший, средний, старший возраст (см. CARD_LAYOUTS).
+        # Возвращает словарь scores с df1-df11 (или меньше для старшего) и имя файла карты из реестра.
+        # Не показывает диалогов: при ошибке выбрасывает ScoreReadError.
+        age_group = detect_age_group(excel_file_path)
+        if age_group is None:
+            # Обработка ошибки недопустимого файла
+            raise ScoreReadError(UNKNOWN_CARD_MESSAGE)
+
+        scores = self.validate_scores(self._read_cells(excel_file_path, get_layout_plan(age_group)),
+                                      CARD_LAYOUTS[age_group]['cells'])
+        return scores, CARD_LAYOUTS[age_group]['file_name']
+
+    def validate_scores(self, scores, cells=None):
+        # Проверка и преобразование значений в целые числа от 1 до 4
+        # Проверяются все ключи scores (cells - адреса ячеек для сообщений, см. check_scores).
+        # Если есть ошибки, выбрасывает одну ScoreReadError со всеми ошибками (атрибут problems).
+        valid, problems = check_scores(scores, cells)
+        if problems:
+            raise ScoreReadError("\n".join(problem['message'] for problem in problems), problems)
+        scores.update(valid)
+        return scores
+
+    def _read_cells(self, excel_file_path, plan):
+        # Чтение всех ячеек плана за один проход по книге выбранным движком (см. EXCEL_READERS)
+        # Книга открывается один раз, каждый лист плана читается один раз до plan[лист]['nrows'];
+        # листы, которых нет в плане, не разбираются.
+        # Возвращает словарь {ключ: значение ячейки} (None, если ячейка пустая или за пределами данных).
+        engine = resolve_engine(self.engine)
+        try:
+            return EXCEL_READERS[engine](excel_file_path, plan)
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
+            raise ScoreReadError(f"Не удалось прочитать файл Excel: {e}")
+
+
+def parse_card_file(excel_file_path, id_cell, engine=DEFAULT_EXCEL_ENGINE):
+    # Разбор одной карты в процессе пакетного импорта
+    # Возвращает (путь, pupil_id, scores, возрастная группа, текст ошибки).
+    processor = ExcelProcessor(engine=engine)
+    try:
+        age_group = detect_age_group(excel_file_path)
+        if age_group is None:
+            raise ScoreReadError(UNKNOWN_CARD_MESSAGE)
+        plan = get_layout_plan(age_group)
+        if id_cell:
+            plan = plan_with_cell(plan, 'pupil_id', *id_cell)
+        values = processor._read_cells(excel_file_path, plan)
+
+        if id_cell:
+            raw_id = values.pop('pupil_id')
+            try:
+                pupil_id = int(float(raw_id))
+            except (ValueError, TypeError):
+                raise ScoreReadError(f"В ячейке {id_cell[0]}!{id_cell[1]} нет ID воспитанника: {raw_id}")
+        else:
+            pupil_id = pupil_id_from_path(excel_file_path)
+            if pupil_id is None:
+                raise ScoreReadError("Не удалось определить ID воспитанника по имени файла")
+
+        scores = processor.validate_scores(values, CARD_LAYOUTS[age_group]['cells'])
+        return excel_file_path, pupil_id, scores, age_group, None
+    except ScoreReadError as e:
+        return excel_file_path, None, None, None, str(e)
+
+
+# Класс для пакетного импорта карт развития
+# Разбирает папку (или маску) с картами в пуле процессов и записывает все баллы одной транзакцией.
+class BatchImporter:
+    def __init__(self, db_manager, engine=DEFAULT_EXCEL_ENGINE):
+        # engine - движок чтения карт (см. ExcelProcessor)
+        self.db_manager = db_manager
+        self.engine = engine
+
+    @staticmethod
+    def collect_files(source):
+        # Список файлов для импорта
+        # source - папка (все .xlsx в ней и во вложенных папках) или маска glob ("Карты/*/*.xlsx").
+        # Временные файлы Excel ("~$...") пропускаются.
+        if os.path.isdir(source):
+            pattern = os.path.join(source, '**', '*.xlsx')
+        else:
+            pattern = source
+        return sorted(path for path in glob.glob(pattern, recursive=True)
+                      if os.path.isfile(path) and not os.path.basename(path).startswith('~$'))
+
+    @staticmethod
+    def source_error(source, files):
+        # Текст ошибки, если source - не существующая папка и не маска, которой соответствуют файлы
+        # (иначе опечатка в пути в задании по расписанию выглядела бы как успешный импорт 0 файлов)
+        # Возвращает None, если источник в порядке (пустая существующая папка - не ошибка).
+        if os.path.isdir(source) or files:
+            return None
+        if glob.has_magic(source):
+            return f"Ни один файл не соответствует маске: {source}"
+        return f"Папка с картами не найдена: {source}"
+
+    @staticmethod
+    def file_state(path):
+        # Размер и время изменения файла (для сравнения с манифестом без чтения содержимого)
+        stat = os.stat(path)
+        return stat.st_size, stat.st_mtime_ns
+
+    @staticmethod
+    def content_hash(path):
+        # Хэш содержимого файла (SHA-256)
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def import_folder(self, source, id_cell=None, workers=None, force=False, progress=None, cancel=None):
+        # Пакетный импорт карт развития
+        # id_cell - (лист, адрес) ячейки с ID воспитанника; если не задана, ID берётся из имени файла.
+        # Повторный импорт инкрементальный: файлы, которые не изменились с прошлого успешного импорта
+        # (совпадают размер и время изменения или, если они изменились, хэш содержимого), не разбираются.
+        # force=True - разобрать все файлы заново (файлы с прежним содержимым не добавляют оценок в историю).
+        # progress(готово, всего) - ход разбора; cancel - threading.Event для отмены (тогда в базу ничего не пишется).
+        # Возвращает отчёт: {'total', 'imported': [(путь, id)], 'skipped', 'errors': [(путь, текст)],
+        # 'elapsed', 'cancelled'}.
+        started = time.perf_counter()
+        files = self.collect_files(source)
+        report = {'total': len(files), 'imported': [], 'skipped': 0, 'errors': [], 'elapsed': 0.0,
+                  'cancelled': False}
+        error = self.source_error(source, files)
+        if error is not None:
+            report['errors'].append((source, error))
+            return report
+
+        manifest = self.db_manager.get_import_manifest()
+        manifest_updates = []
+        states = {}
+        changed = []
+        reparsed = set()
+        for path in files:
+            key = os.path.abspath(path)
+            try:
+                size, mtime_ns = self.file_state(path)
+                recorded = manifest.get(key)
+                if not force and recorded is not None and recorded[:2] == (size, mtime_ns):
+                    report['skipped'] += 1
+                    continue
+                content_hash = self.content_hash(path)
+            except OSError as e:
+                report['errors'].append((path, f"Не удалось прочитать файл: {e}"))
+                continue
+            if force and recorded is not None and recorded[2] == content_hash:
+                reparsed.add(path)
+            elif recorded is not None and recorded[2] == content_hash:
+                # Файл перезаписан без изменений (например, скопирован заново) - запоминаем новые размер и время
+                manifest_updates.append((key, size, mtime_ns, content_hash, recorded[3]))
+                report['skipped'] += 1
+                continue
+            states[path] = (key, size, mtime_ns, content_hash)
+            changed.append(path)
+
+        results, report['cancelled'] = map_in_processes(parse_card_file, changed, [id_cell] * len(changed),
+                                                        [self.engine] * len(changed), workers=workers,
+                                                        progress=progress, cancel=cancel)
+        if not report['cancelled']:
+            self.store_results(results, states, report, manifest_updates, reparsed)
+        report['elapsed'] = time.perf_counter() - started
+        return report
+
+    def store_results(self, results, states, report, manifest_updates=None, reparsed=()):
+        # Запись результатов разбора карт в базу одной транзакцией
+        # results - кортежи parse_card_file; states - {путь: (ключ манифеста, размер, mtime_ns, хэш)}.
+        # Каждая карта - новая оценка в истории, кроме reparsed (файлы, уже импортированные с тем же содержимым).
+        # Импортированные файлы и ошибки добавляются в report, манифест обновляется вместе с баллами.
+        manifest_updates = list(manifest_updates or [])
+        known_ids = self.db_manager.get_pupil_ids() if results else set()
+        updates = {}
+        for path, pupil_id, scores, age_group, error in results:
+            if error is None and pupil_id not in known_ids:
+                error = f"Воспитанник с ID {pupil_id} не найден в базе данных"
+            if error is None and pupil_id in updates:
+                error = f"Повторный файл для воспитанника с ID {pupil_id} (уже импортирован {updates[pupil_id][0]})"
+            if error is not None:
+                report['errors'].append((path, error))
+                continue
+            updates[pupil_id] = (path, scores, age_group)
+
+        if updates or manifest_updates:
+            items = [(pupil_id, scores, age_group, path, path not in reparsed)
+                     for pupil_id, (path, scores, age_group) in updates.items()]
+            manifest_updates.extend(states[path] + (pupil_id,) for pupil_id, (path, _, _) in updates.items())
+            if self.db_manager.update_scores_many(items, manifest=manifest_updates):
+                report['imported'].extend((path, pupil_id) for pupil_id, (path, _, _) in updates.items())
+            else:
+                report['errors'].extend((path, "Ошибка записи в базу данных") for path, _, _ in updates.values())
+
+    @staticmethod
+    def format_report(report):
+        # Текстовый итоговый отчёт пакетного импорта
+        lines = ["Импорт отменён, база данных не изменена", ""] if report.get('cancelled') else []
+        lines += [
+            f"Обработано файлов: {report['total']}",
+            f"Импортировано: {len(report['imported'])}",
+            f"Пропущено без изменений: {report.get('skipped', 0)}",
+            f"Ошибок: {len(report['errors'])}",
+            f"Время: {report['elapsed']:.1f} с",
+        ]
+        if report['errors']:
+            lines.append("")
+            lines.append("Ошибки:")
+            lines.extend(f"{path}: {error}" for path, error in report['errors'])
+        return "\n".join(lines)
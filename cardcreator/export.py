@@ -0,0 +1,116 @@
+import csv
+import os
+
+from cardcreator.config import log_error
+from cardcreator.database import PUPIL_COLUMNS, SCORE_COLUMNS
+from cardcreator.recommendations import indicator_texts
+
+# Поддерживаемые форматы выгрузки (определяются по расширению файла, если не заданы явно)
+EXPORT_FORMATS = ('csv', 'xlsx', 'parquet')
+
+# Число строк, читаемых из базы и записываемых в файл за один раз
+EXPORT_BATCH_SIZE = 1000
+
+# Столбцы с текстами рекомендаций: dfN_need (потребности) и dfN_task (задачи) для каждого показателя
+RECOMMENDATION_COLUMNS = [f'{column}_{kind}' for column in SCORE_COLUMNS for kind in ('need', 'task')]
+
+AGE_GROUP_INDEX = PUPIL_COLUMNS.index('age_group')
+SCORE_INDEXES = [PUPIL_COLUMNS.index(column) for column in SCORE_COLUMNS]
+
+
+def export_columns(include_recommendations=False):
+    # Заголовок выгрузки
+    return PUPIL_COLUMNS + RECOMMENDATION_COLUMNS if include_recommendations else list(PUPIL_COLUMNS)
+
+
+def with_recommendations(rows):
+    # Строки воспитанников с добавленными текстами рекомендаций по баллам df1–df11
+    # (пустые значения, если балла нет или для группы нет рекомендаций)
+    texts_by_group = {}
+    result = []
+    for row in rows:
+        age_group = row[AGE_GROUP_INDEX]
+        texts = texts_by_group.get(age_group)
+        if texts is None:
+            texts = texts_by_group[age_group] = indicator_texts(age_group) if age_group else {}
+        decoded = []
+        for column, index in zip(SCORE_COLUMNS, SCORE_INDEXES):
+            decoded.extend(texts.get(column, {}).get(row[index], (None, None)))
+        result.append(tuple(row) + tuple(decoded))
+    return result
+
+
+# Потоковая выгрузка таблицы воспитанников в CSV, Excel или Parquet
+# Строки читаются из базы пачками (fetchmany) и сразу пишутся в файл, поэтому расход памяти
+# не зависит от числа записей: CSV пишется построчно, книга Excel - в режиме write_only,
+# Parquet - по группе строк на пачку (нужен пакет pyarrow).
+class PupilExporter:
+    def __init__(self, db_manager, on_error=None):
+        self.db_manager = db_manager
+        self.on_error = on_error or log_error
+
+    def export(self, output_path, export_format=None, include_recommendations=False, batch_size=EXPORT_BATCH_SIZE):
+        # Выгрузка в output_path; формат - export_format или расширение файла
+        # include_recommendations - добавить тексты рекомендаций (потребности и задачи) по каждому показателю.
+        # Возвращает число выгруженных строк или None в случае ошибки.
+        export_format = (export_format or os.path.splitext(output_path)[1].lstrip('.')).lower()
+        writers = {'csv': self._write_csv, 'xlsx': self._write_xlsx, 'parquet': self._write_parquet}
+        if export_format not in writers:
+            self.on_error("Ошибка", f"Неподдерживаемый формат выгрузки: {export_format or output_path} "
+                                    f"(поддерживаются: {', '.join(EXPORT_FORMATS)})")
+            return None
+
+        batches = self.db_manager.iter_pupil_batches(batch_size)
+        if include_recommendations:
+            batches = map(with_recommendations, batches)
+        try:
+            return writers[export_format](output_path, export_columns(include_recommendations), batches)
+        except OSError as e:
+            self.on_error("Ошибка", f"Не удалось сохранить выгрузку: {e}")
+            return None
+
+    def _write_csv(self, output_path, columns, batches):
+        # CSV для Excel: разделитель ";" и UTF-8 с BOM
+        count = 0
+        with open(output_path, 'w', newline='', encoding='utf-8-sig') as f:
+            writer = csv.writer(f, delimiter=';')
+            writer.writerow(columns)
+            for rows in batches:
+                writer.writerows(rows)
+                count += len(rows)
+        return count
+
+    def _write_xlsx(self, output_path, columns, batches):
+        # Книга Excel в режиме write_only: строки не накапливаются в памяти, а сразу сериализуются
+        from openpyxl import Workbook
+
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet("Воспитанники")
+        sheet.append(columns)
+        count = 0
+        for rows in batches:
+            for row in rows:
+                sheet.append(row)
+            count += len(rows)
+        workbook.save(output_path)
+        return count
+
+    def _write_parquet(self, output_path, columns, batches):
+        # Parquet: одна группа строк на пачку
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            self.on_error("Ошибка", "Для выгрузки в Parquet установите пакет pyarrow (pip install pyarrow)")
+            return None
+
+        integer_columns = {'id', *SCORE_COLUMNS}
+        schema = pa.schema([(column, pa.int64() if column in integer_columns else pa.string())
+                            for column in columns])
+        count = 0
+        with pq.ParquetWriter(output_path, schema) as writer:
+            for rows in batches:
+                arrays = [pa.array(values, type=field.type) for values, field in zip(zip(*rows), schema)]
+                writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+                count += len(rows)
+        return count
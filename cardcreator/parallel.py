@@ -0,0 +1,50 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from cardcreator import diagnostics
+
+
+def call_with_spans(func, *args):
+    # Вызов func в процессе пула с возвратом замеров, сделанных во время вызова (см. diagnostics.take_spans)
+    diagnostics.take_spans()
+    return func(*args), diagnostics.take_spans()
+
+
+def map_in_processes(func, *iterables, workers=None, chunksize=None, progress=None, cancel=None):
+    # Применение func к наборам аргументов в пуле процессов (при одном задании или workers=1 - в текущем процессе)
+    # func должна быть функцией уровня модуля: пул передаёт её процессам по имени (pickle).
+    # Результаты возвращаются в порядке заданий. progress(готово, всего) вызывается после каждого результата;
+    # cancel - threading.Event: после его установки ещё не начатые задания отменяются.
+    # Замеры diagnostics из процессов пула передаются вместе с результатами и попадают в журнал родителя.
+    # Возвращает (результаты, отменено ли).
+    tasks = list(zip(*iterables))
+    total = len(tasks)
+    results = []
+    if total > 1 and workers != 1:
+        if chunksize is None:
+            chunksize = max(1, total // (4 * (workers or os.cpu_count() or 1)))
+        traced = diagnostics.is_enabled()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            if traced:
+                outputs = executor.map(call_with_spans, repeat(func), *zip(*tasks), chunksize=chunksize)
+            else:
+                outputs = executor.map(func, *zip(*tasks), chunksize=chunksize)
+            for result in outputs:
+                if traced:
+                    result, spans = result
+                    diagnostics.merge_spans(spans)
+                results.append(result)
+                if progress is not None:
+                    progress(len(results), total)
+                if cancel is not None and cancel.is_set():
+                    executor.shutdown(wait=True, cancel_futures=True)
+                    break
+    else:
+        for task in tasks:
+            if cancel is not None and cancel.is_set():
+                break
+            results.append(func(*task))
+            if progress is not None:
+                progress(len(results), total)
+    return results, len(results) < total
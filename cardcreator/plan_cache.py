@@ -0,0 +1,86 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+from cardcreator.config import APP_DIR
+from cardcreator.database import SCORE_COLUMNS
+from cardcreator.recommendations import recommendations_version
+
+# Папка кэша готовых ИПР и её предельный размер
+PLAN_CACHE_DIR = os.path.join(APP_DIR, 'cache', 'plans')
+PLAN_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+
+def plan_cache_key(template_hash, age_group, scores):
+    # Ключ документа в кэше
+    # Документ однозначно определяется содержимым шаблона, возрастной группой, баллами df1–df11
+    # и версией текстов рекомендаций, поэтому ключ - хэш от этого набора.
+    payload = json.dumps([template_hash, age_group, [scores.get(column) for column in SCORE_COLUMNS],
+                          recommendations_version()], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+# Кэш готовых ИПР с адресацией по содержимому
+# Файлы хранятся как <ключ>.docx; время изменения файла - время последнего использования,
+# по нему при превышении max_bytes удаляются давно не использовавшиеся документы (LRU).
+# Запись атомарна (временный файл + os.replace), поэтому кэш можно использовать из нескольких процессов.
+class PlanCache:
+    def __init__(self, directory=PLAN_CACHE_DIR, max_bytes=PLAN_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def path(self, key):
+        # Путь к документу в кэше
+        return os.path.join(self.directory, f'{key}.docx')
+
+    def get(self, key, word_save_path):
+        # Копирование документа из кэша в word_save_path
+        # Возвращает True при попадании в кэш.
+        cached_path = self.path(key)
+        try:
+            shutil.copyfile(cached_path, word_save_path)
+            os.utime(cached_path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def put(self, key, word_file_path):
+        # Сохранение готового документа в кэш и вытеснение старых документов
+        os.makedirs(self.directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(suffix='.tmp', dir=self.directory)
+        os.close(fd)
+        try:
+            shutil.copyfile(word_file_path, temp_path)
+            os.replace(temp_path, self.path(key))
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        self.evict()
+
+    def evict(self):
+        # Удаление давно не использовавшихся документов, пока кэш больше max_bytes
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith('.docx'):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+                    total += stat.st_size
+        if total <= self.max_bytes:
+            return
+        for _, size, path in sorted(entries):
+            try:
+                os.remove(path)
+            except OSError:  # уже удалён другим процессом
+                pass
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self):
+        # Полная очистка кэша
+        shutil.rmtree(self.directory, ignore_errors=True)
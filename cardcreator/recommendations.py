@@ -0,0 +1,73 @@
+import json
+import os
+
+# Тексты рекомендаций для таблицы ИПР: recommendations.json рядом с модулем
+# Формат: {'version': N, 'age_groups': {группа: {'rows': [...]}}}, где строка таблицы - это
+# {'title': текст} (заголовок раздела) или {'indicator': 'dfN', 'scores': {'1': {'need': ..., 'task': ...}, ...}}.
+# Строки идут подряд, начиная со второй строки таблицы (первая - заголовки столбцов).
+# При изменении текстов увеличивайте 'version'.
+RECOMMENDATIONS_PATH = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'recommendations.json')
+
+_recommendations = None
+# Скомпилированные планы строк: строятся один раз на возрастную группу
+_row_plans = {}
+
+
+def load_recommendations():
+    # Загрузка текстов рекомендаций (один раз за процесс)
+    global _recommendations
+    if _recommendations is None:
+        with open(RECOMMENDATIONS_PATH, encoding='utf-8') as f:
+            _recommendations = json.load(f)
+    return _recommendations
+
+
+def recommendations_version():
+    # Версия текстов рекомендаций
+    return load_recommendations()['version']
+
+
+def get_row_plan(age_group):
+    # План строк таблицы для возрастной группы
+    # Список (indicator, ячейки): для заголовка indicator = None и ячейки = (текст, None);
+    # для показателя ячейки = {балл: (потребности, задачи)}.
+    # Возвращает None, если для группы нет рекомендаций.
+    plan = _row_plans.get(age_group)
+    if plan is None:
+        group = load_recommendations()['age_groups'].get(age_group)
+        if group is None:
+            return None
+        plan = []
+        for row in group['rows']:
+            if 'indicator' in row:
+                plan.append((row['indicator'], {int(score): (texts['need'], texts['task'])
+                                                for score, texts in row['scores'].items()}))
+            else:
+                plan.append((None, (row['title'], None)))
+        _row_plans[age_group] = plan
+    return plan
+
+
+def indicator_texts(age_group):
+    # Тексты рекомендаций по показателям группы: {показатель: {балл: (потребности, задачи)}}
+    # Пустой словарь, если для группы нет рекомендаций.
+    return {indicator: cells for indicator, cells in get_row_plan(age_group) or [] if indicator is not None}
+
+
+def render_rows(plan, scores):
+    # Тексты строк таблицы по плану и баллам
+    # Возвращает (строки, ошибки): строки - список пар (столбец 0, столбец 1), None - ячейку не заполнять;
+    # ошибки - показатели с недопустимым или отсутствующим баллом (их строки остаются пустыми).
+    rows = []
+    errors = []
+    for indicator, cells in plan:
+        if indicator is None:
+            rows.append(cells)
+            continue
+        texts = cells.get(scores.get(indicator))
+        if texts is None:
+            errors.append(indicator)
+            rows.append((None, None))
+        else:
+            rows.append(texts)
+    return rows, errors
@@ -0,0 +1,178 @@
+import csv
+import html
+import os
+import time
+from datetime import datetime
+
+from cardcreator.config import log_error
+from cardcreator.excel import (
+    CARD_LAYOUTS,
+    DEFAULT_EXCEL_ENGINE,
+    UNKNOWN_CARD_MESSAGE,
+    BatchImporter,
+    ExcelProcessor,
+    ScoreReadError,
+    check_scores,
+    detect_age_group,
+    get_layout_plan,
+)
+from cardcreator.parallel import map_in_processes
+
+# Форматы отчёта проверки (определяются по расширению файла, если не заданы явно)
+REPORT_FORMATS = ('xlsx', 'csv', 'html')
+
+# Столбцы отчёта: (ключ ошибки, заголовок)
+REPORT_COLUMNS = [
+    ('file', 'Файл'),
+    ('age_group', 'Возрастная группа'),
+    ('sheet', 'Лист'),
+    ('cell', 'Ячейка'),
+    ('indicator', 'Показатель'),
+    ('value', 'Значение'),
+    ('expected', 'Ожидается'),
+    ('message', 'Ошибка'),
+]
+
+
+def _validate_card_file(excel_file_path, engine=DEFAULT_EXCEL_ENGINE):
+    # Проверка одной карты в процессе пула
+    # Возвращает (путь, возрастная группа, ошибки); ошибки файла целиком (не карта, не читается) -
+    # без листа и ячейки.
+    age_group = detect_age_group(excel_file_path)
+    if age_group is None:
+        return excel_file_path, None, [{'message': UNKNOWN_CARD_MESSAGE}]
+    try:
+        values = ExcelProcessor(engine=engine)._read_cells(excel_file_path, get_layout_plan(age_group))
+    except ScoreReadError as e:
+        return excel_file_path, age_group, [{'message': str(e)}]
+    _, problems = check_scores(values, CARD_LAYOUTS[age_group]['cells'])
+    return excel_file_path, age_group, problems
+
+
+# Проверка папки с картами развития перед импортом
+# Все ячейки всех карт проверяются за один проход (карты - параллельно в пуле процессов), без остановки
+# на первой ошибке и без диалогов; ошибки собираются в один отчёт (Excel, CSV или HTML) с указанием
+# файла, листа, ячейки, значения и допустимого диапазона, чтобы исправить всё за один раз.
+class CardValidator:
+    def __init__(self, on_error=None, engine=DEFAULT_EXCEL_ENGINE):
+        self.on_error = on_error or log_error
+        self.engine = engine
+
+    def validate(self, source, workers=None, progress=None, cancel=None):
+        # Проверка всех карт из source (папка или маска glob, как при пакетном импорте)
+        # progress(готово, всего) и cancel (threading.Event) - как у BatchImporter.import_folder.
+        # Возвращает отчёт {'total', 'checked', 'valid', 'problems', 'cancelled', 'elapsed'};
+        # problems - список ошибок со столбцами REPORT_COLUMNS.
+        started = time.perf_counter()
+        files = BatchImporter.collect_files(source)
+        error = BatchImporter.source_error(source, files)
+        if error is not None:
+            return {'total': 0, 'checked': 0, 'valid': 0, 'problems': [{'file': source, 'message': error}],
+                    'cancelled': False, 'elapsed': time.perf_counter() - started}
+        results, cancelled = map_in_processes(_validate_card_file, files, [self.engine] * len(files),
+                                              workers=workers, progress=progress, cancel=cancel)
+        problems = []
+        valid = 0
+        for path, age_group, file_problems in results:
+            if not file_problems:
+                valid += 1
+            for problem in file_problems:
+                problems.append({'file': path, 'age_group': age_group, **problem})
+        return {
+            'total': len(files),
+            'checked': len(results),
+            'valid': valid,
+            'problems': problems,
+            'cancelled': cancelled,
+            'elapsed': time.perf_counter() - started,
+        }
+
+    @staticmethod
+    def format_report(report):
+        # Краткий текстовый итог проверки
+        lines = ["Проверка отменена, проверены не все файлы", ""] if report.get('cancelled') else []
+        files_with_problems = len({problem['file'] for problem in report['problems']})
+        lines += [
+            f"Найдено карт: {report['total']}",
+            f"Проверено: {report['checked']}",
+            f"Без ошибок: {report['valid']}",
+            f"С ошибками: {files_with_problems}",
+            f"Всего ошибок: {len(report['problems'])}",
+            f"Время: {report['elapsed']:.1f} с",
+        ]
+        return "\n".join(lines)
+
+    def write_report(self, report, output_path, report_format=None):
+        # Запись отчёта об ошибках в output_path; формат - report_format или расширение файла
+        # Возвращает число записанных ошибок или None в случае ошибки.
+        report_format = (report_format or os.path.splitext(output_path)[1].lstrip('.')).lower()
+        writers = {'xlsx': self._write_xlsx, 'csv': self._write_csv, 'html': self._write_html}
+        if report_format not in writers:
+            self.on_error("Ошибка", f"Неподдерживаемый формат отчёта: {report_format or output_path} "
+                                    f"(поддерживаются: {', '.join(REPORT_FORMATS)})")
+            return None
+        rows = [[problem.get(key) for key, _ in REPORT_COLUMNS] for problem in report['problems']]
+        try:
+            writers[report_format](output_path, report, rows)
+        except OSError as e:
+            self.on_error("Ошибка", f"Не удалось сохранить отчёт проверки: {e}")
+            return None
+        return len(rows)
+
+    def _write_csv(self, output_path, report, rows):
+        # CSV для Excel: разделитель ";" и UTF-8 с BOM, как у выгрузки базы
+        with open(output_path, 'w', newline='', encoding='utf-8-sig') as f:
+            writer = csv.writer(f, delimiter=';')
+            writer.writerow([title for _, title in REPORT_COLUMNS])
+            writer.writerows(rows)
+
+    def _write_xlsx(self, output_path, report, rows):
+        # Книга Excel: лист "Ошибки" с автофильтром и лист "Итог"
+        from openpyxl import Workbook
+
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.title = "Ошибки"
+        sheet.append([title for _, title in REPORT_COLUMNS])
+        for row in rows:
+            sheet.append(row)
+        sheet.auto_filter.ref = sheet.dimensions
+        sheet.freeze_panes = 'A2'
+        for column, width in zip('ABCDEFGH', (60, 18, 18, 10, 12, 12, 18, 80)):
+            sheet.column_dimensions[column].width = width
+        summary = workbook.create_sheet("Итог")
+        for line in self.format_report(report).splitlines():
+            summary.append([line])
+        workbook.save(output_path)
+
+    def _write_html(self, output_path, report, rows):
+        # Страница HTML: итог и таблица ошибок (открывается в любом браузере)
+        header = "".join(f"<th>{html.escape(title)}</th>" for _, title in REPORT_COLUMNS)
+        body = "\n".join(
+            "<tr>" + "".join(f"<td>{html.escape('' if value is None else str(value))}</td>" for value in row) + "</tr>"
+            for row in rows)
+        summary = "<br>".join(html.escape(line) for line in self.format_report(report).splitlines())
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(f"""<!DOCTYPE html>
+<html lang="ru">
+<head>
+<meta charset="utf-8">
+<title>Проверка карт развития</title>
+<style>
+body {{ font-family: Arial, sans-serif; margin: 20px; }}
+table {{ border-collapse: collapse; }}
+th, td {{ border: 1px solid #999; padding: 4px 8px; text-align: left; vertical-align: top; }}
+th {{ background: #eee; position: sticky; top: 0; }}
+</style>
+</head>
+<body>
+<h1>Проверка карт развития</h1>
+<p>{datetime.now().strftime('%d.%m.%Y %H:%M')}</p>
+<p>{summary}</p>
+<table>
+<tr>{header}</tr>
+{body}
+</table>
+</body>
+</html>
+""")
@@ -0,0 +1,255 @@
+import os
+import queue
+import signal
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, CancelledError, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from cardcreator import diagnostics
+from cardcreator.excel import DEFAULT_EXCEL_ENGINE, BatchImporter, parse_card_file
+from cardcreator.parallel import call_with_spans
+
+# watchdog (inotify/ReadDirectoryChangesW) - необязательная зависимость; без неё папка опрашивается
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+
+# Период опроса папки (без watchdog) и время, в течение которого файл не должен меняться,
+# чтобы считаться дописанным, в секундах
+POLL_INTERVAL = 0.25
+SETTLE_TIME = 0.5
+
+
+def _ignore_interrupts():
+    # Инициализатор процессов пула: Ctrl+C обрабатывает только основной процесс (он и останавливает пул)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def is_card_file(path):
+    # Подходит ли файл для импорта (временные файлы Excel "~$..." пропускаются)
+    name = os.path.basename(path)
+    return name.endswith('.xlsx') and not name.startswith('~$')
+
+
+# Обработчик событий watchdog: складывает пути изменённых файлов в очередь наблюдателя
+class _CardEventHandler(FileSystemEventHandler):
+    def __init__(self, events):
+        self.events = events
+
+    def on_any_event(self, event):
+        if event.is_directory:
+            return
+        for path in (getattr(event, 'src_path', None), getattr(event, 'dest_path', None)):
+            if path and is_card_file(path):
+                self.events.put(path)
+
+
+# Наблюдение за папкой приёма карт развития
+# Новые и изменённые карты (.xlsx) разбираются в пуле процессов и записываются в pupils через
+# DatabaseManager, как при пакетном импорте (с манифестом, поэтому неизменившиеся файлы пропускаются).
+# Файл берётся в работу, когда его размер и время изменения не меняются SETTLE_TIME секунд
+# (Excel и копирование по сети пишут файл частями). Одновременно разбирается не больше max_in_flight
+# файлов; остальные ждут в очереди, пока пул не освободится.
+class FolderWatcher:
+    def __init__(self, db_manager, folder, id_cell=None, workers=None, max_in_flight=None,
+                 poll_interval=POLL_INTERVAL, settle_time=SETTLE_TIME, on_report=None, use_watchdog=True,
+                 engine=DEFAULT_EXCEL_ENGINE):
+        # on_report(отчёт) вызывается после каждой записи в базу с отчётом того же вида, что у import_folder.
+        # use_watchdog=False - всегда опрашивать папку, даже если watchdog установлен.
+        # engine - движок чтения карт (см. ExcelProcessor).
+        self.importer = BatchImporter(db_manager, engine)
+        self.db_manager = db_manager
+        self.folder = folder
+        self.id_cell = id_cell
+        self.workers = workers or os.cpu_count() or 1
+        self.max_in_flight = max_in_flight or 2 * self.workers
+        self.poll_interval = poll_interval
+        self.settle_time = settle_time
+        self.on_report = on_report
+        self.use_watchdog = use_watchdog and Observer is not None
+        self._stop = threading.Event()
+        self._events = queue.Queue()
+        # Известные состояния файлов {путь: (размер, mtime_ns)} и кандидаты {путь: (состояние, с какого момента)}
+        self._seen = {}
+        self._candidates = {}
+        self.totals = {'total': 0, 'imported': [], 'skipped': 0, 'errors': [], 'elapsed': 0.0}
+
+    def stop(self):
+        # Остановка наблюдения (можно вызывать из другого потока или обработчика сигнала)
+        self._stop.set()
+
+    def run(self):
+        # Основной цикл наблюдения; работает до вызова stop()
+        # Возвращает суммарный отчёт за всё время работы; если папки нет - сразу, с ошибкой в отчёте.
+        started = time.perf_counter()
+        if not os.path.isdir(self.folder):
+            self.totals['errors'].append((self.folder, f"Папка с картами не найдена: {self.folder}"))
+            return self.totals
+        manifest = self.db_manager.get_import_manifest()
+        observer = None
+        if self.use_watchdog:
+            observer = Observer()
+            observer.schedule(_CardEventHandler(self._events), self.folder, recursive=True)
+            observer.start()
+        # Файлы, уже лежащие в папке, обрабатываются как новые (неизменившиеся отсеет манифест)
+        self._scan()
+
+        # Разбираемые сейчас файлы {future: (путь, состояние для манифеста)}
+        in_flight = {}
+        next_scan = time.monotonic() + self.poll_interval
+        executor = self._new_executor()
+        try:
+            while not self._stop.is_set():
+                if observer is None and time.monotonic() >= next_scan:
+                    self._scan()
+                    next_scan = time.monotonic() + self.poll_interval
+                self._drain_events()
+
+                busy = {path for path, _ in in_flight.values()}
+                for path in self._ready_files(limit=self.max_in_flight - len(in_flight), busy=busy):
+                    state = self._prepare(path, manifest)
+                    if state is None:
+                        self.totals['skipped'] += 1
+                        continue
+                    try:
+                        future = executor.submit(call_with_spans, parse_card_file, path, self.id_cell,
+                                                 self.importer.engine)
+                    except BrokenProcessPool:
+                        # Пул сломался после последней проверки: файл вернётся в очередь и уйдёт в новый пул
+                        self._candidates[path] = (None, time.monotonic())
+                        executor = self._restart_pool(executor, in_flight, manifest)
+                        break
+                    in_flight[future] = (path, state)
+
+                if in_flight:
+                    done, _ = wait(in_flight, timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+                    if done:
+                        results, states, broken = self._collect(done, in_flight)
+                        self._store(results, states, manifest)
+                        if broken:
+                            executor = self._restart_pool(executor, in_flight, manifest)
+                else:
+                    self._stop.wait(self.poll_interval)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            if observer is not None:
+                observer.stop()
+                observer.join()
+        self.totals['elapsed'] = time.perf_counter() - started
+        return self.totals
+
+    def _new_executor(self):
+        # Пул процессов разбора карт
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=_ignore_interrupts)
+
+    def _restart_pool(self, executor, in_flight, manifest):
+        # Замена пула после аварийного завершения процесса (например, нехватки памяти на испорченной книге)
+        # Остальные задания сломанного пула завершены ошибкой - они записываются в отчёт как ошибки файлов.
+        # Возвращает новый пул.
+        executor.shutdown(wait=True, cancel_futures=True)
+        if in_flight:
+            results, states, _ = self._collect(list(in_flight), in_flight)
+            self._store(results, states, manifest)
+        return self._new_executor()
+
+    def _collect(self, done, in_flight):
+        # Результаты завершившихся разборов в виде кортежей parse_card_file
+        # Исключение в задании (в том числе аварийное завершение процесса пула) становится ошибкой этого файла,
+        # а не останавливает наблюдение. Замеры из процессов пула - в журнал основного процесса.
+        # Возвращает (результаты, {путь: состояние}, завершился ли пул аварийно).
+        results = []
+        states = {}
+        broken = False
+        for future in done:
+            path, state = in_flight.pop(future)
+            try:
+                result, spans = future.result()
+            except (Exception, CancelledError) as e:
+                broken = broken or isinstance(e, BrokenProcessPool)
+                result = (path, None, None, None, f"Ошибка разбора карты: {e!r}")
+            else:
+                diagnostics.merge_spans(spans)
+            results.append(result)
+            states[path] = state
+        return results, states, broken
+
+    def _scan(self):
+        # Опрос папки: изменившиеся с прошлого опроса файлы становятся кандидатами
+        for path in self.importer.collect_files(self.folder):
+            try:
+                state = BatchImporter.file_state(path)
+            except OSError:
+                continue
+            if self._seen.get(path) != state:
+                self._seen[path] = state
+                self._candidates[path] = (state, time.monotonic())
+
+    def _drain_events(self):
+        # События watchdog: пути изменённых файлов становятся кандидатами
+        while True:
+            try:
+                path = self._events.get_nowait()
+            except queue.Empty:
+                return
+            self._candidates[path] = (None, time.monotonic())
+
+    def _ready_files(self, limit, busy=()):
+        # Дописанные файлы: состояние не менялось settle_time секунд (не больше limit за раз)
+        # Файлы из busy (ещё разбираются) остаются кандидатами до окончания разбора, чтобы один файл
+        # не разбирался дважды одновременно.
+        ready = []
+        now = time.monotonic()
+        for path, (state, since) in list(self._candidates.items()):
+            if len(ready) >= limit:
+                break
+            if path in busy:
+                continue
+            try:
+                current = BatchImporter.file_state(path)
+            except OSError:  # файл удалён или переименован
+                del self._candidates[path]
+                continue
+            if current != state:
+                self._candidates[path] = (current, now)
+            elif now - since >= self.settle_time:
+                del self._candidates[path]
+                self._seen[path] = current
+                ready.append(path)
+        return ready
+
+    def _prepare(self, path, manifest):
+        # Сверка файла с манифестом перед разбором
+        # Возвращает (ключ манифеста, размер, mtime_ns, хэш) или None, если файл не изменился.
+        key = os.path.abspath(path)
+        try:
+            size, mtime_ns = BatchImporter.file_state(path)
+            recorded = manifest.get(key)
+            if recorded is not None and recorded[:2] == (size, mtime_ns):
+                return None
+            content_hash = BatchImporter.content_hash(path)
+        except OSError:
+            return None
+        if recorded is not None and recorded[2] == content_hash:
+            # Файл перезаписан без изменений - новые размер и время сохраняются в манифест в базе
+            # (как в import_folder), иначе после перезапуска файл хэшировался бы снова
+            entry = (size, mtime_ns, content_hash, recorded[3])
+            if self.db_manager.update_scores_many([], manifest=[(key,) + entry]):
+                manifest[key] = entry
+            return None
+        return key, size, mtime_ns, content_hash
+
+    def _store(self, results, states, manifest):
+        # Запись разобранных карт в базу и обновление отчётов
+        report = {'total': len(results), 'imported': [], 'skipped': 0, 'errors': [], 'elapsed': 0.0}
+        self.importer.store_results(results, states, report)
+        for path, pupil_id in report['imported']:
+            manifest[states[path][0]] = states[path][1:] + (pupil_id,)
+        self.totals['total'] += report['total']
+        self.totals['imported'].extend(report['imported'])
+        self.totals['errors'].extend(report['errors'])
+        if self.on_report is not None:
+            self.on_report(report)
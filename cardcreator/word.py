@@ -0,0 +1,294 @@
+import copy
+import hashlib
+import io
+import os
+import re
+import time
+
+from cardcreator.config import log_error, logger
+from cardcreator.database import PUPIL_COLUMNS, SCORE_COLUMNS
+from cardcreator.diagnostics import span
+from cardcreator.excel import AGE_GROUP_BY_FILE_NAME, CARD_LAYOUTS
+from cardcreator.parallel import map_in_processes
+from cardcreator.plan_cache import PLAN_CACHE_DIR, PlanCache, plan_cache_key
+from cardcreator.recommendations import get_row_plan, render_rows
+
+# Заголовки столбцов таблицы рекомендаций, по которым она ищется в шаблоне
+TABLE_HEADERS = ('Особые образовательные потребности ребенка по отношению к группе, в которой он находится', 'Задачи')
+
+# Кэш разобранных шаблонов ИПР: {путь: {'stamp', 'hash', 'part', 'element', 'table_index'}}
+# Шаблон распаковывается и разбирается один раз; каждый новый документ начинается с копии
+# исходного XML в памяти. Запись сбрасывается при изменении даты или размера файла
+# (если содержимое не изменилось - хэш совпадает - повторный разбор не нужен).
+_templates = {}
+
+
+# Имена элементов WordprocessingML для прямой записи таблицы
+# (то же, что docx.oxml.ns.qn, но без импорта python-docx при загрузке модуля)
+W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+W_TBL = W_NS + 'tbl'
+W_TC = W_NS + 'tc'
+W_TC_PR = W_NS + 'tcPr'
+W_P = W_NS + 'p'
+W_R = W_NS + 'r'
+W_T = W_NS + 't'
+W_TAB = W_NS + 'tab'
+W_BR = W_NS + 'br'
+XML_SPACE = '{http://www.w3.org/XML/1998/namespace}space'
+RUN_SPECIAL_CHARS = re.compile(r'([\t\n])')
+
+
+def set_cell_text(tc, text):
+    # Запись текста в ячейку <w:tc> напрямую через lxml
+    # Повторяет _Cell.text из python-docx: всё содержимое, кроме <w:tcPr>, заменяется одним абзацем
+    # с одним прогоном (табуляция и перевод строки - элементы <w:tab/> и <w:br/>).
+    from lxml import etree
+
+    for child in list(tc):
+        if child.tag != W_TC_PR:
+            tc.remove(child)
+    run = etree.SubElement(etree.SubElement(tc, W_P), W_R)
+    for chunk in RUN_SPECIAL_CHARS.split(text):
+        if chunk == '\t':
+            etree.SubElement(run, W_TAB)
+        elif chunk == '\n':
+            etree.SubElement(run, W_BR)
+        elif chunk:
+            t = etree.SubElement(run, W_T)
+            t.text = chunk
+            if chunk != chunk.strip():
+                t.set(XML_SPACE, 'preserve')
+
+
+def load_template(word_file_path):
+    # Разобранный шаблон из кэша (при необходимости шаблон читается заново)
+    stat = os.stat(word_file_path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    template = _templates.get(word_file_path)
+    if template is not None and template['stamp'] == stamp:
+        return template
+
+    with open(word_file_path, 'rb') as f:
+        data = f.read()
+    template_hash = hashlib.sha256(data).hexdigest()
+    if template is not None and template['hash'] == template_hash:
+        template['stamp'] = stamp
+        return template
+
+    # python-docx загружается при первом разборе шаблона, а не при запуске программы
+    from docx import Document
+
+    with span('word.load_template', file=os.path.basename(word_file_path)):
+        part = Document(io.BytesIO(data)).part
+        table_index = None
+        for index, table in enumerate(part.document.tables):
+            # Поиск таблицы по заголовкам ячеек
+            # Проверяем первую строку таблицы на совпадение текстов.
+            if len(table.rows) > 0 and len(table.columns) > 1 and \
+                    (table.cell(0, 0).text.strip(), table.cell(0, 1).text.strip()) == TABLE_HEADERS:
+                table_index = index
+                break
+
+    template = {'stamp': stamp, 'hash': template_hash, 'part': part, 'element': part._element,
+                'table_index': table_index}
+    _templates[word_file_path] = template
+    return template
+
+
+# Класс для обработки Word-документов
+# Этот класс обновляет таблицу в Word-документе на основе оценок из Excel.
+class WordProcessor:
+    def __init__(self, on_error=None, ask_save_path=None, plan_cache=None):
+        # on_error(заголовок, текст) - обработчик ошибок (в GUI - messagebox.showerror).
+        # ask_save_path() - запрос пути сохранения, если он не передан в update_document (в GUI - диалог).
+        # plan_cache - кэш готовых документов (PlanCache); None - документы всегда заполняются заново.
+        self.on_error = on_error or log_error
+        self.ask_save_path = ask_save_path
+        self.plan_cache = plan_cache
+
+    def update_document(self, word_file_path, scores, excel_file_name, word_save_path=None):
+        # Загрузка и обновление Word-документа
+        # Шаблон берётся из кэша (load_template), таблица - по запомненному номеру.
+        # Сохраняет обновленный документ по пути word_save_path или по пути, выбранному через ask_save_path.
+        template = load_template(word_file_path)
+        if template['table_index'] is None:
+            # Обработка ошибки, если таблица не найдена
+            self.on_error("Ошибка", "Таблица не найдена в документе")
+            return False
+
+        # Путь сохранения
+        # Если путь не передан, его выбирает пользователь.
+        if word_save_path is None and self.ask_save_path is not None:
+            word_save_path = self.ask_save_path()
+        if not word_save_path:
+            return False
+
+        # Документ с тем же шаблоном, возрастной группой и баллами уже создавался - берём готовый из кэша
+        age_group = AGE_GROUP_BY_FILE_NAME.get(excel_file_name)
+        cache_key = None
+        if self.plan_cache is not None and age_group is not None:
+            cache_key = plan_cache_key(template['hash'], age_group, scores)
+            if self.plan_cache.get(cache_key, word_save_path):
+                return True
+
+        # Новый документ - копия исходного XML шаблона; остальные части пакета не меняются и общие.
+        # Таблица заполняется прямо в XML, пакет сохраняется без объектов-обёрток python-docx.
+        part = template['part']
+        part._element = copy.deepcopy(template['element'])
+        tbl = part._element.body.findall(W_TBL)[template['table_index']]
+        with span('word.fill_table', age_group=age_group):
+            complete = self._fill_table(tbl, scores, excel_file_name)  # Заполнение таблицы
+        with span('word.save', file=os.path.basename(word_save_path)):
+            part.package.save(word_save_path)
+
+        # В кэш попадают только документы без ошибок в баллах (иначе при попадании ошибки не будут показаны)
+        if cache_key is not None and complete:
+            try:
+                self.plan_cache.put(cache_key, word_save_path)
+            except OSError as e:
+                logger.warning("Не удалось сохранить ИПР в кэш: %s", e)
+        return True
+
+    def _fill_table(self, tbl, scores, excel_file_name):
+        # Заполнение таблицы <w:tbl> на основе оценок и возраста
+        # Тексты рекомендаций берутся из recommendations.json по скомпилированному плану строк
+        # возрастной группы: сначала по баллам собираются тексты всех строк, затем таблица
+        # заполняется за один проход по элементам <w:tr>/<w:tc> (недостающие строки - копии последней
+        # строки с очищенными ячейками).
+        # Возвращает True, если все строки заполнены без ошибок.
+        age_group = AGE_GROUP_BY_FILE_NAME.get(excel_file_name)
+        plan = get_row_plan(age_group) if age_group else None
+        if plan is None:
+            return False
+
+        rows, errors = render_rows(plan, scores)
+        if errors:
+            # Одно сообщение на все неверные баллы, а не диалог на каждый
+            self.on_error("Ошибка", f"Неправильное значение для {', '.join(dict.fromkeys(errors))}")
+
+        tr_list = tbl.tr_lst
+        while len(tr_list) < len(rows) + 1:
+            tr = copy.deepcopy(tr_list[-1])
+            for tc in tr.iterchildren(W_TC):
+                set_cell_text(tc, '')
+            tr_list[-1].addnext(tr)
+            tr_list.append(tr)
+        for tr, (need, task) in zip(tr_list[1:], rows):
+            row_cells = tr.findall(W_TC)
+            if need is not None:
+                set_cell_text(row_cells[0], need)
+            if task is not None:
+                set_cell_text(row_cells[1], task)
+        return not errors
+
+
+# Поля, доступные в шаблоне имени файла ИПР
+PLAN_NAME_FIELDS = ('id', 'surname', 'name', 'patronymic', 'birth_date', 'age_group')
+
+# Шаблон имени файла ИПР при пакетной генерации (поля - PLAN_NAME_FIELDS)
+DEFAULT_PLAN_NAME_PATTERN = "ИПР_{id}_{surname}_{name}.docx"
+
+# Символы, недопустимые в именах файлов Windows
+INVALID_FILE_NAME_CHARS = re.compile(r'[\\/:*?"<>|]')
+
+
+def _render_plan_file(word_file_path, scores, age_group, word_save_path, cache_dir=None):
+    # Заполнение одного ИПР в процессе пакетной генерации
+    # Возвращает список текстов ошибок (пустой при успехе).
+    errors = []
+    word_processor = WordProcessor(on_error=lambda title, message: errors.append(message),
+                                   plan_cache=PlanCache(cache_dir) if cache_dir else None)
+    try:
+        saved = word_processor.update_document(word_file_path, scores, CARD_LAYOUTS[age_group]['file_name'],
+                                               word_save_path)
+    except Exception as e:  # повреждённый шаблон, нет доступа к папке и т.п. - не прерываем всю пачку
+        return errors + [f"Ошибка создания документа: {e}"]
+    if not saved and not errors:
+        errors.append("Документ не сохранён")
+    return errors
+
+
+# Класс для пакетной генерации ИПР
+# Берёт баллы воспитанников из таблицы pupils и заполняет шаблон для каждого в пуле процессов.
+# Готовые документы берутся из кэша cache_dir (None - без кэша).
+class BatchGenerator:
+    def __init__(self, db_manager, cache_dir=PLAN_CACHE_DIR):
+        self.db_manager = db_manager
+        self.cache_dir = cache_dir
+
+    def plan_file_name(self, pupil, name_pattern=DEFAULT_PLAN_NAME_PATTERN):
+        # Имя файла ИПР для строки воспитанника по шаблону name_pattern
+        fields = dict(zip(PUPIL_COLUMNS, pupil))
+        return INVALID_FILE_NAME_CHARS.sub('_', name_pattern.format(**fields))
+
+    def generate(self, word_file_path, output_dir, pupil_ids=None, name_pattern=DEFAULT_PLAN_NAME_PATTERN,
+                 workers=None, progress=None, cancel=None):
+        # Пакетная генерация ИПР
+        # pupil_ids - список ID; если не задан, ИПР создаются для всех воспитанников с баллами.
+        # progress(готово, всего) - ход генерации; cancel - threading.Event для отмены
+        # (уже созданные документы остаются и попадают в отчёт).
+        # Возвращает отчёт: {'total', 'generated': [(id, путь)], 'errors': [(id, текст)], 'elapsed', 'docs_per_second',
+        # 'cancelled'}.
+        started = time.perf_counter()
+        report = {'total': 0, 'generated': [], 'errors': [], 'elapsed': 0.0, 'docs_per_second': 0.0,
+                  'cancelled': False}
+
+        if pupil_ids is None:
+            pupils = self.db_manager.get_scored_pupils()
+        else:
+            found = self.db_manager.get_pupils_by_ids(pupil_ids)
+            pupils = []
+            for pupil_id in pupil_ids:
+                pupil = found.get(pupil_id)
+                if pupil is None:
+                    report['errors'].append((pupil_id, f"Воспитанник с ID {pupil_id} не найден в базе данных"))
+                elif pupil[PUPIL_COLUMNS.index('age_group')] is None:
+                    report['errors'].append((pupil_id, "Для воспитанника ещё не импортирована карта развития"))
+                else:
+                    pupils.append(pupil)
+        report['total'] = len(pupils) + len(report['errors'])
+
+        os.makedirs(output_dir, exist_ok=True)
+        tasks = []
+        for pupil in pupils:
+            fields = dict(zip(PUPIL_COLUMNS, pupil))
+            scores = {column: fields[column] for column in SCORE_COLUMNS if fields[column] is not None}
+            tasks.append((fields['id'], scores, fields['age_group'],
+                          os.path.join(output_dir, self.plan_file_name(pupil, name_pattern))))
+
+        results, report['cancelled'] = map_in_processes(
+            _render_plan_file,
+            [word_file_path] * len(tasks),
+            [scores for _, scores, _, _ in tasks],
+            [age_group for _, _, age_group, _ in tasks],
+            [path for _, _, _, path in tasks],
+            [self.cache_dir] * len(tasks),
+            workers=workers, progress=progress, cancel=cancel,
+        )
+
+        for (pupil_id, _, _, path), errors in zip(tasks, results):
+            if errors:
+                report['errors'].extend((pupil_id, error) for error in errors)
+            else:
+                report['generated'].append((pupil_id, path))
+
+        report['elapsed'] = time.perf_counter() - started
+        if report['elapsed'] > 0:
+            report['docs_per_second'] = len(report['generated']) / report['elapsed']
+        return report
+
+    @staticmethod
+    def format_report(report):
+        # Текстовый итоговый отчёт пакетной генерации
+        lines = ["Создание ИПР отменено, создана только часть документов", ""] if report.get('cancelled') else []
+        lines += [
+            f"Воспитанников: {report['total']}",
+            f"Создано документов: {len(report['generated'])}",
+            f"Ошибок: {len(report['errors'])}",
+            f"Время: {report['elapsed']:.1f} с ({report['docs_per_second']:.1f} док./с)",
+        ]
+        if report['errors']:
+            lines.append("")
+            lines.append("Ошибки:")
+            lines.extend(f"ID {pupil_id}: {error}" for pupil_id, error in report['errors'])
+        return "\n".join(lines)